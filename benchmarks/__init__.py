@@ -0,0 +1 @@
+"""Benchmarks for the PDGA ratings calculator. Run each with `python -m benchmarks.<name>`."""
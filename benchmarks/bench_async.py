@@ -0,0 +1,90 @@
+"""
+bench_async.py
+--------------
+Throughput of loading N players: sequential sync load_player_data calls vs.
+one event loop gathering load_player_data_async.
+
+Runs against synthetic pages with simulated latency and a throwaway cache DB,
+so it never touches pdga.com or ~/.pdga_ratings_cache.db.
+
+Usage:
+    python -m benchmarks.bench_async --players 20 --latency 0.5
+    python -m benchmarks.bench_async --players 20 --latency 0.5 --rate 8 --in-flight 8
+
+The request scheduler is unthrottled by default, to measure the engine;
+--rate / --in-flight apply per-host limits (see scheduler.py) and the
+scheduler's queue depth and wait times are reported.
+
+Parsing is CPU-bound and shares the GIL, so the async speedup shrinks as
+--field-size grows relative to --latency.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from ratings_calculator import cache as cache_mod
+from ratings_calculator import scheduler, scraper
+
+from .synthetic import FakeSession
+
+
+def _fresh_cache(tmp: Path, label: str) -> None:
+    cache_mod.DB_PATH = tmp / f"{label}.db"
+
+
+def run_sync(players: list[str]) -> float:
+    start = time.perf_counter()
+    for p in players:
+        scraper.load_player_data(p)
+    return time.perf_counter() - start
+
+
+def run_async(players: list[str]) -> float:
+    async def load_all():
+        return await asyncio.gather(*(scraper.load_player_data_async(p) for p in players))
+
+    start = time.perf_counter()
+    asyncio.run(load_all())
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players", type=int,   default=10,  help="number of players to load")
+    parser.add_argument("--latency", type=float, default=0.5, help="simulated seconds per request")
+    parser.add_argument("--field-size", type=int, default=72, help="players per tournament page")
+    parser.add_argument("--rate",      type=float, default=0, help="requests/s per host (0: unthrottled)")
+    parser.add_argument("--in-flight", type=int,   default=0, help="concurrent requests per host (0: unlimited)")
+    args = parser.parse_args(argv)
+    scheduler.RATE_PER_SEC  = args.rate or 1e9
+    scheduler.BURST         = max(1, int(args.rate * 2)) if args.rate else 10**9
+    scheduler.MAX_IN_FLIGHT = args.in_flight or 10**9
+
+    players = [str(150000 + i) for i in range(args.players)]
+    session = FakeSession(players, latency=args.latency, field_size=args.field_size)
+    scraper.SESSION.get = session.get
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _fresh_cache(Path(tmp), "sync")
+        t_sync = run_sync(players)
+        _fresh_cache(Path(tmp), "async")
+        scheduler.reset()
+        t_async = run_async(players)
+    sched = scheduler.stats()
+    wait  = sched["wait"]["interactive"]
+
+    print(f"{args.players} players, {args.latency * 1000:.0f} ms simulated latency (cold cache)")
+    print(f"  sync : {t_sync:7.2f} s  {args.players / t_sync:6.2f} players/s")
+    print(f"  async: {t_async:7.2f} s  {args.players / t_async:6.2f} players/s")
+    print(f"  speedup: {t_sync / t_async:.1f}x")
+    print(f"  scheduler (async run): {sched['requests']} requests, {sched['queued']} queued, "
+          f"max queue depth {sched['max_queue_depth']}, "
+          f"mean wait {wait['total_secs'] / max(1, wait['count']) * 1000:.0f} ms, "
+          f"max wait {wait['max_secs'] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
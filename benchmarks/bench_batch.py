@@ -0,0 +1,49 @@
+"""
+bench_batch.py
+--------------
+Rating computation for a club- or league-sized roster: one
+compute_pdga_rating call per player vs. one compute_pdga_ratings call over
+the packed (ratings, offsets) arrays.
+
+Usage:
+    python -m benchmarks.bench_batch --players 5000 --rounds 60
+"""
+
+import argparse
+import random
+import timeit
+
+from ratings_calculator.calculator import compute_pdga_rating, compute_pdga_ratings, pack_ratings
+
+
+def _time(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time for one call, in milliseconds."""
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players", type=int, default=5000, help="players in the roster")
+    parser.add_argument("--rounds",  type=int, default=60,   help="mean rated rounds per player")
+    parser.add_argument("--repeat",  type=int, default=3,    help="timing repetitions (best is reported)")
+    args = parser.parse_args(argv)
+
+    rng     = random.Random(0)
+    players = []
+    for _ in range(args.players):
+        base = rng.randint(700, 1040)
+        players.append([round(rng.gauss(base, 25)) for _ in range(rng.randint(1, 2 * args.rounds))])
+    ratings, offsets = pack_ratings(players)
+
+    t_scalar = _time(lambda: [compute_pdga_rating(p) for p in players], args.repeat)
+    t_pack   = _time(lambda: pack_ratings(players), args.repeat)
+    t_batch  = _time(lambda: compute_pdga_ratings(ratings, offsets), args.repeat)
+
+    print(f"{args.players} players, {len(ratings)} rounds")
+    print(f"  scalar: {t_scalar:8.1f} ms")
+    print(f"  batch : {t_batch:8.1f} ms  (+ {t_pack:.1f} ms to pack lists)")
+    print(f"  speedup: {t_scalar / t_batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
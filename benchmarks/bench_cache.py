@@ -0,0 +1,88 @@
+"""
+bench_cache.py
+--------------
+Page cache cost per storage codec: database size and set / get latency on
+realistic pages (synthetic tournament results and player detail tables),
+single-threaded and from a pool of worker threads (the way the fetch engine
+calls it). "get" sweeps every page, so it mostly misses the in-memory tier;
+"hot get" re-reads a few pages (the schedule-page pattern) and hits it.
+Every codec gets its own throwaway database.
+
+Usage:
+    python -m benchmarks.bench_cache --ops 1000 --field-size 150 --threads 8
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ratings_calculator import cache as cache_mod
+
+from .synthetic import detail_page, field, tournament_page
+
+
+def _latency(fn, items) -> float:
+    """Mean microseconds per call of fn over items."""
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def _threaded_latency(fn, items, threads: int) -> float:
+    """Wall-clock microseconds per call with `threads` workers sharing the load."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(fn, items))
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def _db_bytes(path: Path) -> int:
+    cache_mod._connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return sum(p.stat().st_size for p in path.parent.glob(path.name + "*"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--ops",        type=int, default=1000, help="pages per case")
+    parser.add_argument("--field-size", type=int, default=150,  help="players per tournament page")
+    parser.add_argument("--threads",    type=int, default=8,    help="workers for the threaded cases")
+    parser.add_argument("--codecs",     default="raw,zlib,zstd", help="comma-separated codecs to compare")
+    args = parser.parse_args(argv)
+
+    base = [
+        tournament_page("90000", field(args.field_size, ["150375"])),
+        detail_page("150375", n_rounds=args.field_size),
+    ]
+    urls  = [f"https://www.pdga.com/tour/event/{90000 + i}" for i in range(args.ops)]
+    pages = {url: base[i % 2] + f"<!-- {url} -->" for i, url in enumerate(urls)}
+    hot   = urls[:20] * 50
+    mean  = sum(map(len, pages.values())) / len(pages) / 1024
+
+    print(f"{args.ops} pages, {mean:.0f} KB average")
+    print(f"  {'codec':<6} {'db size':>9} {'set':>9} {'get':>9} {'hot get':>9} {'get_entry':>10}"
+          f" {'set x' + str(args.threads):>9} {'get x' + str(args.threads):>9}   (us/op)")
+    for codec in args.codecs.split(","):
+        if codec == "zstd" and cache_mod.zstandard is None:
+            print(f"  {codec:<6} skipped (zstandard not installed)")
+            continue
+        cache_mod.CODEC = codec
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_mod.DB_PATH = Path(tmp) / "bench.db"
+            put     = lambda u: cache_mod.set(u, pages[u])
+            t_set   = _latency(put, urls)
+            size    = _db_bytes(cache_mod.DB_PATH)
+            t_get   = _latency(cache_mod.get, urls)
+            t_hot   = _latency(cache_mod.get, hot)
+            t_entry = _latency(cache_mod.get_entry, urls)
+            t_tset  = _threaded_latency(put, urls, args.threads)
+            t_tget  = _threaded_latency(cache_mod.get, urls, args.threads)
+            cache_mod.close()
+        print(f"  {codec:<6} {size / 2**20:7.1f}MB {t_set:9.0f} {t_get:9.0f} {t_hot:9.1f} {t_entry:10.0f}"
+              f" {t_tset:9.0f} {t_tget:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
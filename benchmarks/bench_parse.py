@@ -0,0 +1,50 @@
+"""
+bench_parse.py
+--------------
+Parse time of the extract backends (BeautifulSoup reference vs. the fast
+html.parser extractor) on synthetic detail and tournament pages.
+
+Usage:
+    python -m benchmarks.bench_parse --field-size 1000 --rounds 200
+"""
+
+import argparse
+import timeit
+
+from ratings_calculator import extract
+
+from .synthetic import detail_page, field, tournament_page
+
+
+def _time(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time for one call, in milliseconds."""
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--field-size", type=int, default=500, help="players on the tournament page")
+    parser.add_argument("--rounds",     type=int, default=150, help="rows on the player detail page")
+    parser.add_argument("--repeat",     type=int, default=5,   help="timing repetitions (best is reported)")
+    args = parser.parse_args(argv)
+
+    target     = "150375"
+    tournament = tournament_page("90000", field(args.field_size, [target]))
+    detail     = detail_page(target, n_rounds=args.rounds)
+
+    cases = [
+        (f"tournament page ({args.field_size} players)",
+         lambda b: b.tournament_page(tournament, target)),
+        (f"detail page ({args.rounds} rounds)",
+         lambda b: b.detail_rows(detail)),
+    ]
+    for label, run in cases:
+        times = {name: _time(lambda: run(extract.BACKENDS[name]), args.repeat) for name in ("soup", "fast")}
+        print(f"{label}")
+        for name, ms in times.items():
+            print(f"  {name:<5}: {ms:8.1f} ms")
+        print(f"  speedup: {times['soup'] / times['fast']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+bench_solver.py
+---------------
+Time per rounds_needed_for_target solve: the prepared-state solver vs.
+probing project_rating from scratch (the previous implementation, which
+rebuilt the whole pipeline for every candidate average). With --grid, also
+a target x rounds table: one rounds_needed_grid call vs. a
+rounds_needed_for_target solve per cell.
+
+Usage:
+    python -m benchmarks.bench_solver --rounds 120 --solve-rounds 3
+    python -m benchmarks.bench_solver --grid 8 --grid-rounds 1,2,3,4,5,6
+"""
+
+import argparse
+import random
+import time
+import timeit
+
+from ratings_calculator.calculator import project_rating, rounds_needed_for_target, rounds_needed_grid
+
+DAY = 24 * 3600
+
+
+def solve_from_scratch(tournaments, new_tournaments, target_rating, num_rounds) -> int | None:
+    """The needed average found the old way: a fresh project_rating per probe."""
+    def trial(avg):
+        return project_rating(tournaments, new_tournaments, [avg] * num_rounds)["projected_rating"]
+
+    low, high = 300, 1100
+    if trial(high) < target_rating:
+        return None
+    if trial(low) >= target_rating:
+        return low
+    while low < high - 1:
+        mid = (low + high) // 2
+        if trial(mid) >= target_rating:
+            high = mid
+        else:
+            low = mid
+    return high
+
+
+def _time(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time for one call, in milliseconds."""
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds",       type=int, default=120, help="rated rounds in the player's history")
+    parser.add_argument("--solve-rounds", type=int, default=3,   help="hypothetical rounds to solve for")
+    parser.add_argument("--target",       type=int, default=None, help="target rating (default: current + 3)")
+    parser.add_argument("--repeat",       type=int, default=5,   help="timing repetitions (best is reported)")
+    parser.add_argument("--grid",         type=int, default=0,
+                        help="also time a grid of this many targets (around the current rating)")
+    parser.add_argument("--grid-rounds",  default="1,2,3,4,5", help="round counts for --grid")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    now = int(time.time())
+    tournaments = [
+        {"name": f"Event {i}", "rating": round(rng.gauss(930, 25)), "round": 1,
+         "timestamp": now - rng.randint(1, 700) * DAY, "evaluated": "Yes", "included": "Yes"}
+        for i in range(args.rounds)
+    ]
+    target = args.target or project_rating(tournaments, [])["projected_rating"] + 3
+
+    answer = rounds_needed_for_target(tournaments, [], target, args.solve_rounds)["needed_avg"]
+    assert answer == solve_from_scratch(tournaments, [], target, args.solve_rounds)
+
+    t_old = _time(lambda: solve_from_scratch(tournaments, [], target, args.solve_rounds), args.repeat)
+    t_new = _time(lambda: rounds_needed_for_target(tournaments, [], target, args.solve_rounds), args.repeat)
+
+    print(f"target {target} over {args.solve_rounds} round(s), {args.rounds} rated rounds -> need {answer}")
+    print(f"  from scratch  : {t_old:7.2f} ms per solve")
+    print(f"  prepared state: {t_new:7.2f} ms per solve")
+    print(f"  speedup: {t_old / t_new:.1f}x")
+
+    if args.grid:
+        targets = [target - 3 + 5 * i for i in range(args.grid)]
+        rounds  = [int(n) for n in args.grid_rounds.split(",")]
+
+        def per_cell():
+            return {(t, n): rounds_needed_for_target(tournaments, [], t, n) for t in targets for n in rounds}
+
+        assert rounds_needed_grid(tournaments, [], targets, rounds) == per_cell()
+        t_cells = _time(per_cell, args.repeat)
+        t_grid  = _time(lambda: rounds_needed_grid(tournaments, [], targets, rounds), args.repeat)
+        print(f"grid of {len(targets)} targets x {len(rounds)} round counts ({len(targets) * len(rounds)} cells)")
+        print(f"  solve per cell: {t_cells:7.2f} ms")
+        print(f"  one grid call : {t_grid:7.2f} ms")
+        print(f"  speedup: {t_cells / t_grid:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
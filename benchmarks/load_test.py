@@ -0,0 +1,139 @@
+"""
+load_test.py
+------------
+Load test of load_player_data_async against a local PDGA stand-in
+(pdga_server.py): `--loads` player loads drawn at random from a roster of
+`--players`, at most `--concurrency` in flight, on one event loop.
+
+Reports per-load latency percentiles (p50 / p95 / p99), throughput, the
+cache hit rates behind them (cache.stats()) and what the server saw.
+Runs against a throwaway cache DB, so ~/.pdga_ratings_cache.db and
+pdga.com are never touched.
+
+Usage:
+    python -m benchmarks.load_test --players 20 --loads 200 --concurrency 16
+    python -m benchmarks.load_test --latency 0.2 --jitter 0.1 --error-rate 0.02 --page-kb 64
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8765   # an already running server
+
+Repeat loads of a player are served from the cache, so --loads well above
+--players measures a warm deployment, and --unique (each player loaded
+once) a cold one. As in bench_async, the request scheduler is
+unthrottled unless --rate / --in-flight are given.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from ratings_calculator import cache as cache_mod
+from ratings_calculator import scheduler, scraper
+
+from .pdga_server import add_server_args, roster, server_from_args
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an ascending list."""
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_loads(players: list[str], concurrency: int) -> tuple[list[float], dict[str, int], float]:
+    """Load each of `players` (repeats allowed); returns (latencies, errors by type, wall time)."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    latencies: list[float] = []
+    errors:    dict[str, int] = {}
+
+    async def load(pdga_number: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await scraper.load_player_data_async(pdga_number)
+            except (scraper.FetchError, scraper.ParseError) as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(load(p) for p in players))
+    return sorted(latencies), errors, time.perf_counter() - start
+
+
+def hit_rates(stats: dict) -> dict[str, float]:
+    """Fraction of lookups answered by each cache layer."""
+    def rate(hits: int, misses: int) -> float:
+        return hits / (hits + misses) if hits + misses else math.nan
+
+    network = stats["full_fetches"] + stats["revalidated"]
+    return {
+        "pages":    rate(stats["hits"] + stats["coalesced"], network),
+        "extracts": rate(stats["extract_hits"], stats["extract_misses"]),
+        "index":    rate(stats["index_hits"], stats["index_misses"]),
+        "memory":   rate(stats["memory_hits"], stats["memory_misses"]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players",     type=int, default=20,  help="roster size")
+    parser.add_argument("--loads",       type=int, default=100, help="player loads to run")
+    parser.add_argument("--concurrency", type=int, default=16,  help="player loads in flight")
+    parser.add_argument("--unique",      action="store_true",   help="load each roster player once, in order")
+    parser.add_argument("--base-url",    default=None,
+                        help="test an already running server instead of starting one")
+    parser.add_argument("--rate",      type=float, default=0, help="requests/s per host (0: unthrottled)")
+    parser.add_argument("--in-flight", type=int,   default=0, help="concurrent requests per host (0: unlimited)")
+    parser.add_argument("--retry-backoff", type=float, default=0.1,
+                        help="scraper.RETRY_BACKOFF for injected errors (default: 0.1 s)")
+    add_server_args(parser)
+    args = parser.parse_args(argv)
+    scheduler.RATE_PER_SEC  = args.rate or 1e9
+    scheduler.BURST         = max(1, int(args.rate * 2)) if args.rate else 10**9
+    scheduler.MAX_IN_FLIGHT = args.in_flight or 10**9
+    scraper.RETRY_BACKOFF   = args.retry_backoff
+
+    rng    = random.Random(args.seed)
+    pool   = roster(args.players)
+    loads  = pool if args.unique else [rng.choice(pool) for _ in range(args.loads)]
+    server = None
+    if args.base_url:
+        scraper.set_base_url(args.base_url)
+    else:
+        server = server_from_args(args)
+        server.start()
+        scraper.set_base_url(server.base_url)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_mod.DB_PATH = Path(tmp) / "load.db"
+            latencies, errors, wall = asyncio.run(run_loads(loads, args.concurrency))
+            stats = cache_mod.stats()
+            cache_mod.close()
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    done = len(latencies)
+    print(f"{len(loads)} loads of {len(set(loads))} players, concurrency {args.concurrency}, "
+          f"{args.latency * 1000:.0f} ms latency, {args.error_rate:.1%} errors")
+    print(f"  latency: p50 {percentile(latencies, 50) * 1000:7.1f} ms   "
+          f"p95 {percentile(latencies, 95) * 1000:7.1f} ms   "
+          f"p99 {percentile(latencies, 99) * 1000:7.1f} ms   "
+          f"max {percentile(latencies, 100) * 1000:7.1f} ms")
+    print(f"  throughput: {done / wall:6.2f} loads/s ({done} ok in {wall:.2f} s)"
+          + (f", failed: {errors}" if errors else ""))
+    print("  cache hit rate: " + "   ".join(f"{k} {v:.1%}" for k, v in hit_rates(stats).items()))
+    if server is not None:
+        counts = server.counts
+        print(f"  server: {counts['requests']} requests ({counts['not_modified']} 304, "
+              f"{counts['errors']} injected 503), {counts['bytes'] / 1e6:.1f} MB sent")
+
+
+if __name__ == "__main__":
+    main()
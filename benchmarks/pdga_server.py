@@ -0,0 +1,206 @@
+"""
+pdga_server.py
+--------------
+A local stand-in for pdga.com: serves player stats / details / history
+pages, tournament pages and the ratings schedule under the same paths as
+the real site, so the scraper runs unmodified against it
+(scraper.set_base_url / PDGA_BASE_URL).
+
+Pages are synthetic (synthetic.py) or, with --replay, served from a
+fixture archive recorded by `pdga-ratings --record`. Every response can be
+delayed (--latency, --jitter), padded to a minimum size (--page-kb) or
+replaced by a 503 (--error-rate). Responses carry an ETag and honour
+If-None-Match, so revalidation costs a 304 as it does on pdga.com.
+
+Usage:
+    python -m benchmarks.pdga_server --port 8765 --latency 0.2 --error-rate 0.01
+    PDGA_BASE_URL=http://127.0.0.1:8765 pdga-ratings --pdga 150000
+"""
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from ratings_calculator import transport
+
+from .synthetic import route
+
+
+class PdgaServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer serving PDGA-shaped pages. `roster` are the PDGA
+    numbers entered in every synthetic tournament; `archive` (from
+    transport.load_archive) replaces the synthetic pages when given.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address:    tuple[str, int] = ("127.0.0.1", 0),
+        roster:     list[str] | None = None,
+        field_size: int   = 72,
+        latency:    float = 0.0,
+        jitter:     float = 0.0,
+        error_rate: float = 0.0,
+        page_kb:    int   = 0,
+        archive:    dict | None = None,
+        seed:       int | None = None,
+    ):
+        super().__init__(address, _Handler)
+        self.roster     = list(roster or [])
+        self.field_size = field_size
+        self.latency    = latency
+        self.jitter     = jitter
+        self.error_rate = error_rate
+        self.page_kb    = page_kb
+        # Recorded pages keyed by path, whatever host they were recorded from.
+        self.archive    = {_path(url): entry for url, entry in (archive or {}).items()}
+        self._random    = random.Random(seed)
+        self._lock      = threading.Lock()
+        self._pages: dict[str, tuple[int, dict, bytes]] = {}
+        self.counts     = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "not_found": 0, "bytes": 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """Serve on a daemon thread; stop with shutdown()."""
+        thread = threading.Thread(target=self.serve_forever, name="pdga-server", daemon=True)
+        thread.start()
+        return thread
+
+    def page(self, path: str) -> tuple[int, dict, bytes]:
+        """(status, headers, body) for path; built once and reused, like a static site."""
+        with self._lock:
+            cached = self._pages.get(path)
+        if cached is not None:
+            return cached
+        recorded = self.archive.get(path)
+        if recorded is not None:
+            status, headers, text = recorded["status"], dict(recorded["headers"]), recorded["body"]
+        elif self.archive:
+            status, headers, text = 404, {}, "not recorded"
+        else:
+            try:
+                status, headers, text = 200, {}, route(path, self.roster, self.field_size)
+            except KeyError:
+                status, headers, text = 404, {}, "not found"
+        if status == 200 and len(text) < self.page_kb * 1024:
+            text += f"<!-- {'x' * (self.page_kb * 1024 - len(text))} -->"
+        body = text.encode("utf-8")
+        headers = {k: v for k, v in headers.items() if k.lower() not in ("content-length", "content-encoding")}
+        if status == 200:
+            headers["ETag"] = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        headers["Content-Type"] = "text/html; charset=utf-8"
+        with self._lock:
+            self._pages[path] = (status, headers, body)
+        return status, headers, body
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + jitter)
+
+    def fail(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def count(self, key: str, sent: int = 0) -> None:
+        with self._lock:
+            self.counts["requests"] += 1
+            self.counts[key]        += 1
+            self.counts["bytes"]    += sent
+
+
+def _path(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PdgaServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(self.server.delay())
+        if self.server.fail():
+            self._send(503, {"Content-Type": "text/plain"}, b"synthetic failure")
+            self.server.count("errors")
+            return
+        status, headers, body = self.server.page(self.path)
+        if status == 200 and self.headers.get("If-None-Match") == headers["ETag"]:
+            self._send(304, headers, b"")
+            self.server.count("not_modified")
+            return
+        self._send(status, headers, body)
+        self.server.count("ok" if status < 400 else "not_found", len(body))
+
+    def _send(self, status: int, headers: dict, body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def roster(players: int) -> list[str]:
+    """The PDGA numbers bench_async / load_test load: 150000, 150001, ..."""
+    return [str(150000 + i) for i in range(players)]
+
+
+def add_server_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency",    type=float, default=0.1, help="seconds before each response")
+    parser.add_argument("--jitter",     type=float, default=0.0, help="+/- seconds of uniform jitter on --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument("--page-kb",    type=int,   default=0,   help="pad pages to at least this many KiB")
+    parser.add_argument("--field-size", type=int,   default=72,  help="players per synthetic tournament page")
+    parser.add_argument("--replay",     default=None, metavar="ARCHIVE",
+                        help="serve pages from a recorded fixture archive instead of synthetic ones")
+    parser.add_argument("--seed",       type=int,   default=None, help="seed for jitter and injected errors")
+
+
+def server_from_args(args, host: str = "127.0.0.1", port: int = 0) -> PdgaServer:
+    return PdgaServer(
+        (host, port),
+        roster     = roster(args.players),
+        field_size = args.field_size,
+        latency    = args.latency,
+        jitter     = args.jitter,
+        error_rate = args.error_rate,
+        page_kb    = args.page_kb,
+        archive    = transport.load_archive(args.replay) if args.replay else None,
+        seed       = args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host",    default="127.0.0.1")
+    parser.add_argument("--port",    type=int, default=8765)
+    parser.add_argument("--players", type=int, default=100, help="roster entered in every synthetic tournament")
+    add_server_args(parser)
+    args   = parser.parse_args(argv)
+    server = server_from_args(args, args.host, args.port)
+    print(f"Serving PDGA stand-in on {server.base_url} (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"  {server.counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+synthetic.py
+------------
+Synthetic PDGA-shaped pages and a fake HTTP session, so benchmarks can run
+the real scraper pipeline without touching pdga.com.
+
+The markup mirrors the classes and ids the scraper looks for; it is not a
+copy of any real page.
+"""
+
+import re
+import time
+from datetime import datetime, timedelta
+
+_NOW = datetime.now()
+
+
+def _fmt(d: datetime) -> str:
+    return d.strftime("%d-%b-%Y")
+
+
+def stats_page(pdga_number: str, n_new: int = 3, n_events: int = 2) -> str:
+    rows = []
+    for i in range(n_new):
+        d = _NOW - timedelta(days=5 + i)
+        rows.append(
+            f'<tr class="odd"><td class="place">{i + 1}</td><td class="points">{10 + i}</td>'
+            f'<td class="tournament"><a href="/tour/event/{90000 + i}#MPO">New Event {i}</a></td>'
+            f'<td class="tier">C</td><td class="dates">{_fmt(d)}</td><td class="prize">$0</td></tr>'
+        )
+    events = "".join(
+        f'<a href="/tour/event/{95000 + i}">Current Event {i}</a>' for i in range(n_events)
+    )
+    return (
+        "<html><head><title>Player</title></head><body>"
+        '<ul class="player-info">'
+        '<li class="current-rating"><strong>Current Rating:</strong> 925 '
+        "<small>(as of 10-Oct-2026)</small></li>"
+        f'<li class="current-events"><strong>Current Events:</strong> {events}</li>'
+        "</ul>"
+        f"<table><thead><tr><th>Place</th></tr></thead><tbody>{''.join(rows)}</tbody></table>"
+        "</body></html>"
+    )
+
+
+def detail_page(pdga_number: str, n_rounds: int = 40) -> str:
+    rows = []
+    for i in range(n_rounds):
+        d        = _NOW - timedelta(days=30 + 15 * i)
+        included = "No" if i == 7 else "Yes"
+        rating   = 900 + (i * 7) % 50 - (300 if i == 7 else 0)
+        rows.append(
+            f'<tr class="{"odd" if i % 2 else "even"}">'
+            f'<td class="tournament"><a href="/tour/event/{10000 + i}">Old Event {i}</a></td>'
+            f'<td class="tier">C</td><td class="date">{_fmt(d)}</td><td class="division">MA1</td>'
+            f'<td class="round tooltip" title="Round">{1 + i % 2}</td><td class="score">54</td>'
+            f'<td class="round-rating">{rating}</td><td class="evaluated">Yes</td>'
+            f'<td class="included">{included}</td></tr>'
+        )
+    return (
+        '<html><body><table id="player-results-details">'
+        f"<thead><tr><th>Tournament</th></tr></thead><tbody>{''.join(rows)}</tbody>"
+        "</table></body></html>"
+    )
+
+
+def history_page(pdga_number: str, n_updates: int = 12) -> str:
+    rows = []
+    for i in range(n_updates):
+        d = (_NOW - timedelta(days=30 * i)).strftime("%Y-%m-%d")
+        rows.append(
+            f'<tr><td class="date-received">{d}</td>'
+            f'<td class="player-rating">{925 - i}</td><td class="round-rating">20</td></tr>'
+        )
+    return (
+        '<html><body><table id="player-results-history">'
+        f"<tbody>{''.join(rows)}</tbody></table></body></html>"
+    )
+
+
+def schedule_page() -> str:
+    rows = []
+    for i in range(-3, 9):
+        deadline    = _NOW + timedelta(days=30 * i + 3)
+        publication = deadline + timedelta(days=6)
+        rows.append(
+            f"<tr><td>{deadline.strftime('%B %d, %Y')}</td>"
+            f"<td>{publication.strftime('%B %d, %Y')}</td></tr>"
+        )
+    return (
+        "<html><body><table><thead><tr><th>Deadline</th><th>Publication</th></tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table></body></html>"
+    )
+
+
+def tournament_page(event_id: str, players: list[str], league: bool = False) -> str:
+    d    = _NOW - timedelta(days=3)
+    rows = []
+    for p, number in enumerate(players):
+        rows.append(
+            f'<tr class="odd"><td class="place">{p + 1}</td><td class="player">Player {p}</td>'
+            f'<td class="pdga-number">{number}</td><td class="player-rating">900</td>'
+            f'<td class="round">54</td><td class="round-rating">{900 + p % 40}</td>'
+            f'<td class="round">55</td><td class="round-rating">{910 - p % 30}</td>'
+            f'<td class="total">109</td></tr>'
+        )
+    heading = "Weekly League Night" if league else "Tournament"
+    return (
+        f'<html><body><div class="event-info"><h1>Event {event_id}</h1><h4>{heading}</h4>'
+        f'<li class="tournament-date"><strong>Date</strong>: {_fmt(d)}</li></div>'
+        f'<table class="results"><thead><tr><th>Place</th></tr></thead>'
+        f"<tbody>{''.join(rows)}</tbody></table></body></html>"
+    )
+
+
+def field(size: int, roster: list[str]) -> list[str]:
+    """A tournament field of `size` PDGA numbers that includes every roster player."""
+    filler = [str(200000 + i) for i in range(max(0, size - len(roster)))]
+    mid    = len(filler) // 2
+    return filler[:mid] + list(roster) + filler[mid:]
+
+
+def route(url: str, roster: list[str], field_size: int = 200) -> str:
+    """Return the synthetic page for a pdga.com-style URL."""
+    if url.endswith("/when-updated"):
+        return schedule_page()
+    m = re.search(r"/player/(\d+)(/\w+)?$", url)
+    if m:
+        kind = m.group(2) or ""
+        return {"": stats_page, "/details": detail_page, "/history": history_page}[kind](m.group(1))
+    m = re.search(r"/tour/event/(\d+)", url)
+    if m:
+        event_id = m.group(1)
+        return tournament_page(event_id, field(field_size, roster), league=event_id.endswith("1"))
+    raise KeyError(url)
+
+
+class FakeResponse:
+    def __init__(self, url: str, text: str, status_code: int = 200):
+        self.url         = url
+        self.text        = text
+        self.content     = text.encode()
+        self.status_code = status_code
+        self.encoding    = "utf-8"
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        import requests
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}", response=self)
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        data = self.text if decode_unicode else self.content
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+
+class FakeSession:
+    """Drop-in for scraper.SESSION.get that serves synthetic pages after `latency` seconds."""
+
+    def __init__(self, roster: list[str], latency: float = 0.1, field_size: int = 200):
+        self.roster     = roster
+        self.latency    = latency
+        self.field_size = field_size
+        self.calls      = 0
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        self.calls += 1
+        time.sleep(self.latency)
+        return FakeResponse(url, route(url, self.roster, self.field_size))
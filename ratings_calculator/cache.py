@@ -2,59 +2,920 @@
 cache.py
 --------
 SQLite-backed cache for PDGA page responses.
-Entries expire after CACHE_TTL_HOURS and are transparently re-fetched.
+Entries expire per URL class (see ttl.py; CACHE_TTL_HOURS is the default)
+and are transparently re-fetched.
+Each entry keeps the response's ETag / Last-Modified validators so an expired
+page can be revalidated with a conditional request instead of re-downloaded.
+Page HTML is stored compressed (see CODEC); rows record their codec, so rows
+written uncompressed by older versions are still read as-is.
+
+Each thread keeps one open connection (WAL journal, busy timeout, cached
+prepared statements); the schema is set up once per database file.
+The file is bounded: long-expired pages are purged, least recently used
+pages evicted past MAX_ROWS / MAX_BYTES, and freed space vacuumed, by a
+background maintain() pass as pages are written.
+
+A second table, extract_cache, holds the structures the scraper pulled out of
+each page (JSON), keyed by URL + content hash + parser version, so warm loads
+skip HTML parsing altogether.
+
+Tournament result pages are shared by every player who played the event, so
+they get their own index: tournament_index holds one row per page (header
+fields, content hash, parser version) and tournament_rounds one row per
+(page, PDGA number). A page is parsed once and any player's rounds become a
+keyed read.
+
+Streaming lookups stop reading a results page at one player's row, so
+there is no page to cache; streamed_pages keeps that player's record with the
+response's validators instead, under the page's expiry rules, so the next
+lookup is a keyed read and an expired one a conditional request.
+
+player_pages records which player each player page was fetched for, so
+invalidate_player() drops exactly that player's pages through an index,
+along with the player's streamed records and per-player round extracts.
+
+negative_cache remembers URLs that recently failed for good (404s, 5xx after
+every retry, pages that don't parse) for NEGATIVE_TTL_SECS, so repeated
+loads skip them instead of paying for the retries again.
 """
 
+import hashlib
+import json
+import re
 import sqlite3
+import threading
 import time
+import zlib
+from collections import OrderedDict
 from pathlib import Path
 
+from . import ttl as ttl_mod
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install pdga-ratings-calculator[zstd]
+    zstandard = None
+
 CACHE_TTL_HOURS = 6
 CACHE_TTL_SECS  = CACHE_TTL_HOURS * 3600
 DB_PATH         = Path.home() / ".pdga_ratings_cache.db"
 
+# Columns added after the original (url, html, fetched_at) schema; older
+# databases are migrated in place by _connect().
+_EXTRA_COLUMNS = {
+    "etag":          "TEXT",
+    "last_modified": "TEXT",
+    "content_hash":  "TEXT",
+    "last_access":   "INTEGER",
+    "size":          "INTEGER",
+    "codec":         "TEXT",
+    "ttl_class":     "TEXT",
+}
 
-def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+# Codec for newly written pages: "zstd" (when zstandard is installed),
+# "zlib" or "raw". Rows are decoded by their stored codec (NULL = raw), so
+# changing this needs no migration.
+CODEC      = "zstd" if zstandard is not None else "zlib"
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+BUSY_TIMEOUT_SECS    = 30   # wait this long for another writer before "database is locked"
+STATEMENT_CACHE_SIZE = 64   # prepared statements kept per connection
+SQL_BATCH_SIZE       = 500  # urls per IN (...) query in the batch lookups
+
+# Size bounds, enforced by maintain() in a background thread every
+# MAINTENANCE_EVERY page writes: pages expired for longer than
+# PURGE_GRACE_SECS are purged (until then they're kept for revalidation),
+# then least recently used pages are evicted down to MAX_ROWS / MAX_BYTES.
+MAX_ROWS               = 20_000
+MAX_BYTES              = 256 * 1024 * 1024
+PURGE_GRACE_SECS       = 7 * 24 * 3600
+MAINTENANCE_EVERY      = 200
+ACCESS_RESOLUTION_SECS = 60   # last_access is only rewritten when older than this
+
+NEGATIVE_TTL_SECS = 30 * 60   # how long a failed url is skipped
+
+# One connection per thread (sqlite3 connections can't be shared across
+# threads); the schema is created / migrated once per database file.
+_local        = threading.local()
+_schema_lock  = threading.Lock()
+_schema_ready: set[str] = set()
+
+_maintenance_lock    = threading.Lock()
+_maintenance_running = False
+_writes_since_maintenance = 0
+
+# In-process tier in front of SQLite: decoded pages and extracts, LRU-bounded
+# by entry count and bytes (UTF-8 size of the page or extract). Same TTL as the database; every write, touch,
+# invalidation and eviction in this process updates both tiers. Writes made
+# by other processes are seen once the memory entry expires or is evicted.
+MEMORY_MAX_ENTRIES = 512
+MEMORY_MAX_BYTES   = 32 * 1024 * 1024
+
+_memory_lock  = threading.Lock()
+_memory: OrderedDict = OrderedDict()   # url | (url, kind) -> (entry, size)
+_memory_bytes = 0
+_memory_path: str | None = None        # DB_PATH the tier was filled from
+
+_stats_lock = threading.Lock()
+_stats      = {
+    "hits": 0, "revalidated": 0, "full_fetches": 0,
+    "extract_hits": 0, "extract_misses": 0, "early_exits": 0,
+    "index_hits": 0, "index_misses": 0,
+    "purged": 0, "evicted": 0, "compactions": 0, "stale_hits": 0, "coalesced": 0,
+    "negative_hits": 0, "negative_stored": 0,
+    "memory_hits": 0, "memory_misses": 0, "sqlite_hits": 0, "sqlite_misses": 0,
+}
+
+
+# Player page urls, for tagging pages cached before player_pages existed.
+# Matched on the path, like ttl._CLASSES, so a stand-in server's pages
+# (scraper.set_base_url) are tagged too.
+_PLAYER_URL = re.compile(r"^https?://[^/]+/player/(\d+)(?:/details|/history)?/?$")
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS page_cache (
-            url        TEXT PRIMARY KEY,
-            html       TEXT NOT NULL,
-            fetched_at INTEGER NOT NULL
+            url           TEXT PRIMARY KEY,
+            html          TEXT NOT NULL,
+            fetched_at    INTEGER NOT NULL,
+            etag          TEXT,
+            last_modified TEXT,
+            content_hash  TEXT
+        )
+        """
+    )
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(page_cache)")}
+    for column, decl in _EXTRA_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE page_cache ADD COLUMN {column} {decl}")
+    conn.execute("UPDATE page_cache SET size = length(CAST(html AS BLOB)) WHERE size IS NULL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS extract_cache (
+            url            TEXT NOT NULL,
+            kind           TEXT NOT NULL,
+            content_hash   TEXT NOT NULL,
+            parser_version INTEGER NOT NULL,
+            data           TEXT NOT NULL,
+            PRIMARY KEY (url, kind)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tournament_index (
+            url            TEXT PRIMARY KEY,
+            content_hash   TEXT NOT NULL,
+            parser_version INTEGER NOT NULL,
+            has_body       INTEGER NOT NULL,
+            is_league      INTEGER NOT NULL,
+            date           TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tournament_rounds (
+            url         TEXT NOT NULL,
+            pdga_number TEXT NOT NULL,
+            ratings     TEXT NOT NULL,
+            PRIMARY KEY (url, pdga_number)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS streamed_pages (
+            url            TEXT NOT NULL,
+            pdga_number    TEXT NOT NULL,
+            parser_version INTEGER NOT NULL,
+            data           TEXT NOT NULL,
+            fetched_at     INTEGER NOT NULL,
+            etag           TEXT,
+            last_modified  TEXT,
+            PRIMARY KEY (url, pdga_number)
+        )
+        """
+    )
+    new_player_pages = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'player_pages'"
+    ).fetchone() is None
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS player_pages (
+            pdga_number TEXT NOT NULL,
+            url         TEXT NOT NULL,
+            PRIMARY KEY (pdga_number, url)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS player_pages_url ON player_pages (url)")
+    # invalidate_player() also drops the player's streamed records and
+    # per-player ("rounds/<pdga_number>") extracts.
+    conn.execute("CREATE INDEX IF NOT EXISTS streamed_pages_player ON streamed_pages (pdga_number)")
+    conn.execute("CREATE INDEX IF NOT EXISTS extract_cache_kind ON extract_cache (kind)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS negative_cache (
+            url       TEXT PRIMARY KEY,
+            kind      TEXT NOT NULL,
+            reason    TEXT NOT NULL,
+            failed_at INTEGER NOT NULL
         )
         """
     )
+    if new_player_pages:
+        # Databases from before player tagging: tag the player pages they hold.
+        urls = [url for url, in conn.execute("SELECT url FROM page_cache")]
+        conn.executemany(
+            "INSERT OR IGNORE INTO player_pages (pdga_number, url) VALUES (?, ?)",
+            [(m.group(1), url) for url in urls if (m := _PLAYER_URL.match(url))],
+        )
     conn.commit()
+
+
+def _open(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECS, cached_statements=STATEMENT_CACHE_SIZE)
+    # auto_vacuum only takes effect on a new file, so it goes first; older
+    # databases are converted by the first maintain() pass.
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _schema_lock:
+        if path not in _schema_ready:
+            _create_schema(conn)
+            _schema_ready.add(path)
+    return conn
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    This thread's connection to DB_PATH, opened (and the schema set up) on
+    first use. Connections are never shared between threads, so callers can
+    use them freely; `with _connect() as conn` commits or rolls back without
+    closing. Switching DB_PATH replaces the thread's connection.
+    """
+    path = str(DB_PATH)
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != path:
+        if conn is not None:
+            conn.close()
+        conn = _local.conn = _open(path)
+        _local.path = path
     return conn
 
 
+def close() -> None:
+    """Close the calling thread's connection (reopened on next use)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+def content_hash(html: str) -> str:
+    """Digest used to tie an extract to the exact page content it came from."""
+    return hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+
+def record(event: str, count: int = 1) -> None:
+    """
+    Count a cache outcome: 'hits', 'revalidated' (304), 'full_fetches' (200),
+    'extract_hits', 'extract_misses', 'early_exits' (streamed pages
+    abandoned once the player's row was found), 'index_hits', 'index_misses'
+    (tournament index lookups), 'purged', 'evicted' or 'compactions'
+    (maintain()), 'memory_hits' / 'memory_misses' / 'sqlite_hits' /
+    'sqlite_misses' (page and extract lookups per cache tier).
+    """
+    with _stats_lock:
+        _stats[event] += count
+
+
+def stats() -> dict:
+    """Return a snapshot of the hit / revalidation / full-fetch counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _batches(urls) -> list[list[str]]:
+    """Distinct urls, split to stay under SQLite's bound-parameter limit."""
+    urls = list(dict.fromkeys(urls))
+    return [urls[i:i + SQL_BATCH_SIZE] for i in range(0, len(urls), SQL_BATCH_SIZE)]
+
+
+def _placeholders(batch: list) -> str:
+    return ", ".join("?" * len(batch))
+
+
+def _encode(data: bytes, codec: str) -> bytes | str:
+    """Compress UTF-8 page bytes for storage; "raw" keeps them as TEXT."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("codec 'zstd' needs the zstandard package")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == "zlib":
+        return zlib.compress(data, ZLIB_LEVEL)
+    if codec == "raw":
+        return data.decode("utf-8")
+    raise ValueError(f"Unknown cache codec {codec!r}")
+
+
+def _decode(stored: bytes | str, codec: str | None) -> str | None:
+    """Inverse of _encode; None for a zstd row when zstandard isn't installed."""
+    if codec is None or codec == "raw":
+        return stored
+    if codec == "zlib":
+        return zlib.decompress(stored).decode("utf-8")
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(stored).decode("utf-8")
+    return None
+
+
+def _mark_accessed(conn: sqlite3.Connection, accessed, now: float) -> None:
+    """Bump last_access (the LRU order) for (url, last_access) pairs just read."""
+    stale = [
+        (int(now), url) for url, last_access in accessed
+        if last_access is None or now - last_access > ACCESS_RESOLUTION_SECS
+    ]
+    if stale:
+        conn.executemany("UPDATE page_cache SET last_access = ? WHERE url = ?", stale)
+
+
+# ---------------------------------------------------------------------------
+# In-process memory tier
+# ---------------------------------------------------------------------------
+
+def _memory_check_path() -> None:
+    """Drop the tier when DB_PATH has changed since it was filled (lock held)."""
+    global _memory_bytes, _memory_path
+    path = str(DB_PATH)
+    if path != _memory_path:
+        _memory.clear()
+        _memory_bytes, _memory_path = 0, path
+
+
+def _memory_get(key) -> dict | None:
+    with _memory_lock:
+        _memory_check_path()
+        item = _memory.get(key)
+        if item is None:
+            return None
+        _memory.move_to_end(key)
+        return item[0]
+
+
+def _memory_put(key, entry: dict, size: int) -> None:
+    global _memory_bytes
+    with _memory_lock:
+        _memory_check_path()
+        old = _memory.pop(key, None)
+        if old is not None:
+            _memory_bytes -= old[1]
+        if size > MEMORY_MAX_BYTES:
+            return
+        _memory[key] = (entry, size)
+        _memory_bytes += size
+        while len(_memory) > MEMORY_MAX_ENTRIES or _memory_bytes > MEMORY_MAX_BYTES:
+            _, (_, evicted_size) = _memory.popitem(last=False)
+            _memory_bytes -= evicted_size
+
+
+def _key_url(key) -> str:
+    return key if isinstance(key, str) else key[0]
+
+
+def _memory_discard(match=None) -> None:
+    """Drop memory entries whose key (url or (url, kind)) satisfies match, or all of them."""
+    global _memory_bytes
+    with _memory_lock:
+        _memory_check_path()
+        for key in [k for k in _memory if match is None or match(k)]:
+            _memory_bytes -= _memory.pop(key)[1]
+
+
+def _memory_touch(urls, now: int) -> None:
+    """Carry a touch() (new fetched_at) over to memory entries for urls."""
+    urls = frozenset(urls)
+    with _memory_lock:
+        _memory_check_path()
+        for key, (entry, _) in _memory.items():
+            if _key_url(key) in urls:
+                entry["fetched_at"] = now
+
+
+def _memory_info() -> dict:
+    with _memory_lock:
+        _memory_check_path()
+        return {
+            "entries":     len(_memory),
+            "bytes":       _memory_bytes,
+            "max_entries": MEMORY_MAX_ENTRIES,
+            "max_bytes":   MEMORY_MAX_BYTES,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Pages
+# ---------------------------------------------------------------------------
+
 def get(url: str) -> str | None:
     """Return cached HTML for url if it exists and hasn't expired, else None."""
+    return get_many([url]).get(url)
+
+
+def get_many(urls) -> dict[str, str]:
+    """
+    Batch get(): {url: html} for every url with a fresh cache entry, looked up
+    in one query per SQL_BATCH_SIZE urls. Missing and expired urls are left out.
+    """
+    fresh = {url: entry["html"] for url, entry in get_entries(urls).items() if not entry["expired"]}
+    if fresh:
+        record("hits", len(fresh))
+    return fresh
+
+
+def get_entry(url: str) -> dict | None:
+    """
+    Return the cached entry for url whether or not it has expired, or None.
+    Dict keys: html, fetched_at, etag, last_modified, expires_at, expired.
+    """
+    return get_entries([url]).get(url)
+
+
+def expires_at(url: str, fetched_at: int, ttl_class: str | None = None) -> int:
+    """When a page fetched at fetched_at goes stale, by its URL class (ttl.py)."""
+    return ttl_mod.expires_at(url, fetched_at, CACHE_TTL_SECS, ttl_class)
+
+
+def _public_entry(url: str, entry: dict, now: float) -> dict:
+    expiry = expires_at(url, entry["fetched_at"], entry["ttl_class"])
+    return {
+        "html":          entry["html"],
+        "fetched_at":    entry["fetched_at"],
+        "etag":          entry["etag"],
+        "last_modified": entry["last_modified"],
+        "expires_at":    expiry,
+        "expired":       now > expiry,
+    }
+
+
+def get_entries(urls) -> dict[str, dict]:
+    """
+    Batch get_entry(): {url: entry} for every cached url, expired or not.
+    Served from the memory tier where possible; the rest come from SQLite in
+    one query per SQL_BATCH_SIZE urls and are promoted into memory.
+    Rows this process can't decode (zstd without zstandard) count as missing.
+    """
+    now     = time.time()
+    found   = {}
+    stale   = []   # memory hits whose SQLite last_access (LRU order) is due a bump
+    missing = []
+    for url in dict.fromkeys(urls):
+        cached = _memory_get(url)
+        if cached is None:
+            missing.append(url)
+            continue
+        if now - cached["last_access"] > ACCESS_RESOLUTION_SECS:
+            stale.append((url, cached["last_access"]))
+            cached["last_access"] = int(now)
+        found[url] = cached
+    record("memory_hits", len(found))
+    record("memory_misses", len(missing))
+    if not missing and not stale:
+        return {url: _public_entry(url, entry, now) for url, entry in found.items()}
+
+    with _connect() as conn:
+        _mark_accessed(conn, stale, now)
+        for batch in _batches(missing):
+            rows = conn.execute(
+                "SELECT url, html, codec, fetched_at, etag, last_modified, last_access, ttl_class "
+                f"FROM page_cache WHERE url IN ({_placeholders(batch)})",
+                batch,
+            ).fetchall()
+            _mark_accessed(conn, [(row[0], row[6]) for row in rows], now)
+            for url, stored, codec, fetched_at, etag, last_modified, _, ttl_class in rows:
+                html = _decode(stored, codec)
+                if html is None:
+                    continue
+                found[url] = {
+                    "html":          html,
+                    "fetched_at":    fetched_at,
+                    "etag":          etag,
+                    "last_modified": last_modified,
+                    "last_access":   int(now),
+                    "ttl_class":     ttl_class,
+                }
+                _memory_put(url, found[url], len(html.encode("utf-8")))
+    sqlite_hits = sum(url in found for url in missing)
+    record("sqlite_hits", sqlite_hits)
+    record("sqlite_misses", len(missing) - sqlite_hits)
+    return {url: _public_entry(url, entry, now) for url, entry in found.items()}
+
+
+def set(
+    url:           str,
+    html:          str,
+    etag:          str | None = None,
+    last_modified: str | None = None,
+) -> None:
+    """Store HTML (and any response validators) for url with the current timestamp."""
+    set_many([(url, html, etag, last_modified)])
+
+
+def set_many(items) -> None:
+    """
+    Batch set(): store (url, html) or (url, html, etag, last_modified) tuples
+    in a single transaction, all stamped with the current time. Pages are
+    compressed with CODEC before the transaction starts.
+    """
+    now   = int(time.time())
+    codec = CODEC
+    rows  = []
+    pages = []
+    for item in items:
+        url, html, etag, last_modified = (*item, None, None)[:4]
+        data   = html.encode("utf-8")
+        pages.append((url, html, etag, last_modified, len(data)))
+        stored = _encode(data, codec)
+        size   = len(stored) if isinstance(stored, bytes) else len(data)
+        rows.append((
+            url, stored, codec, now, etag, last_modified, hashlib.sha1(data).hexdigest(), now, size,
+        ))
+    if not rows:
+        return
+    with _connect() as conn:
+        conn.executemany(
+            """
+            INSERT INTO page_cache
+                (url, html, codec, fetched_at, etag, last_modified, content_hash, last_access, size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE
+                SET html          = excluded.html,
+                    codec         = excluded.codec,
+                    fetched_at    = excluded.fetched_at,
+                    etag          = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    last_access   = excluded.last_access,
+                    size          = excluded.size,
+                    ttl_class     = CASE WHEN content_hash = excluded.content_hash
+                                         THEN ttl_class END,
+                    content_hash  = excluded.content_hash
+            """,
+            rows,
+        )
+        conn.executemany("DELETE FROM negative_cache WHERE url = ?", [(page[0],) for page in pages])
+        # The upsert keeps a page's ttl_class when its content is unchanged:
+        # read back what it kept, so the memory tier expires pages the same way.
+        ttl_classes = {}
+        for batch in _batches([page[0] for page in pages]):
+            ttl_classes.update(conn.execute(
+                f"SELECT url, ttl_class FROM page_cache WHERE url IN ({_placeholders(batch)}) "
+                "AND ttl_class IS NOT NULL",
+                batch,
+            ))
+        conn.commit()
+    written = {page[0] for page in pages}
+    _memory_discard(lambda key: _key_url(key) in written)   # extracts of the old content
+    for url, html, etag, last_modified, n_bytes in pages:
+        _memory_put(url, {
+            "html": html, "fetched_at": now, "etag": etag,
+            "last_modified": last_modified, "last_access": now, "ttl_class": ttl_classes.get(url),
+        }, n_bytes)
+    _schedule_maintenance(len(rows))
+
+
+def get_extract(url: str, kind: str, parser_version: int):
+    """
+    Return the cached extract of `kind` for url, or None. Only served while the
+    page itself is fresh, its content hash matches the one the extract was
+    built from, and the extract was produced by `parser_version`.
+    Extracts are kept in the memory tier (as JSON) once read from SQLite.
+    """
+    entry = get_extract_entry(url, kind, parser_version)
+    return entry["data"] if entry is not None else None
+
+
+def get_extract_entry(url: str, kind: str, parser_version: int, max_stale: float = 0) -> dict | None:
+    """
+    get_extract() that also serves extracts of pages expired for at most
+    max_stale seconds (stale-while-revalidate). Returns {"data", "expired"}
+    or None.
+    """
+    now    = time.time()
+    cached = _memory_get((url, kind))
+    if cached is not None and cached["parser_version"] == parser_version:
+        expiry = expires_at(url, cached["fetched_at"], cached["ttl_class"])
+        if now > expiry + max_stale:
+            record("extract_misses")
+            return None
+        record("memory_hits")
+        record("extract_hits")
+        if now - cached["last_access"] > ACCESS_RESOLUTION_SECS:
+            with _connect() as conn:
+                _mark_accessed(conn, [(url, cached["last_access"])], now)
+            cached["last_access"] = int(now)
+        return {"data": json.loads(cached["data"]), "expired": now > expiry}
+    record("memory_misses")
+
     with _connect() as conn:
         row = conn.execute(
-            "SELECT html, fetched_at FROM page_cache WHERE url = ?", (url,)
+            """
+            SELECT e.data, p.fetched_at, p.last_access, p.ttl_class
+              FROM extract_cache e
+              JOIN page_cache p ON p.url = e.url AND p.content_hash = e.content_hash
+             WHERE e.url = ? AND e.kind = ? AND e.parser_version = ?
+            """,
+            (url, kind, parser_version),
         ).fetchone()
-    if row is None:
+        expiry = expires_at(url, row[1], row[3]) if row is not None else None
+        usable = row is not None and now <= expiry + max_stale
+        if usable:
+            _mark_accessed(conn, [(url, row[2])], now)
+    if not usable:
+        record("sqlite_misses")
+        record("extract_misses")
         return None
-    html, fetched_at = row
-    if time.time() - fetched_at > CACHE_TTL_SECS:
-        return None
-    return html
+    record("sqlite_hits")
+    record("extract_hits")
+    data, fetched_at, _, ttl_class = row
+    _memory_put((url, kind), {
+        "data": data, "fetched_at": fetched_at, "ttl_class": ttl_class,
+        "parser_version": parser_version, "last_access": int(now),
+    }, len(data))   # json.dumps escapes non-ASCII, so characters are bytes
+    return {"data": json.loads(data), "expired": now > expiry}
+
+
+def set_extract(url: str, kind: str, digest: str, parser_version: int, data) -> None:
+    """Store a JSON-serialisable extract of the page content identified by digest."""
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT INTO extract_cache (url, kind, content_hash, parser_version, data)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url, kind) DO UPDATE
+                SET content_hash   = excluded.content_hash,
+                    parser_version = excluded.parser_version,
+                    data           = excluded.data
+            """,
+            (url, kind, digest, parser_version, json.dumps(data, separators=(",", ":"))),
+        )
+        # Rows cached before content hashes were stored get theirs backfilled.
+        conn.execute(
+            "UPDATE page_cache SET content_hash = ? WHERE url = ? AND content_hash IS NULL",
+            (digest, url),
+        )
+        conn.execute("DELETE FROM negative_cache WHERE url = ?", (url,))   # it parsed after all
+        conn.commit()
+    _memory_discard(lambda key: key == (url, kind))
+
+
+def get_indexed_page(url: str, pdga_number: str, parser_version: int) -> dict | None:
+    """
+    Look a player up in the tournament index. Returns the same raw record as
+    an extract backend's tournament_page() (ratings None if the player isn't
+    on the page), or None if the page isn't indexed, has gone stale, changed
+    since it was indexed, or was indexed by another parser version.
+    """
+    return get_indexed_pages([url], pdga_number, parser_version).get(url)
+
+
+def get_indexed_pages(urls, pdga_number: str, parser_version: int) -> dict[str, dict]:
+    """Batch get_indexed_page(): {url: record} for every url served by the index."""
+    return {
+        url: entry["page"]
+        for url, entry in get_indexed_entries(urls, pdga_number, parser_version).items()
+    }
+
+
+def get_indexed_entries(
+    urls, pdga_number: str, parser_version: int, max_stale: float = 0
+) -> dict[str, dict]:
+    """
+    get_indexed_pages() that also serves pages expired for at most max_stale
+    seconds (stale-while-revalidate): {url: {"page": record, "expired": bool}}.
+    """
+    urls    = list(dict.fromkeys(urls))
+    now     = time.time()
+    entries = {}
+    with _connect() as conn:
+        for batch in _batches(urls):
+            rows = conn.execute(
+                f"""
+                SELECT t.url, t.has_body, t.is_league, t.date, p.fetched_at, r.ratings,
+                       p.last_access, p.ttl_class
+                  FROM tournament_index t
+                  JOIN page_cache p ON p.url = t.url AND p.content_hash = t.content_hash
+                  LEFT JOIN tournament_rounds r ON r.url = t.url AND r.pdga_number = ?
+                 WHERE t.url IN ({_placeholders(batch)}) AND t.parser_version = ?
+                """,
+                [pdga_number, *batch, parser_version],
+            ).fetchall()
+            expiry = {row[0]: expires_at(row[0], row[4], row[7]) for row in rows}
+            rows   = [row for row in rows if now <= expiry[row[0]] + max_stale]
+            _mark_accessed(conn, [(row[0], row[6]) for row in rows], now)
+            for url, has_body, is_league, date, _, ratings, _, _ in rows:
+                entries[url] = {
+                    "page": {
+                        "has_body":  bool(has_body),
+                        "is_league": bool(is_league),
+                        "date":      date,
+                        "ratings":   json.loads(ratings) if ratings else None,
+                    },
+                    "expired": now > expiry[url],
+                }
+    if entries:
+        record("index_hits", len(entries))
+    if len(urls) > len(entries):
+        record("index_misses", len(urls) - len(entries))
+    return entries
 
 
-def set(url: str, html: str) -> None:
-    """Store HTML for url with the current timestamp."""
+def is_indexed(url: str, digest: str, parser_version: int) -> bool:
+    """Whether url is indexed from the page with content hash digest, by parser_version."""
     with _connect() as conn:
+        row = conn.execute(
+            "SELECT 1 FROM tournament_index WHERE url = ? AND content_hash = ? AND parser_version = ?",
+            (url, digest, parser_version),
+        ).fetchone()
+    return row is not None
+
+
+def index_tournament(url: str, digest: str, parser_version: int, results: dict) -> None:
+    """
+    Store a backend's tournament_results() for the page content identified by
+    digest, replacing whatever was indexed for url before.
+    """
+    with _connect() as conn:
+        conn.execute("DELETE FROM tournament_rounds WHERE url = ?", (url,))
         conn.execute(
             """
-            INSERT INTO page_cache (url, html, fetched_at)
-            VALUES (?, ?, ?)
+            INSERT INTO tournament_index
+                (url, content_hash, parser_version, has_body, is_league, date)
+            VALUES (?, ?, ?, ?, ?, ?)
             ON CONFLICT(url) DO UPDATE
-                SET html       = excluded.html,
-                    fetched_at = excluded.fetched_at
+                SET content_hash   = excluded.content_hash,
+                    parser_version = excluded.parser_version,
+                    has_body       = excluded.has_body,
+                    is_league      = excluded.is_league,
+                    date           = excluded.date
+            """,
+            (url, digest, parser_version, results["has_body"], results["is_league"], results["date"]),
+        )
+        conn.executemany(
+            "INSERT INTO tournament_rounds (url, pdga_number, ratings) VALUES (?, ?, ?)",
+            [
+                (url, pdga_number, json.dumps(ratings, separators=(",", ":")))
+                for pdga_number, ratings in results["players"].items()
+            ],
+        )
+        conn.execute(
+            "UPDATE page_cache SET content_hash = ? WHERE url = ? AND content_hash IS NULL",
+            (digest, url),
+        )
+        conn.execute("DELETE FROM negative_cache WHERE url = ?", (url,))   # it parsed after all
+        conn.commit()
+
+
+def get_streamed_page(url: str, pdga_number: str, parser_version: int) -> dict | None:
+    """
+    The record a streaming lookup stored for pdga_number on url's page, or
+    None: {"page", "etag", "last_modified", "fetched_at", "expires_at",
+    "expired"}. Expired records are returned too, for their validators.
+    """
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT data, fetched_at, etag, last_modified FROM streamed_pages "
+            "WHERE url = ? AND pdga_number = ? AND parser_version = ?",
+            (url, pdga_number, parser_version),
+        ).fetchone()
+    if row is None:
+        return None
+    data, fetched_at, etag, last_modified = row
+    expiry = expires_at(url, fetched_at)
+    return {
+        "page":          json.loads(data),
+        "etag":          etag,
+        "last_modified": last_modified,
+        "fetched_at":    fetched_at,
+        "expires_at":    expiry,
+        "expired":       time.time() > expiry,
+    }
+
+
+def set_streamed_page(
+    url:            str,
+    pdga_number:    str,
+    parser_version: int,
+    page:           dict,
+    etag:           str | None = None,
+    last_modified:  str | None = None,
+) -> None:
+    """Store a streaming lookup's tournament_page() record for one player, stamped now."""
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO streamed_pages
+                (url, pdga_number, parser_version, data, fetched_at, etag, last_modified)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            (url, html, int(time.time())),
+            (url, pdga_number, parser_version, json.dumps(page, separators=(",", ":")),
+             int(time.time()), etag, last_modified),
+        )
+        conn.execute("DELETE FROM negative_cache WHERE url = ?", (url,))
+        conn.commit()
+    _schedule_maintenance(1)
+
+
+def touch_streamed_page(url: str, pdga_number: str) -> None:
+    """Mark a streamed record as freshly validated (after a 304 Not Modified)."""
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE streamed_pages SET fetched_at = ? WHERE url = ? AND pdga_number = ?",
+            (int(time.time()), url, pdga_number),
+        )
+        conn.execute("DELETE FROM negative_cache WHERE url = ? AND kind = 'fetch'", (url,))
+        conn.commit()
+
+
+def touch(url: str) -> None:
+    """Mark a cached entry as freshly validated (after a 304 Not Modified)."""
+    touch_many([url])
+
+
+def touch_many(urls) -> None:
+    """Batch touch() in a single transaction."""
+    now  = int(time.time())
+    urls = list(dict.fromkeys(urls))
+    with _connect() as conn:
+        conn.executemany(
+            "UPDATE page_cache SET fetched_at = ? WHERE url = ?",
+            [(now, url) for url in urls],
+        )
+        conn.executemany(
+            "DELETE FROM negative_cache WHERE url = ? AND kind = 'fetch'", [(url,) for url in urls]
+        )
+        conn.commit()
+    _memory_touch(urls, now)
+
+
+def set_ttl_class(url: str, ttl_class: str | None) -> None:
+    """
+    Override the URL class that picks url's expiry rule (see ttl.py). Kept
+    until the page's content changes; None goes back to classify(url).
+    """
+    with _connect() as conn:
+        conn.execute("UPDATE page_cache SET ttl_class = ? WHERE url = ?", (ttl_class, url))
+        conn.commit()
+    _memory_discard(lambda key: _key_url(key) == url)
+
+
+def set_negative(url: str, kind: str, reason: str) -> None:
+    """
+    Remember that url failed: kind "fetch" (404, or 5xx after every retry) or
+    "parse" (the page didn't parse). Skipped by get_negatives() for
+    NEGATIVE_TTL_SECS, until the page is written again or invalidated.
+    """
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO negative_cache (url, kind, reason, failed_at) VALUES (?, ?, ?, ?)",
+            (url, kind, reason, int(time.time())),
+        )
+        conn.commit()
+    record("negative_stored")
+
+
+def get_negative(url: str) -> dict | None:
+    """Return {"kind", "reason", "failed_at"} if url failed recently, else None."""
+    return get_negatives([url]).get(url)
+
+
+def get_negatives(urls) -> dict[str, dict]:
+    """Batch get_negative(): {url: failure} for every url that failed recently."""
+    urls  = list(dict.fromkeys(urls))
+    since = int(time.time()) - NEGATIVE_TTL_SECS
+    found = {}
+    with _connect() as conn:
+        for batch in _batches(urls):
+            for url, kind, reason, failed_at in conn.execute(
+                "SELECT url, kind, reason, failed_at FROM negative_cache "
+                f"WHERE url IN ({_placeholders(batch)}) AND failed_at >= ?",
+                [*batch, since],
+            ):
+                found[url] = {"kind": kind, "reason": reason, "failed_at": failed_at}
+    if found:
+        record("negative_hits", len(found))
+    return found
+
+
+def tag_player(pdga_number: str, urls) -> None:
+    """Record that urls were fetched for pdga_number (see invalidate_player)."""
+    with _connect() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO player_pages (pdga_number, url) VALUES (?, ?)",
+            [(pdga_number, url) for url in dict.fromkeys(urls)],
         )
         conn.commit()
 
@@ -62,39 +923,209 @@ def set(url: str, html: str) -> None:
 def invalidate(url: str) -> None:
     """Force-expire a single cached entry."""
     with _connect() as conn:
-        conn.execute("DELETE FROM page_cache WHERE url = ?", (url,))
+        for table in (
+            "page_cache", "extract_cache", "tournament_index", "tournament_rounds", "player_pages",
+            "negative_cache", "streamed_pages",
+        ):
+            conn.execute(f"DELETE FROM {table} WHERE url = ?", (url,))
         conn.commit()
+    _memory_discard(lambda key: _key_url(key) == url)
 
 
 def invalidate_player(pdga_number: str) -> None:
-    """Force-expire all cached pages for a given PDGA number."""
+    """
+    Force-expire the pages fetched for a given PDGA number (tag_player), and
+    the rounds its streaming lookups stored, by keyed lookups. Shared pages
+    such as tournament results are kept.
+    """
+    kind = f"rounds/{pdga_number}"
     with _connect() as conn:
-        conn.execute(
-            "DELETE FROM page_cache WHERE url LIKE ?", (f"%/{pdga_number}%",)
-        )
+        urls = [(url,) for url, in conn.execute(
+            "SELECT url FROM player_pages WHERE pdga_number = ?", (pdga_number,)
+        )]
+        for table in ("page_cache", "extract_cache", "negative_cache"):
+            conn.executemany(f"DELETE FROM {table} WHERE url = ?", urls)
+        conn.execute("DELETE FROM player_pages WHERE pdga_number = ?", (pdga_number,))
+        conn.execute("DELETE FROM streamed_pages WHERE pdga_number = ?", (pdga_number,))
+        conn.execute("DELETE FROM extract_cache WHERE kind = ?", (kind,))
         conn.commit()
+    removed = {url for url, in urls}
+    _memory_discard(lambda key: _key_url(key) in removed or (isinstance(key, tuple) and key[1] == kind))
 
 
 def clear_all() -> None:
     """Wipe the entire cache."""
     with _connect() as conn:
-        conn.execute("DELETE FROM page_cache")
+        for table in (
+            "page_cache", "extract_cache", "tournament_index", "tournament_rounds", "player_pages",
+            "negative_cache", "streamed_pages",
+        ):
+            conn.execute(f"DELETE FROM {table}")
+        conn.commit()
+    _memory_discard()
+
+
+# ---------------------------------------------------------------------------
+# Size bounds: purge, LRU eviction, compaction
+# ---------------------------------------------------------------------------
+
+def _schedule_maintenance(writes: int) -> None:
+    """Start a background maintain() pass once every MAINTENANCE_EVERY writes."""
+    global _maintenance_running, _writes_since_maintenance
+    with _maintenance_lock:
+        _writes_since_maintenance += writes
+        if _maintenance_running or _writes_since_maintenance < MAINTENANCE_EVERY:
+            return
+        _maintenance_running, _writes_since_maintenance = True, 0
+    threading.Thread(target=_background_maintain, name="pdga-cache-maintenance", daemon=True).start()
+
+
+def _background_maintain() -> None:
+    global _maintenance_running
+    try:
+        maintain()
+    except sqlite3.OperationalError:
+        pass  # busy for longer than the timeout; the next pass will catch up
+    finally:
+        close()
+        with _maintenance_lock:
+            _maintenance_running = False
+
+
+def maintain() -> dict:
+    """
+    Enforce the size bounds: purge pages and streamed records expired for
+    longer than PURGE_GRACE_SECS and expired negative entries, evict least recently used pages until the cache is
+    within MAX_ROWS and MAX_BYTES, drop extracts, index rows and player tags
+    left without their page, then return free pages to the filesystem. Runs
+    in the background as the cache is written; safe to call directly.
+    Returns {"purged": n, "evicted": n, "compacted": bool}.
+    """
+    now = time.time()
+    with _connect() as conn:
+        # Every TTL is at least the default, so only older rows are candidates.
+        candidates = conn.execute(
+            "SELECT url, fetched_at, ttl_class FROM page_cache WHERE fetched_at < ?",
+            (int(now - CACHE_TTL_SECS - PURGE_GRACE_SECS),),
+        ).fetchall()
+        purged = [
+            url for url, fetched_at, ttl_class in candidates
+            if expires_at(url, fetched_at, ttl_class) + PURGE_GRACE_SECS < now
+        ]
+        conn.executemany("DELETE FROM page_cache WHERE url = ?", [(url,) for url in purged])
+        streamed = conn.execute(
+            "SELECT url, pdga_number, fetched_at FROM streamed_pages WHERE fetched_at < ?",
+            (int(now - CACHE_TTL_SECS - PURGE_GRACE_SECS),),
+        ).fetchall()
+        conn.executemany(
+            "DELETE FROM streamed_pages WHERE url = ? AND pdga_number = ?",
+            [(url, pdga_number) for url, pdga_number, fetched_at in streamed
+             if expires_at(url, fetched_at) + PURGE_GRACE_SECS < now],
+        )
+        rows, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM page_cache"
+        ).fetchone()
+        victims = []
+        if rows > MAX_ROWS or size > MAX_BYTES:
+            lru = conn.execute(
+                "SELECT url, size FROM page_cache ORDER BY COALESCE(last_access, fetched_at), url"
+            ).fetchall()
+            for url, page_size in lru:
+                if rows <= MAX_ROWS and size <= MAX_BYTES:
+                    break
+                victims.append((url,))
+                rows -= 1
+                size -= page_size or 0
+            conn.executemany("DELETE FROM page_cache WHERE url = ?", victims)
+        conn.execute(
+            "DELETE FROM negative_cache WHERE failed_at < ?", (int(now) - NEGATIVE_TTL_SECS,)
+        )
+        if purged or victims:
+            for table in ("extract_cache", "tournament_index", "tournament_rounds", "player_pages"):
+                conn.execute(f"DELETE FROM {table} WHERE url NOT IN (SELECT url FROM page_cache)")
         conn.commit()
+    removed = {*purged, *(url for url, in victims)}
+    if removed:
+        _memory_discard(lambda key: _key_url(key) in removed)
+    compacted = _compact()
+    record("purged", len(purged))
+    record("evicted", len(victims))
+    record("compactions", int(compacted))
+    return {"purged": len(purged), "evicted": len(victims), "compacted": compacted}
+
+
+def _compact() -> bool:
+    """incremental_vacuum the free pages; databases from before auto_vacuum get one full VACUUM."""
+    conn = _connect()
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    if conn.execute("PRAGMA freelist_count").fetchone()[0] == 0:
+        return False
+    conn.execute("PRAGMA incremental_vacuum")
+    conn.commit()
+    return True
 
 
 def cache_info() -> list[dict]:
     """Return metadata about all cached entries (for debugging/display)."""
     with _connect() as conn:
         rows = conn.execute(
-            "SELECT url, fetched_at FROM page_cache ORDER BY fetched_at DESC"
+            "SELECT url, fetched_at, last_access, size, "
+            "etag IS NOT NULL OR last_modified IS NOT NULL, ttl_class "
+            "FROM page_cache ORDER BY fetched_at DESC"
         ).fetchall()
     now = time.time()
     return [
         {
-            "url":         url,
-            "fetched_at":  fetched_at,
-            "age_minutes": round((now - fetched_at) / 60, 1),
-            "expired":     (now - fetched_at) > CACHE_TTL_SECS,
+            "url":           url,
+            "fetched_at":    fetched_at,
+            "last_access":   last_access,
+            "size":          page_size,
+            "age_minutes":   round((now - fetched_at) / 60, 1),
+            "ttl_class":     ttl_class or ttl_mod.classify(url),
+            "expires_at":    expires_at(url, fetched_at, ttl_class),
+            "expired":       now > expires_at(url, fetched_at, ttl_class),
+            "revalidatable": bool(revalidatable),
         }
-        for url, fetched_at in rows
+        for url, fetched_at, last_access, page_size, revalidatable, ttl_class in rows
     ]
+
+
+def cache_stats() -> dict:
+    """
+    Return the cache's size against its bounds, the memory tier's occupancy,
+    the urls currently negatively cached, per-tier hit rates, and hit /
+    revalidation / full-fetch / eviction / short-circuit counters for this
+    process (for debugging/display).
+    """
+    counts = stats()
+    with _connect() as conn:
+        n_rows, n_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM page_cache"
+        ).fetchone()
+        negatives = conn.execute(
+            "SELECT url, kind, reason, failed_at FROM negative_cache WHERE failed_at >= ? "
+            "ORDER BY failed_at DESC",
+            (int(time.time()) - NEGATIVE_TTL_SECS,),
+        ).fetchall()
+    return {
+        "size": {
+            "rows":      n_rows,
+            "bytes":     n_bytes,
+            "max_rows":  MAX_ROWS,
+            "max_bytes": MAX_BYTES,
+        },
+        "memory": _memory_info(),
+        "negative": [
+            {"url": url, "kind": kind, "reason": reason, "failed_at": failed_at}
+            for url, kind, reason, failed_at in negatives
+        ],
+        "hit_rates": {
+            tier: (counts[f"{tier}_hits"] / lookups) if lookups else None
+            for tier in ("memory", "sqlite")
+            for lookups in [counts[f"{tier}_hits"] + counts[f"{tier}_misses"]]
+        },
+        "stats": counts,
+    }
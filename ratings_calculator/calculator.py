@@ -5,6 +5,9 @@ Pure rating math. No I/O, no side effects — all functions are unit-testable
 without any network mocking.
 """
 
+import math
+from bisect import bisect_right
+from collections import Counter
 from datetime import datetime
 from operator import itemgetter
 
@@ -29,14 +32,15 @@ def compute_lookback_window(rounds: list[dict]) -> tuple[int, int]:
     """
     if not rounds:
         raise ValueError("No rounds provided to compute lookback window.")
+    return _lookback_window(np.fromiter((r["timestamp"] for r in rounds), dtype=np.int64, count=len(rounds)))
 
-    most_recent = max(r["timestamp"] for r in rounds)
-    last_date   = most_recent - ONE_YEAR_SECS
 
-    in_window = [r for r in rounds if r["timestamp"] > last_date]
-    if len(in_window) < MIN_ROUNDS_1_YEAR:
+def _lookback_window(timestamps: np.ndarray) -> tuple[int, int]:
+    """compute_lookback_window over a non-empty array of round timestamps."""
+    most_recent = int(timestamps.max())
+    last_date   = most_recent - ONE_YEAR_SECS
+    if np.count_nonzero(timestamps > last_date) < MIN_ROUNDS_1_YEAR:
         last_date = most_recent - TWO_YEARS_SECS
-
     return most_recent, last_date
 
 
@@ -71,6 +75,171 @@ def compute_pdga_rating(ratings: list[int]) -> tuple[int, float]:
     return projected, drop_below
 
 
+# ---------------------------------------------------------------------------
+# Batch rating computation
+# ---------------------------------------------------------------------------
+
+def pack_ratings(players: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten per-player rating lists into the (ratings, offsets) layout of
+    compute_pdga_ratings: player i's ratings are ratings[offsets[i]:offsets[i + 1]].
+    """
+    lengths = np.fromiter((len(p) for p in players), dtype=np.int64, count=len(players))
+    offsets = np.zeros(len(players) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    ratings = np.fromiter(
+        (r for p in players for r in p), dtype=np.int64, count=int(offsets[-1])
+    )
+    return ratings, offsets
+
+
+def compute_pdga_ratings(ratings, offsets) -> tuple[np.ndarray, np.ndarray]:
+    """
+    compute_pdga_rating for many players at once, in vectorized passes with
+    no per-player Python loop. `ratings` is every player's round ratings
+    concatenated and `offsets` (length players + 1, starting at 0) marks
+    where each player's run begins; see pack_ratings.
+
+    Returns (projected_ratings, drop_below_cutoffs), one entry per player and
+    identical to compute_pdga_rating's: the standard deviation is summed in
+    each player's round order exactly as np.std does, and the averages come
+    from exact integer sums. Raises ValueError if a player has no ratings or
+    no ratings left after the outlier cut, like the scalar function.
+    """
+    ratings = np.asarray(ratings, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(ratings):
+        raise ValueError("offsets must start at 0 and end at len(ratings).")
+    counts = np.diff(offsets)
+    if (counts <= 0).any():
+        raise ValueError(f"No ratings provided for player {int(np.argmax(counts <= 0))}.")
+    n_players = len(counts)
+    starts    = offsets[:-1]
+    player    = np.repeat(np.arange(n_players), counts)
+
+    # Outlier cutoff: mean and population std per player, as np.mean / np.std.
+    values = ratings.astype(float)
+    avg    = np.add.reduceat(values, starts) / counts
+    dev    = values - avg[player]
+    std    = np.sqrt(np.add.reduceat(dev * dev, starts) / counts)
+    drop_below = np.round(np.minimum(avg - 100.0, avg - 2.5 * std))
+
+    # Surviving rounds, sorted best first within each player.
+    keep     = ratings >= drop_below[player]
+    kept     = np.bincount(player, weights=keep, minlength=n_players).astype(np.int64)
+    if (kept == 0).any():
+        raise ValueError(
+            f"All rounds were filtered as outliers for player {int(np.argmax(kept == 0))} "
+            "— cannot compute rating."
+        )
+    survivors, owner = ratings[keep], player[keep]
+    best, span = int(survivors.max()), int(survivors.max() - survivors.min()) + 1
+    if n_players * span < 2 ** 62:
+        # One flat sort of (player, best first) packed into a single key.
+        keys      = np.sort(owner * span + (best - survivors))
+        owner     = keys // span
+        survivors = best - keys % span
+    else:
+        order = np.lexsort((-survivors, owner))
+        survivors, owner = survivors[order], owner[order]
+    kept_starts = np.concatenate(([0], np.cumsum(kept)[:-1]))
+    rank        = np.arange(len(survivors)) - kept_starts[owner]
+
+    # Top quarter doubled once a player has MIN_ROUNDS_1_YEAR rounds left.
+    doubled  = np.where(kept >= MIN_ROUNDS_1_YEAR, kept // 4, 0)
+    total    = np.bincount(owner, weights=survivors, minlength=n_players)
+    top      = np.bincount(owner, weights=np.where(rank < doubled[owner], survivors, 0), minlength=n_players)
+    projected = np.round((total + top) / (kept + doubled)).astype(np.int64)
+    return projected, drop_below
+
+
+# ---------------------------------------------------------------------------
+# Columnar round store
+# ---------------------------------------------------------------------------
+
+def _whatif_round(i: int, rating: int, now: int) -> dict:
+    return {"name": f"Hypothetical Round {i + 1}", "rating": rating, "timestamp": now, "round": i + 1}
+
+
+class RoundStore:
+    """
+    A player's rounds as columns, newest first: `rating`, `timestamp` and
+    `round` arrays, the masks `evaluated` and `included` (PDGA's Yes / No
+    flags on rated rounds), `incoming` (new and hypothetical rounds) and
+    `hypothetical`, and `index`, each row's position in `records`. `round`
+    numbers the incoming rounds; rated rounds keep PDGA's round text in
+    their dicts and are 0 here.
+
+    `records` are the round dicts in build_used_rounds' order: new rounds,
+    then hypothetical ones (created here, timestamped `now`), then
+    `tournaments`. Selections are boolean masks over the rows; rows() turns
+    one back into those dicts for results and display.
+    """
+
+    def __init__(
+        self,
+        tournaments:     list[dict],
+        new_tournaments: list[dict],
+        whatif_ratings:  list[int] | None = None,
+        now:             int | None = None,
+    ):
+        self.now     = int(datetime.now().timestamp()) if now is None else now
+        whatif       = [_whatif_round(i, r, self.now) for i, r in enumerate(whatif_ratings or [])]
+        self.records = new_tournaments + whatif + tournaments
+        n            = len(self.records)
+        n_incoming   = len(new_tournaments) + len(whatif)
+
+        def column(values: list, dtype) -> np.ndarray:
+            return np.fromiter(values, dtype=dtype, count=n)
+
+        timestamp  = column([r["timestamp"] for r in self.records], np.int64)
+        self.index = position = np.argsort(-timestamp, kind="stable")   # ties keep record order, as sorted() does
+        rounds     = [r.get("round", 0) for r in self.records[:n_incoming]]
+
+        self.timestamp    = timestamp[position]
+        self.rating       = column([r["rating"] for r in self.records], np.int64)[position]
+        self.round        = column(rounds + [0] * (n - n_incoming), np.int64)[position]
+        self.incoming     = position < n_incoming
+        self.hypothetical = self.incoming & (position >= len(new_tournaments))
+        self.evaluated    = ~self.incoming & column([r.get("evaluated") == "Yes" for r in self.records], bool)[position]
+        self.included     = ~self.incoming & column([r.get("included") == "Yes" for r in self.records], bool)[position]
+
+    def lookback_window(self) -> tuple[int, int]:
+        """compute_lookback_window over the incoming and evaluated rounds."""
+        candidates = self.incoming | self.evaluated
+        if not candidates.any():
+            raise ValueError("No evaluated rounds found for this player.")
+        return _lookback_window(self.timestamp[candidates])
+
+    def rated(self, last_date: int) -> np.ndarray:
+        """Evaluated rounds inside the window."""
+        return self.evaluated & (self.timestamp > last_date)
+
+    def used(self, last_date: int) -> np.ndarray:
+        """The rounds the rating is computed from: incoming ones, and rated
+        ones in the window that PDGA has not already dropped as outliers."""
+        return self.incoming | (self.rated(last_date) & self.included)
+
+    def outgoing(self, last_date: int) -> np.ndarray:
+        """Evaluated rounds that have fallen out of the window."""
+        return self.evaluated & (self.timestamp <= last_date)
+
+    def rows(self, mask: np.ndarray, by_time: bool = False) -> list[dict]:
+        """The round dicts selected by mask, in record order or (by_time) by
+        (timestamp, round)."""
+        if by_time:
+            rows = np.flatnonzero(mask)
+            rows = rows[np.argsort(self.index[rows], kind="stable")]
+            rows = rows[np.lexsort((self.round[rows], self.timestamp[rows]))]
+            positions = self.index[rows]
+        else:
+            selected = np.zeros(len(self.records), dtype=bool)
+            selected[self.index] = mask
+            positions = np.flatnonzero(selected)
+        records = self.records
+        return [records[i] for i in positions.tolist()]
+
+
 # ---------------------------------------------------------------------------
 # Build the round set used for computation
 # ---------------------------------------------------------------------------
@@ -86,81 +255,351 @@ def build_used_rounds(
 
     Returns (used_rounds, last_date).
     """
-    now = int(datetime.now().timestamp())
-
-    whatif_rounds: list[dict] = []
-    if whatif_ratings:
-        for i, r in enumerate(whatif_ratings):
-            whatif_rounds.append({
-                "name":      f"Hypothetical Round {i + 1}",
-                "rating":    r,
-                "timestamp": now,
-                "round":     i + 1,
-            })
-
-    all_new = new_tournaments + whatif_rounds
-
-    all_candidates = all_new + [t for t in tournaments if t.get("evaluated") == "Yes"]
-    if not all_candidates:
-        raise ValueError("No evaluated rounds found for this player.")
-
-    _, last_date = compute_lookback_window(all_candidates)
-
-    used_rounds = all_new + [
-        t for t in tournaments
-        if t.get("evaluated") == "Yes"
-        and t["timestamp"] > last_date
-        and t.get("included") == "Yes"  # respect rounds PDGA already dropped as outliers
-    ]
-
-    return used_rounds, last_date
+    store        = RoundStore(tournaments, new_tournaments, whatif_ratings)
+    _, last_date = store.lookback_window()
+    return store.rows(store.used(last_date)), last_date
 
 
 def project_rating(
     tournaments:     list[dict],
     new_tournaments: list[dict],
     whatif_ratings:  list[int] | None = None,
+    state:           "RatingState | None" = None,
 ) -> dict:
     """
     Full projection pipeline. Returns a result dict with all display data.
+    Pass a RatingState built from the same tournaments to answer from it
+    incrementally (only the what-if rounds are applied) instead of from scratch.
     """
-    used_rounds, last_date = build_used_rounds(tournaments, new_tournaments, whatif_ratings)
+    if state is not None:
+        state.set_whatif(whatif_ratings or [])
+        return state.result()
 
-    sorted_rounds = sorted(used_rounds, key=itemgetter("timestamp"), reverse=True)
-    ratings_list  = [r["rating"] for r in sorted_rounds]
+    store        = RoundStore(tournaments, new_tournaments, whatif_ratings)
+    _, last_date = store.lookback_window()
+    used         = store.used(last_date)
 
-    projected, drop_below = compute_pdga_rating(ratings_list)
-
-    rated_in_window = {
-        id(t) for t in tournaments
-        if t.get("evaluated") == "Yes" and t["timestamp"] > last_date
-    }
-
-    outgoing = [
-        t for t in tournaments
-        if t.get("evaluated") == "Yes" and t["timestamp"] <= last_date
-    ]
-    incoming = sorted(
-        [r for r in used_rounds if id(r) not in rated_in_window],
-        key=lambda x: (x.get("timestamp", 0), x.get("round", 0)),
-    )
-    outliers = [r for r in used_rounds if r["rating"] < drop_below]
+    # Rows are newest first, the order compute_pdga_rating takes them in.
+    projected, drop_below = compute_pdga_rating(store.rating[used].tolist())
 
     return {
         "projected_rating": projected,
         "drop_below":       drop_below,
-        "outgoing_rounds":  outgoing,
-        "incoming_rounds":  incoming,
-        "outlier_rounds":   outliers,
-        "used_rounds":      used_rounds,
+        "outgoing_rounds":  store.rows(store.outgoing(last_date)),
+        "incoming_rounds":  store.rows(store.incoming, by_time=True),
+        "outlier_rounds":   store.rows(used & (store.rating < drop_below)),
+        "used_rounds":      store.rows(used),
         "last_date":        last_date,
     }
 
 
+# ---------------------------------------------------------------------------
+# Incremental projection for what-if rounds
+# ---------------------------------------------------------------------------
+
+class _RatingTree:
+    """
+    Multiset of integer ratings in two Fenwick trees (count and sum per
+    rating value), indexed best first, so counts / sums of the ratings at or
+    above a value and the sum of the top q ratings cost O(log range).
+    """
+
+    def __init__(self, lo: int, hi: int, counts: dict[int, int] | None = None):
+        self.lo, self.hi = lo, hi
+        self.size  = hi - lo + 1
+        self.count = [0] * (self.size + 1)
+        self.total = [0] * (self.size + 1)
+        if counts:
+            # Bulk build: node i covers slots (i - lowbit(i), i], a difference
+            # of prefix sums.
+            slots = np.zeros(self.size + 1, dtype=np.int64)
+            np.add.at(slots, hi - np.fromiter(counts, dtype=np.int64) + 1,
+                      np.fromiter(counts.values(), dtype=np.int64))
+            values = hi - np.arange(-1, self.size, dtype=np.int64)   # rating held by each slot
+            node   = np.arange(self.size + 1)
+            below  = node - (node & -node)
+            for prefix, tree in ((np.cumsum(slots), "count"), (np.cumsum(slots * values), "total")):
+                setattr(self, tree, (prefix - prefix[below]).tolist())
+
+    def add(self, rating: int, k: int = 1) -> None:
+        i = self.hi - rating + 1
+        while i <= self.size:
+            self.count[i] += k
+            self.total[i] += k * rating
+            i += i & -i
+
+    def at_least(self, rating: float) -> tuple[int, int]:
+        """(count, sum) of the ratings >= rating."""
+        i = min(self.size, max(0, self.hi - math.ceil(rating) + 1))
+        n = s = 0
+        while i > 0:
+            n += self.count[i]
+            s += self.total[i]
+            i -= i & -i
+        return n, s
+
+    def top(self, q: int) -> int:
+        """Sum of the q highest ratings (q <= number held)."""
+        pos = n = s = 0
+        step = 1 << (self.size.bit_length() - 1)
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and n + self.count[nxt] < q:
+                pos = nxt
+                n  += self.count[nxt]
+                s  += self.total[nxt]
+            step >>= 1
+        return s + (q - n) * (self.hi - pos)   # slot pos + 1 holds the q-th best
+
+
+class RatingState:
+    """
+    project_rating for one player, kept up to date as hypothetical rounds are
+    added and removed (the GUI's what-if panel) instead of being rebuilt.
+
+    The rounds in use live in a _RatingTree with running sums and sums of
+    squares, so a what-if change updates the outlier cutoff, the top-quarter
+    doubling and the projection in O(log range). A change that moves the
+    lookback window (the first what-if round, or enough of them to fill the
+    1-year window) adds or drops just the rounds between the two windows.
+    projection() and result() give exactly what compute_pdga_rating and
+    project_rating would for the same rounds.
+    """
+
+    _TREE_MARGIN = 32   # spare rating values either side, so what-ifs rarely resize
+    _BULK        = 16   # changes to more distinct ratings rebuild the trees in bulk
+
+    def __init__(
+        self,
+        tournaments:     list[dict],
+        new_tournaments: list[dict],
+        whatif_ratings:  list[int] | None = None,
+        now:             int | None = None,
+    ):
+        self.tournaments     = tournaments
+        self.new_tournaments = new_tournaments
+        self.now             = int(datetime.now().timestamp()) if now is None else now
+
+        self.store = store = RoundStore(tournaments, new_tournaments, now=self.now)
+        candidates = store.timestamp[store.incoming | store.evaluated]
+        self._base_window = _lookback_window(candidates)[1] if len(candidates) else None
+        # Once there are what-if rounds (timestamped now) the window is
+        # anchored at most_recent and only the 1-year round count changes.
+        self._most_recent = max(self.now, int(candidates.max(initial=self.now)))
+        self._in_year     = int(np.count_nonzero(candidates > self._most_recent - ONE_YEAR_SECS))
+
+        # Evaluated, included rounds oldest first, for moving the window.
+        windowed = store.evaluated & store.included
+        self._window_ts      = store.timestamp[windowed][::-1].tolist()
+        self._window_ratings = store.rating[windowed][::-1].tolist()
+        self._incoming = store.rows(store.incoming, by_time=True)
+        self._views: dict[int, tuple[list[dict], list[dict]]] = {}
+
+        self._counts: Counter = Counter()
+        self._n = self._sum = self._sumsq = 0
+        self._tree: _RatingTree | None = None   # built on first use
+        self._reserved: tuple[int, int] | None = None
+        self._whatif    = list(whatif_ratings or [])
+        self._last_date = self._window_for(len(self._whatif))
+        self._add(
+            [r["rating"] for r in new_tournaments]
+            + self._window_ratings[self._window_start(self._last_date):]
+            + self._whatif
+        )
+
+    # -- round set -----------------------------------------------------------
+
+    def _add(self, ratings: list[int], k: int = 1) -> None:
+        """Add (k=1) or remove (k=-1) ratings from the round set."""
+        if ratings:
+            self._apply({rating: k * n for rating, n in Counter(ratings).items()})
+
+    def _apply(self, changes: dict[int, int]) -> None:
+        """Change the multiplicity of each rating by changes[rating]."""
+        tree   = self._tree
+        counts = self._counts
+        for rating, k in changes.items():
+            counts[rating] += k
+            self._n     += k
+            self._sum   += k * rating
+            self._sumsq += k * rating * rating
+        if tree is None:
+            return
+        if len(changes) > self._BULK or min(changes) < tree.lo or max(changes) > tree.hi:
+            self._tree = None   # cheaper to rebuild in linear time when next needed
+        else:
+            for rating, k in changes.items():
+                tree.add(rating, k)
+
+    def _ratings_tree(self) -> _RatingTree:
+        if self._tree is None:
+            counts = {rating: k for rating, k in self._counts.items() if k}
+            self._counts = Counter(counts)
+            lo, hi = (min(counts), max(counts)) if counts else (0, 0)
+            lo, hi = lo - self._TREE_MARGIN, hi + self._TREE_MARGIN
+            if self._reserved is not None:
+                lo, hi = min(lo, self._reserved[0]), max(hi, self._reserved[1])
+            self._tree = _RatingTree(lo, hi, counts)
+        return self._tree
+
+    def reserve(self, lo: int, hi: int) -> None:
+        """Size the trees for what-if ratings in [lo, hi] up front, so no edit resizes them."""
+        self._reserved = (lo, hi)
+        if self._tree is not None and (lo < self._tree.lo or hi > self._tree.hi):
+            self._tree = None
+
+    def _window_for(self, k: int) -> int | None:
+        if k == 0:
+            return self._base_window
+        if self._in_year + k >= MIN_ROUNDS_1_YEAR:
+            return self._most_recent - ONE_YEAR_SECS
+        return self._most_recent - TWO_YEARS_SECS
+
+    def _window_start(self, last_date: int | None) -> int:
+        """Index of the first windowed round newer than last_date."""
+        if last_date is None:
+            return len(self._window_ts)
+        return bisect_right(self._window_ts, last_date)
+
+    def _move_window(self, last_date: int | None) -> None:
+        """Hold the windowed rounds newer than last_date (None: no window yet)."""
+        if last_date == self._last_date:
+            return
+        new_start = self._window_start(last_date)
+        old_start = self._window_start(self._last_date)
+        if new_start < old_start:
+            self._add(self._window_ratings[new_start:old_start])
+        else:
+            self._add(self._window_ratings[old_start:new_start], -1)
+        self._last_date = last_date
+
+    def add_whatif(self, rating: int) -> None:
+        self._whatif.append(rating)
+        self._move_window(self._window_for(len(self._whatif)))
+        self._add([rating])
+
+    def remove_whatif(self, index: int = -1) -> int:
+        rating = self._whatif.pop(index)
+        self._add([rating], -1)
+        self._move_window(self._window_for(len(self._whatif)))
+        return rating
+
+    def set_whatif(self, whatif_ratings: list[int]) -> None:
+        """Replace the hypothetical rounds, touching only the ratings that changed."""
+        change = Counter(whatif_ratings)
+        change.subtract(self._whatif)
+        self._whatif = list(whatif_ratings)
+        self._move_window(self._window_for(len(self._whatif)))
+        change = {rating: k for rating, k in change.items() if k}
+        if change:
+            self._apply(change)
+
+    # -- results -------------------------------------------------------------
+
+    def _check_rounds(self) -> None:
+        if self._last_date is None:
+            raise ValueError("No evaluated rounds found for this player.")
+        if self._n == 0:
+            raise ValueError("No ratings provided.")
+
+    def projection(self) -> tuple[int, float]:
+        """(projected_rating, drop_below), as compute_pdga_rating returns them."""
+        self._check_rounds()
+        n, s  = self._n, self._sum
+        avg   = s / n
+        std   = math.sqrt(max(0, n * self._sumsq - s * s)) / n
+        cut   = min(avg - 100.0, avg - 2.5 * std)
+        if abs(cut - math.floor(cut) - 0.5) < 1e-6:
+            # np.std's rounding error could decide which way this rounds:
+            # take the scalar function's answer.
+            used = sorted(self._used_rounds(), key=itemgetter("timestamp"), reverse=True)
+            return compute_pdga_rating([r["rating"] for r in used])
+        drop_below = float(round(cut))   # half to even, as np.round
+
+        tree = self._ratings_tree()
+        kept, kept_sum = tree.at_least(drop_below)
+        if kept == 0:
+            raise ValueError("All rounds were filtered as outliers — cannot compute rating.")
+        if kept < MIN_ROUNDS_1_YEAR:
+            return round(kept_sum / kept), drop_below
+        doubled = kept // 4
+        return round((kept_sum + tree.top(doubled)) / (kept + doubled)), drop_below
+
+    def _whatif_rounds(self) -> list[dict]:
+        return [_whatif_round(i, r, self.now) for i, r in enumerate(self._whatif)]
+
+    def _view(self) -> tuple[list[dict], list[dict]]:
+        """(windowed rounds, outgoing rounds) for the current window."""
+        last_date = self._last_date
+        if last_date not in self._views:
+            store = self.store
+            self._views[last_date] = (
+                store.rows(store.rated(last_date) & store.included),
+                store.rows(store.outgoing(last_date)),
+            )
+        return self._views[last_date]
+
+    def _used_rounds(self, whatif_rounds: list[dict] | None = None) -> list[dict]:
+        if whatif_rounds is None:
+            whatif_rounds = self._whatif_rounds()
+        return self.new_tournaments + whatif_rounds + self._view()[0]
+
+    def result(self) -> dict:
+        """project_rating's result dict for the current rounds."""
+        self._check_rounds()
+        projected, drop_below = self.projection()
+        whatif_rounds = self._whatif_rounds()
+        used_rounds   = self._used_rounds(whatif_rounds)
+        # New rounds come presorted; the what-ifs (all timestamped now) merge in.
+        incoming = sorted(
+            self._incoming + whatif_rounds,
+            key=lambda x: (x.get("timestamp", 0), x.get("round", 0)),
+        )
+        return {
+            "projected_rating": projected,
+            "drop_below":       drop_below,
+            "outgoing_rounds":  self._view()[1],
+            "incoming_rounds":  incoming,
+            "outlier_rounds":   [r for r in used_rounds if r["rating"] < drop_below],
+            "used_rounds":      used_rounds,
+            "last_date":        self._last_date,
+        }
+
+
 # ---------------------------------------------------------------------------
 # What-if: target rating solver
 # ---------------------------------------------------------------------------
 
+SOLVER_MIN_AVG = 300
+SOLVER_MAX_AVG = 1100
+
+
+def _target_result(target_rating: int, num_rounds: int, needed: int | None, with_avg: int) -> dict:
+    """rounds_needed_for_target's result for a solved cell (needed=None: unreachable)."""
+    if needed is None:
+        return {
+            "achievable":     False,
+            "needed_avg":     None,
+            "with_avg":       with_avg,
+            "example_rounds": [SOLVER_MAX_AVG] * num_rounds,
+            "message": (
+                f"Target {target_rating} is not achievable in {num_rounds} round(s) — "
+                f"even averaging {SOLVER_MAX_AVG} only gets you to {with_avg}."
+            ),
+        }
+    if needed == SOLVER_MIN_AVG:
+        message = f"You'd reach {target_rating} even averaging just {needed}."
+    else:
+        message = f"Average {needed} across {num_rounds} round(s) → projected {with_avg}."
+    return {
+        "achievable":     True,
+        "needed_avg":     needed,
+        "with_avg":       with_avg,
+        "example_rounds": [needed] * num_rounds,
+        "message":        message,
+    }
+
+
 def rounds_needed_for_target(
     tournaments:     list[dict],
     new_tournaments: list[dict],
@@ -178,31 +617,23 @@ def rounds_needed_for_target(
         example_rounds - list of `num_rounds` ints all equal to needed_avg
         message        - human-readable summary
     """
-    def trial(avg_rating: int) -> int:
-        result = project_rating(tournaments, new_tournaments, [avg_rating] * num_rounds)
-        return result["projected_rating"]
+    # The base rounds are prepared once; each probe only swaps the
+    # hypothetical rounds in the state, and is never evaluated twice.
+    low, high = SOLVER_MIN_AVG, SOLVER_MAX_AVG
+    state  = RatingState(tournaments, new_tournaments, [high] * num_rounds)
+    state.reserve(low, high)
+    trials: dict[int, int] = {}
 
-    low, high = 300, 1100
+    def trial(avg_rating: int) -> int:
+        if avg_rating not in trials:
+            state.set_whatif([avg_rating] * num_rounds)
+            trials[avg_rating] = state.projection()[0]
+        return trials[avg_rating]
 
     if trial(high) < target_rating:
-        return {
-            "achievable":     False,
-            "needed_avg":     None,
-            "with_avg":       trial(high),
-            "example_rounds": [high] * num_rounds,
-            "message": (
-                f"Target {target_rating} is not achievable in {num_rounds} round(s) — "
-                f"even averaging {high} only gets you to {trial(high)}."
-            ),
-        }
+        return _target_result(target_rating, num_rounds, None, trial(high))
     if trial(low) >= target_rating:
-        return {
-            "achievable":     True,
-            "needed_avg":     low,
-            "with_avg":       trial(low),
-            "example_rounds": [low] * num_rounds,
-            "message":        f"You'd reach {target_rating} even averaging just {low}.",
-        }
+        return _target_result(target_rating, num_rounds, low, trial(low))
 
     while low < high - 1:
         mid = (low + high) // 2
@@ -210,13 +641,69 @@ def rounds_needed_for_target(
             high = mid
         else:
             low = mid
+    return _target_result(target_rating, num_rounds, high, trial(high))
+
 
-    needed = high
-    actual = trial(needed)
+def rounds_needed_grid(
+    tournaments:     list[dict],
+    new_tournaments: list[dict],
+    targets:         list[int],
+    rounds_options:  list[int],
+) -> dict[tuple[int, int], dict]:
+    """
+    rounds_needed_for_target for every (target, num_rounds) pair in one call:
+    {(target, num_rounds): result dict}, each identical to what
+    rounds_needed_for_target returns for that pair.
+
+    The round set is laid out once per number of rounds, in the order
+    compute_pdga_rating sees it, with slots for the hypothetical rounds.
+    Every cell then runs the same bisection in lockstep, and each step
+    evaluates all cells in one compute_pdga_ratings call.
+    """
+    cells = [(t, n) for t in targets for n in rounds_options]
+    if not cells:
+        return {}
+
+    # Per number of rounds: the ratings in compute_pdga_rating's order, and
+    # where the hypothetical rounds sit in it.
+    layouts: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+    for n in dict.fromkeys(rounds_options):
+        store        = RoundStore(tournaments, new_tournaments, [0] * n)
+        _, last_date = store.lookback_window()
+        used         = store.used(last_date)
+        layouts[n]   = (store.rating[used], np.flatnonzero(store.hypothetical[used]))
+
+    ratings, offsets = pack_ratings([layouts[n][0] for _, n in cells])
+    slots   = np.concatenate(
+        [offsets[c] + layouts[n][1] for c, (_, n) in enumerate(cells)]
+    )
+    per_cell = np.array([n for _, n in cells], dtype=np.int64)
+    target   = np.array([t for t, _ in cells], dtype=np.int64)
+
+    def trial(avg: np.ndarray) -> np.ndarray:
+        ratings[slots] = np.repeat(avg, per_cell)
+        return compute_pdga_ratings(ratings, offsets)[0]
+
+    low  = np.full(len(cells), SOLVER_MIN_AVG, dtype=np.int64)
+    high = np.full(len(cells), SOLVER_MAX_AVG, dtype=np.int64)
+    at_high     = trial(high)
+    unreachable = at_high < target
+    at_low      = ~unreachable & (trial(low) >= target)
+    searching   = ~unreachable & ~at_low
+    while True:
+        active = searching & (low < high - 1)
+        if not active.any():
+            break
+        mid     = (low + high) // 2
+        reached = trial(mid) >= target
+        high    = np.where(active & reached, mid, high)
+        low     = np.where(active & ~reached, mid, low)
+
+    needed   = np.where(at_low, SOLVER_MIN_AVG, high)
+    with_avg = np.where(unreachable, at_high, trial(needed))
     return {
-        "achievable":     True,
-        "needed_avg":     needed,
-        "with_avg":       actual,
-        "example_rounds": [needed] * num_rounds,
-        "message":        f"Average {needed} across {num_rounds} round(s) → projected {actual}.",
+        (t, n): _target_result(
+            t, n, None if unreachable[c] else int(needed[c]), int(with_avg[c])
+        )
+        for c, (t, n) in enumerate(cells)
     }
@@ -7,7 +7,12 @@ Usage:
     pdga-ratings --pdga 12345
     pdga-ratings --pdga 12345 --whatif 950,960,970
     pdga-ratings --pdga 12345 --target 950 --rounds 3
+    pdga-ratings --pdga 12345 --target-grid 940,950,960 --grid-rounds 2,3,4,5
     pdga-ratings --pdga 12345 --refresh
+    pdga-ratings --pdga 12345 --stale-ok
+    pdga-ratings --pdga 12345 --offline
+    pdga-ratings --pdga 12345 --record fixtures.jsonl.gz
+    pdga-ratings --pdga 12345 --replay fixtures.jsonl.gz --offline
 """
 
 import argparse
@@ -17,8 +22,9 @@ from rich.console import Console
 from rich.table import Table
 from rich import box
 
+from . import scraper, transport
 from .scraper    import load_player_data, FetchError, ParseError
-from .calculator import project_rating, rounds_needed_for_target
+from .calculator import SOLVER_MAX_AVG, project_rating, rounds_needed_for_target, rounds_needed_grid
 
 console = Console()
 
@@ -43,15 +49,56 @@ Examples:
   %(prog)s --pdga 12345
   %(prog)s --pdga 12345 --whatif 950,960,970
   %(prog)s --pdga 12345 --target 950 --rounds 3
+  %(prog)s --pdga 12345 --target-grid 940,950,960 --grid-rounds 2,3,4,5
   %(prog)s --pdga 12345 --refresh
+  %(prog)s --pdga 12345 --stale-ok
+  %(prog)s --pdga 12345 --offline
+  %(prog)s --pdga 12345 --record fixtures.jsonl.gz
+  %(prog)s --pdga 12345 --replay fixtures.jsonl.gz --offline
         """,
     )
     parser.add_argument("--pdga",    required=True,  help="PDGA player number")
     parser.add_argument("--whatif",  default=None,   help="Comma-separated hypothetical round ratings")
     parser.add_argument("--target",  type=int, default=None, help="Target rating to solve for")
     parser.add_argument("--rounds",  type=int, default=3,    help="Number of rounds for --target solver (default: 3)")
+    parser.add_argument("--target-grid", metavar="TARGETS", default=None,
+                        help="Comma-separated target ratings to solve for every --grid-rounds count")
+    parser.add_argument("--grid-rounds", metavar="COUNTS", default="2,3,4,5",
+                        help="Comma-separated round counts for --target-grid (default: 2,3,4,5)")
     parser.add_argument("--refresh", action="store_true",    help="Bypass cache and re-fetch all data")
-    return parser.parse_args(argv)
+    parser.add_argument("--stale-ok", action="store_true",
+                        help="Answer from recently expired cache entries, refreshing them afterwards")
+    parser.add_argument("--offline", action="store_true",
+                        help="No network access: serve only cached pages (and --replay fixtures)")
+    parser.add_argument("--record",  metavar="ARCHIVE", default=None,
+                        help="Save every HTTP response to a fixture archive")
+    parser.add_argument("--replay",  metavar="ARCHIVE", default=None,
+                        help="Serve HTTP responses from a fixture archive instead of pdga.com")
+    parser.add_argument("--replay-latency", type=float, default=0.0, metavar="SECS",
+                        help="Delay added to each replayed response (default: 0)")
+    args = parser.parse_args(argv)
+    if args.record and (args.replay or args.offline):
+        parser.error("--record needs the network; it can't be combined with --replay or --offline")
+    if args.target_grid is not None:
+        try:
+            args.target_grid = [int(t.strip()) for t in args.target_grid.split(",")]
+            args.grid_rounds = [int(n.strip()) for n in args.grid_rounds.split(",")]
+        except ValueError:
+            parser.error("--target-grid and --grid-rounds must be comma-separated integers")
+        if min(args.grid_rounds) < 1:
+            parser.error("--grid-rounds counts must be at least 1")
+    return args
+
+
+def _configure_transport(args) -> None:
+    """Point the scraper at a recorder / replayer, or cut it off from the network."""
+    if args.record:
+        scraper.SESSION = transport.Recorder(scraper.SESSION, args.record)
+    elif args.replay:
+        scraper.SESSION = transport.Replayer(args.replay, latency=args.replay_latency)
+    elif args.offline:
+        scraper.SESSION = transport.Offline()
+    scraper.OFFLINE = args.offline
 
 
 # ---------------------------------------------------------------------------
@@ -128,16 +175,40 @@ def print_target_result(target_result: dict, target: int, num_rounds: int) -> No
     console.print()
 
 
+def print_target_grid(grid: dict, targets: list[int], rounds_options: list[int]) -> None:
+    console.rule("[bold]Target Rating Solver — average needed per round[/bold]")
+    table = Table(box=box.SIMPLE_HEAD, show_lines=False)
+    table.add_column("Target", justify="right", style="bold")
+    for n in rounds_options:
+        table.add_column(f"{n} rd{'' if n == 1 else 's'}", justify="right")
+    for target in targets:
+        cells = []
+        for n in rounds_options:
+            cell = grid[(target, n)]
+            if cell["achievable"]:
+                cells.append(f"{cell['needed_avg']} [{COLOR_MUTED}]→ {cell['with_avg']}[/{COLOR_MUTED}]")
+            else:
+                cells.append(f"[{COLOR_RED}]—[/{COLOR_RED}]")
+        table.add_row(str(target), *cells)
+    console.print(table)
+    console.print(
+        f"  [{COLOR_MUTED}]Average round rating needed → projected rating; "
+        f"— not achievable even averaging {SOLVER_MAX_AVG}.[/{COLOR_MUTED}]"
+    )
+    console.print()
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
 def main(argv=None):
     args = parse_args(argv)
+    _configure_transport(args)
 
     try:
         with console.status(f"Loading data for PDGA #{args.pdga}..."):
-            data = load_player_data(args.pdga, force_refresh=args.refresh)
+            data = load_player_data(args.pdga, force_refresh=args.refresh, stale_ok=args.stale_ok)
     except (FetchError, ParseError) as e:
         console.print(f"[{COLOR_RED}]Error:[/{COLOR_RED}] {e}")
         sys.exit(1)
@@ -172,6 +243,26 @@ def main(argv=None):
             sys.exit(1)
         print_target_result(target_result, args.target, args.rounds)
 
+    if args.target_grid is not None:
+        try:
+            grid = rounds_needed_grid(tournaments, new_tournaments, args.target_grid, args.grid_rounds)
+        except ValueError as e:
+            console.print(f"[{COLOR_RED}]Target solver error:[/{COLOR_RED}] {e}")
+            sys.exit(1)
+        print_target_grid(grid, args.target_grid, args.grid_rounds)
+
+    if data["refresh"] is not None:
+        # Stale answer: finish bringing the cache up to date before exiting.
+        console.print(
+            f"[{COLOR_MUTED}]Shown from {len(data['stale'])} expired cache "
+            f"entr{'y' if len(data['stale']) == 1 else 'ies'}.[/{COLOR_MUTED}]"
+        )
+        with console.status("Refreshing cache..."):
+            try:
+                data["refresh"].result()
+            except (FetchError, ParseError) as e:
+                console.print(f"[{COLOR_YELLOW}]Refresh failed:[/{COLOR_YELLOW}] {e}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,588 @@
+"""
+extract.py
+----------
+Pluggable HTML extraction backends for the two heavy pages: the player detail
+table and tournament result pages. Result pages can be read for one player
+(tournament_page) or for every player at once (tournament_results), which
+feeds the shared tournament index in cache.py.
+
+Backends only pull raw cell text out of the markup; converting it (ints,
+dates, validation) is done once in scraper.py so every backend is held to the
+same rules. Two implementations:
+
+  SoupExtractor  — BeautifulSoup tree + find(), the reference implementation.
+  FastExtractor  — single pass over stdlib html.parser events that only
+                   tracks the rows and td classes we need. Falls back to the
+                   reference implementation if the tokenizer itself fails.
+
+Select with PDGA_EXTRACT_BACKEND=soup|fast|crosscheck (default: fast).
+"crosscheck" runs both and raises ExtractMismatch if they disagree.
+
+FastExtractor.tournament_page_stream() is the early-exit variant for
+single-player lookups: it consumes HTML chunks (e.g. straight off a streaming
+response) and stops as soon as the player's row and the tournament date have
+been seen. It relies on PDGA placing the event header (date, league <h4>)
+above the results tables; a league <h4> after the player's row is missed.
+"""
+
+import os
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+# td classes read from each player detail row, keyed by output field.
+DETAIL_FIELDS = {
+    "tier":      "tier",
+    "date":      "date",
+    "division":  "division",
+    "round":     "round tooltip",
+    "score":     "score",
+    "rating":    "round-rating",
+    "evaluated": "evaluated",
+    "included":  "included",
+}
+
+_LEAGUE_RE = re.compile(r".*League.*")
+
+# Elements that never have an end tag (mirrors BeautifulSoup's html.parser builder).
+_VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+    "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+})
+
+
+class ExtractMismatch(AssertionError):
+    """Raised in crosscheck mode when the backends disagree."""
+
+
+class _StopParsing(Exception):
+    """Internal: everything an early-exit parse needs has been seen."""
+
+
+# ---------------------------------------------------------------------------
+# Reference implementation (BeautifulSoup)
+# ---------------------------------------------------------------------------
+
+def soup_detail_rows(doc: BeautifulSoup) -> list[dict]:
+    """Raw text of every detail-table row that has a tournament cell."""
+    rows = []
+    for row in doc.find_all("tr"):
+        tournament_cell = row.find("td", class_="tournament")
+        if not tournament_cell:
+            continue
+
+        raw: dict = {}
+        link = tournament_cell.find("a")
+        if link:
+            raw["name"] = link.get_text(strip=True)
+            raw["link"] = link["href"]
+
+        for key, class_name in DETAIL_FIELDS.items():
+            cell = row.find("td", class_=class_name)
+            if cell:
+                raw[key] = cell.get_text(strip=True)
+        rows.append(raw)
+    return rows
+
+
+def _soup_tournament_header(doc: BeautifulSoup) -> dict | None:
+    """has_body / is_league / date of a results page, or None without a <body>."""
+    body = doc.body
+    if body is None:
+        return None
+    date_el = doc.find(class_="tournament-date")
+    return {
+        "has_body":  True,
+        "is_league": bool(body.find_all("h4", string=_LEAGUE_RE, recursive=True)),
+        "date":      date_el.get_text(strip=True) if date_el else None,
+    }
+
+
+def _soup_row_ratings(row) -> list[str]:
+    return [
+        text for text in
+        (cell.get_text(strip=True) for cell in row.find_all("td", class_="round-rating"))
+        if text
+    ]
+
+
+def soup_tournament_page(doc: BeautifulSoup, pdga_number: str) -> dict:
+    """
+    Raw data for one player from a tournament results page:
+        has_body, is_league, date (text or None),
+        ratings (round-rating texts from the player's row, or None if absent)
+    """
+    header = _soup_tournament_header(doc)
+    if header is None:
+        return {"has_body": False, "is_league": False, "date": None, "ratings": None}
+
+    ratings = None
+    for row in doc.find_all("tr"):
+        pdga_td = row.find("td", class_="pdga-number")
+        if pdga_td and pdga_td.get_text(strip=True) == pdga_number:
+            ratings = _soup_row_ratings(row)
+            break
+
+    return {**header, "ratings": ratings}
+
+
+def soup_tournament_results(doc: BeautifulSoup) -> dict:
+    """
+    Every player on a tournament results page at once:
+        has_body, is_league, date (as in soup_tournament_page),
+        players ({pdga_number: round-rating texts}, first row wins)
+    players[n] is exactly what soup_tournament_page(doc, n) reports as ratings.
+    """
+    header = _soup_tournament_header(doc)
+    if header is None:
+        return {"has_body": False, "is_league": False, "date": None, "players": {}}
+
+    players: dict[str, list[str]] = {}
+    for row in doc.find_all("tr"):
+        pdga_td = row.find("td", class_="pdga-number")
+        if pdga_td:
+            pdga_number = pdga_td.get_text(strip=True)
+            if pdga_number and pdga_number not in players:
+                players[pdga_number] = _soup_row_ratings(row)
+
+    return {**header, "players": players}
+
+
+class SoupExtractor:
+    name = "soup"
+
+    def detail_rows(self, html: str) -> list[dict]:
+        return soup_detail_rows(BeautifulSoup(html, "html.parser"))
+
+    def tournament_page(self, html: str, pdga_number: str) -> dict:
+        return soup_tournament_page(BeautifulSoup(html, "html.parser"), pdga_number)
+
+    def tournament_results(self, html: str) -> dict:
+        return soup_tournament_results(BeautifulSoup(html, "html.parser"))
+
+
+# ---------------------------------------------------------------------------
+# Fast path (html.parser events, no tree)
+# ---------------------------------------------------------------------------
+
+def _has_class(attrs: list[tuple[str, str | None]], class_name: str) -> bool:
+    """BeautifulSoup class_ semantics: any single class, or the whole class string."""
+    for key, value in attrs:
+        if key == "class" and value:
+            tokens = value.split()
+            return class_name in tokens or " ".join(tokens) == class_name
+    return False
+
+
+def _attr(attrs: list[tuple[str, str | None]], name: str) -> str | None:
+    for key, value in attrs:
+        if key == name:
+            return value
+    return None
+
+
+class _Capture:
+    """Text collected under one open element, joined like get_text(strip=True)."""
+    __slots__ = ("parts", "on_close")
+
+    def __init__(self, on_close):
+        self.parts: list[str] = []
+        self.on_close = on_close
+
+
+class _TargetedParser(HTMLParser):
+    """
+    Tag stack with BeautifulSoup-compatible tree rules — an end tag closes the
+    most recent open element of that name, strays are ignored, adjacent text
+    events form one string, everything still open is closed at EOF — plus
+    text captures that can be attached to any open element.
+
+    Subclasses implement start(tag, attrs), end(tag) and optionally text(data).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._stack:    list[str]                 = []
+        self._captures: dict[int, list[_Capture]] = {}
+        self._active:   list[_Capture]            = []
+        self._pending:  list[str]                 = []
+
+    def capture(self, on_close) -> None:
+        """Collect text until the most recently opened element closes."""
+        cap = _Capture(on_close)
+        self._captures.setdefault(len(self._stack) - 1, []).append(cap)
+        self._active.append(cap)
+
+    def start(self, tag: str, attrs) -> None: ...
+    def end(self, tag: str) -> None: ...
+
+    def text(self, data: str) -> None:
+        if self._active:
+            stripped = data.strip()
+            if stripped:
+                for cap in self._active:
+                    cap.parts.append(stripped)
+
+    def _flush(self) -> None:
+        if self._pending:
+            data, self._pending = "".join(self._pending), []
+            self.text(data)
+
+    def _pop_to(self, idx: int) -> None:
+        while len(self._stack) > idx:
+            depth  = len(self._stack) - 1
+            closed = self._stack.pop()
+            for cap in self._captures.pop(depth, ()):
+                self._active.remove(cap)
+                cap.on_close("".join(cap.parts))
+            self.end(closed)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag not in _VOID_ELEMENTS:
+            self._stack.append(tag)
+        self.start(tag, attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in _VOID_ELEMENTS:
+            return
+        for idx in range(len(self._stack) - 1, -1, -1):
+            if self._stack[idx] == tag:
+                self._pop_to(idx)
+                return
+
+    def handle_data(self, data):
+        self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def close(self):
+        super().close()
+        self._flush()
+        self._pop_to(0)
+
+
+class _RowTracker:
+    """
+    Open <tr>s in document order. A td belongs to every open row (find()
+    searches all descendants, so an outer row sees a nested row's cells).
+    """
+
+    def __init__(self):
+        self.rows: list[dict] = []          # every row, in document (find_all) order
+        self._open: list[tuple[int, dict]] = []
+
+    def open(self, depth: int, row: dict) -> None:
+        row["closed"] = False
+        self.rows.append(row)
+        self._open.append((depth, row))
+
+    def open_rows(self) -> list[dict]:
+        return [row for _, row in self._open]
+
+    def close(self, depth: int) -> None:
+        while self._open and self._open[-1][0] > depth:
+            self._open.pop()[1]["closed"] = True
+
+
+class _DetailParser(_TargetedParser):
+    def __init__(self):
+        super().__init__()
+        self._rows = _RowTracker()
+
+    def start(self, tag, attrs):
+        if tag == "tr":
+            self._rows.open(len(self._stack), {"fields": {}, "tournament": False, "in_tournament": False})
+            return
+        if tag in _VOID_ELEMENTS:
+            return
+        for row in self._rows.open_rows():
+            if tag == "td":
+                if not row["tournament"] and _has_class(attrs, "tournament"):
+                    row["tournament"] = row["in_tournament"] = True
+                    self.capture(lambda _text, row=row: row.__setitem__("in_tournament", False))
+                for key, class_name in DETAIL_FIELDS.items():
+                    if key not in row["fields"] and _has_class(attrs, class_name):
+                        row["fields"][key] = None  # claimed; filled in when the td closes
+                        self.capture(lambda text, f=row["fields"], key=key: f.__setitem__(key, text))
+            elif tag == "a" and row["in_tournament"] and "link" not in row:
+                href = _attr(attrs, "href")
+                if href is None:
+                    raise KeyError("href")
+                row["link"] = href
+                self.capture(lambda text, row=row: row.__setitem__("name", text))
+
+    def end(self, tag):
+        if tag == "tr":
+            self._rows.close(len(self._stack))
+
+    @property
+    def results(self) -> list[dict]:
+        out = []
+        for row in self._rows.rows:
+            if not row["tournament"]:
+                continue
+            raw: dict = {}
+            if "link" in row:
+                raw["name"] = row.get("name", "")
+                raw["link"] = row["link"]
+            fields = row["fields"]
+            raw.update({k: fields[k] for k in DETAIL_FIELDS if fields.get(k) is not None})
+            out.append(raw)
+        return out
+
+
+class _TournamentParser(_TargetedParser):
+    """
+    One player's row (pdga_number given) or, with pdga_number=None, every
+    player's row for the tournament index; see results().
+    """
+
+    def __init__(self, pdga_number: str | None, stop_early: bool = False):
+        super().__init__()
+        self.pdga_number = pdga_number
+        self.stop_early  = stop_early
+        self.has_body    = False
+        self.is_league   = False
+        self.date: str | None = None
+        self.ratings: list[str] | None = None
+        self._body_depth   = 0              # stack depth of the first <body>, 0 once closed
+        self._date_claimed = False
+        self._rows         = _RowTracker()
+        self._next_row     = 0              # first row (document order) not yet ruled out
+        self._tree: list[tuple[list, bool]] = []  # node stack while inside an <h4>
+
+    @staticmethod
+    def _string_of(node: list) -> str | None:
+        """Tag.string: a node has one iff its only child is a string or has one."""
+        while True:
+            if len(node) != 1:
+                return None
+            child = node[0]
+            if isinstance(child, str):
+                return child
+            node = child
+
+    @property
+    def found(self) -> bool:
+        return self.ratings is not None
+
+    def start(self, tag, attrs):
+        if tag == "body" and not self.has_body:
+            self.has_body, self._body_depth = True, len(self._stack)
+
+        is_h4 = tag == "h4" and self._body_depth > 0
+        if self._tree or is_h4:
+            node: list = []
+            if self._tree:
+                self._tree[-1][0].append(node)
+            if tag not in _VOID_ELEMENTS:
+                self._tree.append((node, is_h4))
+
+        if not self._date_claimed and _has_class(attrs, "tournament-date"):
+            self._date_claimed = True
+            if tag in _VOID_ELEMENTS:
+                self.date = ""
+            else:
+                self.capture(self._set_date)
+
+        if self.found or tag in _VOID_ELEMENTS:
+            return
+        if tag == "tr":
+            self._rows.open(len(self._stack), {"pdga": None, "ratings": []})
+        elif tag == "td":
+            for row in self._rows.open_rows():
+                if row["pdga"] is None and _has_class(attrs, "pdga-number"):
+                    row["pdga"] = ""
+                    self.capture(lambda text, row=row: row.__setitem__("pdga", text))
+                if _has_class(attrs, "round-rating"):
+                    # Slot reserved in document order; nested cells close first.
+                    row["ratings"].append(None)
+                    slot = len(row["ratings"]) - 1
+                    self.capture(lambda text, r=row["ratings"], i=slot: r.__setitem__(i, text))
+
+    def _set_date(self, text):
+        self.date = text
+        self._maybe_stop()
+
+    def _maybe_stop(self) -> None:
+        if self.stop_early and self.found and self.date is not None:
+            raise _StopParsing
+
+    def text(self, data):
+        if self._tree:
+            self._tree[-1][0].append(data)
+        super().text(data)
+
+    def handle_comment(self, data):
+        super().handle_comment(data)
+        if self._tree:
+            self._tree[-1][0].append(data)  # comments are children too
+
+    def end(self, tag):
+        if self._tree:
+            node, is_h4 = self._tree.pop()
+            if is_h4:
+                text = self._string_of(node)
+                if text is not None and _LEAGUE_RE.search(text):
+                    self.is_league = True
+        if tag == "body" and len(self._stack) < self._body_depth:
+            self._body_depth = 0
+        if tag == "tr" and not self.found:
+            self._rows.close(len(self._stack))
+            if self.pdga_number is not None:
+                self._settle_rows()
+
+    def _settle_rows(self) -> None:
+        """Decide the player's row once every row before it has closed without matching."""
+        rows = self._rows.rows
+        while self._next_row < len(rows) and rows[self._next_row]["closed"]:
+            row = rows[self._next_row]
+            if row["pdga"] == self.pdga_number:
+                self.ratings = [r for r in row["ratings"] if r]
+                self._maybe_stop()
+                return
+            self._next_row += 1
+
+    def close(self):
+        super().close()
+        if not self.found and self.pdga_number is not None:
+            self._settle_rows()
+
+    def page(self) -> dict:
+        return {
+            "has_body":  self.has_body,
+            "is_league": self.is_league,
+            "date":      self.date if self.has_body else None,
+            "ratings":   self.ratings if self.has_body else None,
+        }
+
+    def results(self) -> dict:
+        players: dict[str, list[str]] = {}
+        if self.has_body:
+            for row in self._rows.rows:
+                if row["pdga"] and row["pdga"] not in players:
+                    players[row["pdga"]] = [r for r in row["ratings"] if r]
+        return {
+            "has_body":  self.has_body,
+            "is_league": self.is_league,
+            "date":      self.date if self.has_body else None,
+            "players":   players,
+        }
+
+
+class FastExtractor:
+    name = "fast"
+
+    def __init__(self, fallback: SoupExtractor | None = None):
+        self.fallback = fallback or SoupExtractor()
+
+    def detail_rows(self, html: str) -> list[dict]:
+        parser = _DetailParser()
+        try:
+            parser.feed(html)
+            parser.close()
+        except KeyError:
+            raise  # a tournament link without href; the reference raises too
+        except Exception:
+            return self.fallback.detail_rows(html)
+        return parser.results
+
+    def tournament_page(self, html: str, pdga_number: str) -> dict:
+        parser = _TournamentParser(pdga_number)
+        try:
+            parser.feed(html)
+            parser.close()
+        except Exception:
+            return self.fallback.tournament_page(html, pdga_number)
+        return parser.page()
+
+    def tournament_results(self, html: str) -> dict:
+        parser = _TournamentParser(None)
+        try:
+            parser.feed(html)
+            parser.close()
+        except Exception:
+            return self.fallback.tournament_results(html)
+        return parser.results()
+
+    def tournament_page_stream(self, chunks, pdga_number: str) -> tuple[dict, bool]:
+        """
+        Early-exit tournament_page over an iterable of HTML chunks. Stops
+        pulling chunks once the player's row and the date are known.
+        Returns (page, complete); complete is False if it stopped early.
+        """
+        parser = _TournamentParser(pdga_number, stop_early=True)
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+            parser.close()
+        except _StopParsing:
+            return parser.page(), False
+        return parser.page(), True
+
+
+class CrossCheckExtractor:
+    """Runs the fast and reference backends and insists they agree."""
+    name = "crosscheck"
+
+    def __init__(self):
+        self.reference = SoupExtractor()
+        self.fast      = FastExtractor(fallback=self.reference)
+
+    def _compare(self, what: str, fast, reference):
+        if fast != reference:
+            raise ExtractMismatch(f"{what}: fast={fast!r} reference={reference!r}")
+        return reference
+
+    def detail_rows(self, html: str) -> list[dict]:
+        return self._compare(
+            "detail_rows", self.fast.detail_rows(html), self.reference.detail_rows(html)
+        )
+
+    def tournament_page(self, html: str, pdga_number: str) -> dict:
+        return self._compare(
+            f"tournament_page({pdga_number})",
+            self.fast.tournament_page(html, pdga_number),
+            self.reference.tournament_page(html, pdga_number),
+        )
+
+    def tournament_results(self, html: str) -> dict:
+        return self._compare(
+            "tournament_results",
+            self.fast.tournament_results(html),
+            self.reference.tournament_results(html),
+        )
+
+
+BACKENDS = {
+    "soup":       SoupExtractor(),
+    "fast":       FastExtractor(),
+    "crosscheck": CrossCheckExtractor(),
+}
+DEFAULT_BACKEND = "fast"
+
+
+def get_backend(name: str | None = None):
+    """Return the named backend, else $PDGA_EXTRACT_BACKEND, else the fast one."""
+    name = name or os.environ.get("PDGA_EXTRACT_BACKEND") or DEFAULT_BACKEND
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown extract backend {name!r}; choose from {sorted(BACKENDS)}")
@@ -23,7 +23,7 @@ from pathlib import Path
 import customtkinter as ctk
 
 from .scraper    import load_player_data, FetchError, ParseError
-from .calculator import project_rating, rounds_needed_for_target
+from .calculator import RatingState, project_rating, rounds_needed_for_target
 
 # ---------------------------------------------------------------------------
 # Color palette — matches styles.css exactly
@@ -425,6 +425,7 @@ class App(ctk.CTk):
         self.minsize(900, 680)
         self.configure(fg_color=C_BG)
         self._player_data: dict | None = None
+        self._rating_state: RatingState | None = None
         self._build_ui()
 
     def _build_ui(self):
@@ -515,21 +516,39 @@ class App(ctk.CTk):
         ).start()
 
     def _fetch_worker(self, pdga: str, force_refresh: bool):
+        # Recently expired pages are shown straight away and re-rendered
+        # once the background refresh has brought them up to date.
         try:
             self._set_status("Fetching player data…")
-            data = load_player_data(pdga, force_refresh=force_refresh)
+            data = load_player_data(pdga, force_refresh=force_refresh, stale_ok=True)
             self.after(0, lambda d=data: self._on_fetch_done(d))
         except (FetchError, ParseError) as e:
             self.after(0, lambda e=e: self._set_status(f"Error: {e}", C_DANGER))
             self.after(0, self._reset_buttons)
+            return
+        if data["refresh"] is not None:
+            data["refresh"].add_done_callback(
+                lambda future, d=data: self.after(0, lambda: self._on_refresh_done(d, future))
+            )
 
     def _on_fetch_done(self, data: dict):
-        self._player_data = data
-        result = project_rating(data["tournaments"], data["new_tournaments"])
-        self._render(result, data["current_rating"])
-        self._set_status("Done.", C_SUCCESS)
+        self._player_data  = data
+        self._rating_state = RatingState(data["tournaments"], data["new_tournaments"])
+        # Rendered through the what-if path: after a background refresh the
+        # panel still holds the user's rounds, and they apply to the new data.
+        self._on_whatif_change(self._whatif.get_ratings())
+        if data["refresh"] is not None:
+            self._set_status("Showing cached data — refreshing…", C_YELLOW)
         self._reset_buttons()
 
+    def _on_refresh_done(self, stale_data: dict, future):
+        if self._player_data is not stale_data:
+            return  # another player (or a newer fetch) is on screen
+        if future.exception() is not None:
+            self._set_status(f"Showing cached data — refresh failed: {future.exception()}", C_YELLOW)
+            return
+        self._on_fetch_done(future.result())
+
     def _reset_buttons(self):
         self._fetch_btn.configure(state="normal", text="calculate")
         self._refresh_btn.configure(state="normal")
@@ -556,7 +575,10 @@ class App(ctk.CTk):
         new_tournaments = self._player_data["new_tournaments"]
         current_rating  = self._player_data["current_rating"]
 
-        result = project_rating(tournaments, new_tournaments, whatif_ratings or None)
+        # Only the what-if rounds changed: the state updates incrementally.
+        result = project_rating(
+            tournaments, new_tournaments, whatif_ratings or None, state=self._rating_state
+        )
         self._render(result, current_rating)
 
         change = result["projected_rating"] - current_rating
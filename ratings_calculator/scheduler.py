@@ -0,0 +1,235 @@
+"""
+scheduler.py
+------------
+Per-host request scheduling, shared by every thread and event loop in the
+process, so parallel fetches stay polite to pdga.com.
+
+Each host gets a token bucket (RATE_PER_SEC, refilled up to BURST) and a cap
+of MAX_IN_FLIGHT concurrent requests. Requests wait in a priority queue:
+INTERACTIVE (a user is waiting on the answer) is served before PREFETCH
+(background refreshes), first come first served within a priority.
+
+A 429 or 503 pauses the whole host, not just the failed request, for the
+response's Retry-After (seconds or an HTTP date) or, without one, for an
+exponential backoff that resets after the next success (retry_delay).
+
+Slots are granted rather than polled: a release, a refill or the end of a
+pause hands the slot straight to the next waiter, waking its coroutine on
+whichever event loop it is waiting on (acquire_async). The sync fetch
+wrappers run their own loop, so every request goes through this one path.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+RATE_PER_SEC     = 8.0    # sustained requests per second per host
+BURST            = 16     # requests that may go out back to back after a quiet spell
+MAX_IN_FLIGHT    = 8      # concurrent requests per host
+MAX_BACKOFF_SECS = 120.0  # cap on Retry-After / adaptive backoff
+THROTTLE_STATUSES = {429, 503}
+
+INTERACTIVE = 0
+PREFETCH    = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", PREFETCH: "prefetch"}
+
+
+class _Host:
+    def __init__(self):
+        self.tokens       = float(BURST)
+        self.refilled_at  = time.monotonic()
+        self.in_flight    = 0
+        self.paused_until = 0.0
+        self.throttles    = 0   # consecutive 429/503s, for the adaptive backoff
+        self.waiters: list[tuple[int, int, "_Waiter"]] = []
+        self.timer: threading.Timer | None = None
+
+
+class _Waiter:
+    def __init__(self, wake):
+        self.wake    = wake
+        self.granted = False
+        self.queued  = time.monotonic()
+
+
+_lock  = threading.Lock()
+_hosts: dict[str, _Host] = {}
+_seq   = itertools.count()
+
+_stats = {
+    "requests": 0, "queued": 0, "throttled": 0,
+    "queue_depth": 0, "max_queue_depth": 0, "in_flight": 0,
+    "wait": {name: {"count": 0, "total_secs": 0.0, "max_secs": 0.0} for name in PRIORITY_NAMES.values()},
+}
+
+
+def _host_key(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _dispatch(key: str) -> None:
+    """Grant slots to waiters on host `key` while the limits allow. Holds _lock."""
+    host = _hosts[key]
+    while host.waiters:
+        now = time.monotonic()
+        host.tokens      = min(float(BURST), host.tokens + (now - host.refilled_at) * RATE_PER_SEC)
+        host.refilled_at = now
+        if host.in_flight >= MAX_IN_FLIGHT:
+            return   # the next release dispatches again
+        delay = max(host.paused_until - now, (1 - host.tokens) / RATE_PER_SEC if host.tokens < 1 else 0)
+        if delay > 0:
+            if host.timer is None:
+                host.timer = threading.Timer(delay, _on_timer, (key,))
+                host.timer.daemon = True
+                host.timer.start()
+            return
+        priority, _, waiter = heapq.heappop(host.waiters)
+        host.tokens    -= 1
+        host.in_flight += 1
+        waiter.granted  = True
+        _record_grant(priority, now - waiter.queued)
+        waiter.wake()
+
+
+def _on_timer(key: str) -> None:
+    with _lock:
+        _hosts[key].timer = None
+        _dispatch(key)
+
+
+def _record_grant(priority: int, waited: float) -> None:
+    _stats["requests"]    += 1
+    _stats["queue_depth"] -= 1
+    _stats["in_flight"]   += 1
+    wait = _stats["wait"][PRIORITY_NAMES[priority]]
+    wait["count"]      += 1
+    wait["total_secs"] += waited
+    wait["max_secs"]    = max(wait["max_secs"], waited)
+
+
+def _enqueue(url: str, priority: int, wake) -> _Waiter:
+    key    = _host_key(url)
+    waiter = _Waiter(wake)
+    with _lock:
+        host = _hosts.setdefault(key, _Host())
+        heapq.heappush(host.waiters, (priority, next(_seq), waiter))
+        _stats["queue_depth"] += 1
+        _stats["max_queue_depth"] = max(_stats["max_queue_depth"], _stats["queue_depth"])
+        _dispatch(key)
+        if not waiter.granted:
+            _stats["queued"] += 1
+    return waiter
+
+
+async def acquire_async(url: str, priority: int = INTERACTIVE) -> None:
+    """Wait until a request to url's host may go out; pair with release()."""
+    loop   = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def wake():
+        loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+    waiter = _enqueue(url, priority, wake)
+    try:
+        await future
+    except BaseException:
+        with _lock:
+            host = _hosts[_host_key(url)]
+            if not waiter.granted:   # still queued: withdraw
+                host.waiters = [w for w in host.waiters if w[2] is not waiter]
+                heapq.heapify(host.waiters)
+                _stats["queue_depth"] -= 1
+                raise
+        release(url)
+        raise
+
+
+def release(url: str) -> None:
+    """Give back the slot taken by acquire_async()."""
+    key = _host_key(url)
+    with _lock:
+        _hosts[key].in_flight -= 1
+        _stats["in_flight"]   -= 1
+        _dispatch(key)
+
+
+@asynccontextmanager
+async def slot_async(url: str, priority: int = INTERACTIVE):
+    await acquire_async(url, priority)
+    try:
+        yield
+    finally:
+        release(url)
+
+
+def _retry_after_secs(value: str | None) -> float | None:
+    """Retry-After as seconds from now: delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(url: str, status: int | None, retry_after: str | None, attempt: int, base: float) -> float:
+    """
+    Seconds to wait before retrying a failed request (attempt = 1, 2, ...).
+    For a 429 / 503 the whole host is paused: for Retry-After if the server
+    sent one, else base * 2 ** consecutive throttles. Other failures back off
+    linearly (base * attempt) without touching the host.
+    """
+    if status not in THROTTLE_STATUSES:
+        return base * attempt
+    key = _host_key(url)
+    with _lock:
+        host = _hosts.setdefault(key, _Host())
+        host.throttles += 1
+        delay = _retry_after_secs(retry_after)
+        if delay is None:
+            delay = base * 2 ** (host.throttles - 1)
+        delay = min(delay, MAX_BACKOFF_SECS)
+        host.paused_until = max(host.paused_until, time.monotonic() + delay)
+        _stats["throttled"] += 1
+    return delay
+
+
+def succeeded(url: str) -> None:
+    """Reset url's host's adaptive backoff after a successful response."""
+    with _lock:
+        host = _hosts.get(_host_key(url))
+        if host is not None:
+            host.throttles = 0
+
+
+def stats() -> dict:
+    """
+    Requests granted, how many had to queue, 429/503s seen, the current and
+    peak queue depth, requests in flight, and wait times per priority.
+    """
+    with _lock:
+        return {
+            **{k: v for k, v in _stats.items() if k != "wait"},
+            "wait": {name: dict(wait) for name, wait in _stats["wait"].items()},
+        }
+
+
+def reset() -> None:
+    """Forget all hosts and counters (tests, benchmarks)."""
+    with _lock:
+        for host in _hosts.values():
+            if host.timer is not None:
+                host.timer.cancel()
+        _hosts.clear()
+        _stats.update(requests=0, queued=0, throttled=0, queue_depth=0, max_queue_depth=0, in_flight=0)
+        for wait in _stats["wait"].values():
+            wait.update(count=0, total_secs=0.0, max_secs=0.0)
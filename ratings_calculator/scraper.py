@@ -3,16 +3,31 @@ scraper.py
 ----------
 All network I/O and HTML parsing. Every function returns plain dicts/primitives
 so the rest of the codebase stays decoupled from BeautifulSoup.
+
+The fetch engine is asyncio-based (fetch_html_async, fetch_player_pages_async,
+load_player_data_async); the blocking functions of the same name are thin
+wrappers that run it to completion with asyncio.run(), so they must not be
+called from inside a running event loop.
 """
 
+import asyncio
+import contextvars
+import math
+import os
 import re
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
 import requests
 from bs4 import BeautifulSoup
 
 from . import cache as cache_mod
+from . import extract as extract_mod
+from . import scheduler
+from . import transport
+from . import ttl as ttl_mod
 
 # ---------------------------------------------------------------------------
 # HTTP
@@ -20,9 +35,39 @@ from . import cache as cache_mod
 
 SESSION = requests.Session()
 SESSION.headers.update({"User-Agent": "pdga-ratings-calculator/1.0"})
+# Where player, tournament and schedule pages are fetched from; point it at a
+# stand-in server (benchmarks/pdga_server.py) with set_base_url() or the
+# PDGA_BASE_URL environment variable.
+BASE_URL = os.environ.get("PDGA_BASE_URL", "https://www.pdga.com").rstrip("/")
+# Offline mode: cached pages are served however old they are, and only what
+# isn't cached goes to SESSION (set to a transport.Replayer or
+# transport.Offline alongside).
+OFFLINE = False
 
 MAX_RETRIES  = 3
 RETRY_BACKOFF = 2  # seconds
+PERMANENT_STATUSES = {404, 410}  # not retried; negatively cached like a 5xx that outlasts the retries
+MAX_CONCURRENCY = 8   # concurrent tournament-page fetches per player load
+IO_THREADS      = 32  # worker threads for blocking HTTP/SQLite calls
+STREAM_CHUNK_SIZE = 16 * 1024  # bytes per read in streaming (early-exit) mode
+MAX_STALE_SECS    = 24 * 3600  # stale_ok loads serve pages expired at most this long
+
+# Blocking I/O gets its own pool so a loop with many players in flight isn't
+# capped by the (CPU-sized) default executor, which is left for parsing.
+_IO_POOL = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="pdga-io")
+# Background refreshes after a stale_ok load; the pool's workers are joined
+# at interpreter exit, so a refresh that has started is allowed to finish.
+_REFRESH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdga-refresh")
+
+# Scheduler priority for requests made in this context; background refreshes
+# run as scheduler.PREFETCH so interactive loads go first.
+_PRIORITY: contextvars.ContextVar[int] = contextvars.ContextVar("priority", default=scheduler.INTERACTIVE)
+
+# Single-flight: url -> the download in progress. Futures are thread-safe, so
+# callers on other event loops (the GUI's refresh thread, concurrent sync
+# wrappers) share a download too.
+_IN_FLIGHT: dict[str, Future] = {}
+_IN_FLIGHT_LOCK = threading.Lock()
 
 
 class FetchError(Exception):
@@ -33,38 +78,364 @@ class ParseError(Exception):
     """Raised when expected HTML structure is missing or malformed."""
 
 
-def fetch_html(url: str, force_refresh: bool = False) -> str:
+async def _run_io(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_IO_POOL, fn, *args)
+
+
+def _conditional_headers(validators: dict | None) -> dict:
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _download(url: str, validators: dict | None = None) -> requests.Response:
     """
-    Return raw HTML for url. Results are cached in SQLite.
-    Set force_refresh=True to bypass the cache and re-fetch unconditionally.
+    One blocking GET on SESSION, made conditional when the cached entry has
+    validators. Returns the response (200 or 304); raises
+    requests.RequestException on failure.
     """
-    if not force_refresh:
-        cached = cache_mod.get(url)
-        if cached is not None:
-            return cached
+    response = SESSION.get(url, timeout=15, headers=_conditional_headers(validators))
+    response.raise_for_status()
+    return response
+
 
-    last_exc: Exception | None = None
+async def _with_retries(url: str, fn, *args):
+    """
+    Run the blocking request fn(*args) on the I/O pool once the scheduler
+    grants url's host a slot, retrying requests.RequestException with
+    backoff (scheduler.retry_delay: Retry-After / adaptive on 429 and 503);
+    statuses in PERMANENT_STATUSES aren't retried, nor is anything in
+    OFFLINE mode or a request a replayed archive can't answer
+    (transport.Unavailable). Raises FetchError once it
+    gives up, and negatively caches url if the last failure was a 404 / 410
+    or a server error.
+    """
+    priority = _PRIORITY.get()
+    status: int | None = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            response = SESSION.get(url, timeout=15)
-            response.raise_for_status()
-            html = response.text
-            cache_mod.set(url, html)
-            return html
+            async with scheduler.slot_async(url, priority):
+                result = await _run_io(fn, *args)
+            scheduler.succeeded(url)
+            return result
         except requests.RequestException as e:
             last_exc = e
+            status   = e.response.status_code if e.response is not None else None
+            if status in PERMANENT_STATUSES or OFFLINE or isinstance(e, transport.Unavailable):
+                break   # offline, the fixtures won't change between attempts
+            retry_after = e.response.headers.get("Retry-After") if e.response is not None else None
+            delay = scheduler.retry_delay(url, status, retry_after, attempt, RETRY_BACKOFF)
             if attempt < MAX_RETRIES:
-                time.sleep(RETRY_BACKOFF * attempt)
+                await asyncio.sleep(delay)
+
+    reason = f"Failed to fetch {url} after {attempt} attempt{'s' if attempt > 1 else ''}: {last_exc}"
+    if status is not None and (status in PERMANENT_STATUSES or status >= 500):
+        await _run_io(cache_mod.set_negative, url, "fetch", reason)
+    raise FetchError(reason)
+
+
+def _negative_error(failure: dict) -> FetchError | ParseError:
+    """The error to raise for a negatively cached url, without retrying it."""
+    error   = ParseError if failure["kind"] == "parse" else FetchError
+    minutes = cache_mod.NEGATIVE_TTL_SECS // 60
+    return error(f"{failure['reason']} (failed recently; not retried for {minutes} min)")
 
-    raise FetchError(
-        f"Failed to fetch {url} after {MAX_RETRIES} attempts: {last_exc}"
+
+async def _failed_fetches(urls) -> dict[str, dict]:
+    """Negatively cached fetch failures among urls (parse failures don't stop a fetch)."""
+    failures = await _run_io(cache_mod.get_negatives, urls)
+    return {url: failure for url, failure in failures.items() if failure["kind"] == "fetch"}
+
+
+async def _download_async(url: str, entry: dict | None) -> tuple[str, tuple | None]:
+    """
+    GET url with retries, conditionally when the cached entry has validators.
+    Returns (html, row): row is the (url, html, etag, last_modified) tuple to
+    cache after a 200, or None after a 304 (the entry only needs touching).
+    """
+    response = await _with_retries(url, _download, url, entry)
+    if response.status_code == 304 and entry is not None:
+        cache_mod.record("revalidated")
+        return entry["html"], None
+    cache_mod.record("full_fetches")
+    html = response.text
+    return html, (
+        url, html, response.headers.get("ETag"), response.headers.get("Last-Modified")
     )
 
 
+async def _download_coalesced(url: str, entry: dict | None) -> tuple[str, tuple | None, bool]:
+    """
+    _download_async, shared by every concurrent caller for url: the first
+    (the leader) downloads, the rest wait for its result or error. Returns
+    (html, row, leader); only the leader should write the result to the cache.
+    """
+    with _IN_FLIGHT_LOCK:
+        shared = _IN_FLIGHT.get(url)
+        leader = shared is None
+        if leader:
+            shared = _IN_FLIGHT[url] = Future()
+    if not leader:
+        cache_mod.record("coalesced")
+        html, row = await asyncio.wrap_future(shared)
+        return html, row, False
+
+    try:
+        html, row = await _download_async(url, entry)
+    except Exception as e:
+        shared.set_exception(e)
+        raise
+    except BaseException:
+        shared.cancel()
+        raise
+    else:
+        shared.set_result((html, row))
+    finally:
+        with _IN_FLIGHT_LOCK:
+            del _IN_FLIGHT[url]
+    return html, row, True
+
+
+def _usable(entry: dict | None, force_refresh: bool) -> bool:
+    """Whether a cached page can be served without going to SESSION."""
+    return entry is not None and not force_refresh and (OFFLINE or not entry["expired"])
+
+
+async def fetch_html_async(url: str, force_refresh: bool = False) -> str:
+    """
+    Return raw HTML for url. Results are cached in SQLite.
+    Set force_refresh=True to ignore cache freshness and go to the network.
+    Expired (or force-refreshed) entries that carry an ETag / Last-Modified
+    are revalidated with a conditional GET; a 304 only refreshes the entry's
+    timestamp.
+    Blocking I/O (SQLite, HTTP) runs on a dedicated thread pool, so many
+    fetches can be in flight from one event loop. Concurrent calls for the
+    same url (from any thread) share one download and its result or error.
+    A url that failed for good recently (cache.get_negative) raises again
+    straight away unless force_refresh is set.
+    In OFFLINE mode any cached entry is served, expired or not.
+    """
+    entry = await _run_io(cache_mod.get_entry, url)
+    if _usable(entry, force_refresh):
+        cache_mod.record("hits")
+        return entry["html"]
+    if not force_refresh:
+        failure = (await _failed_fetches([url])).get(url)
+        if failure is not None:
+            raise _negative_error(failure)
+
+    html, row, leader = await _download_coalesced(url, entry)
+    if not leader:
+        return html
+    if row is None:
+        await _run_io(cache_mod.touch, url)
+    else:
+        await _run_io(cache_mod.set, *row)
+    return html
+
+
+async def fetch_many_html_async(
+    urls,
+    force_refresh:     bool = False,
+    max_concurrency:   int  = MAX_CONCURRENCY,
+    return_exceptions: bool = False,
+) -> dict[str, str]:
+    """
+    Batch fetch_html_async: {url: html} for every url. Cache freshness for all
+    urls is resolved in one lookup up front, only the stale or missing ones go
+    to the network (at most `max_concurrency` at a time), and everything
+    downloaded is written back in one transaction.
+    A url that can't be fetched raises FetchError once the rest are cached,
+    or with return_exceptions=True maps to its FetchError instead.
+    Downloads are shared with concurrent fetches of the same url, and
+    recently failed urls are skipped, as in fetch_html_async.
+    """
+    urls    = list(dict.fromkeys(urls))
+    entries = await _run_io(cache_mod.get_entries, urls)
+    results: dict[str, str | FetchError] = {}
+    stale   = []
+    for url in urls:
+        entry = entries.get(url)
+        if _usable(entry, force_refresh):
+            results[url] = entry["html"]
+        else:
+            stale.append(url)
+    if results:
+        cache_mod.record("hits", len(results))
+    failures = {} if force_refresh or not stale else await _failed_fetches(stale)
+    for url, failure in failures.items():
+        results[url] = _negative_error(failure)
+    stale = [url for url in stale if url not in failures]
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def download(url: str):
+        async with semaphore:
+            try:
+                return await _download_coalesced(url, entries.get(url))
+            except FetchError as e:
+                return e, None, False
+
+    downloads = await asyncio.gather(*(download(url) for url in stale))
+    rows, touched = [], []
+    for url, (html, row, leader) in zip(stale, downloads):
+        if not leader:
+            continue
+        if row is not None:
+            rows.append(row)
+        else:
+            touched.append(url)
+    if rows:
+        await _run_io(cache_mod.set_many, rows)
+    if touched:
+        await _run_io(cache_mod.touch_many, touched)
+
+    for url, (html, _, _) in zip(stale, downloads):
+        results[url] = html
+    if not return_exceptions:
+        for url in urls:
+            if isinstance(results[url], Exception):
+                raise results[url]
+    return {url: results[url] for url in urls}
+
+
+def fetch_html(url: str, force_refresh: bool = False) -> str:
+    """Blocking wrapper around fetch_html_async."""
+    return asyncio.run(fetch_html_async(url, force_refresh))
+
+
 def _parse(html: str) -> BeautifulSoup:
     return BeautifulSoup(html, "html.parser")
 
 
+# ---------------------------------------------------------------------------
+# Parsed-extract cache
+# ---------------------------------------------------------------------------
+
+# Extracts, tournament-index rows and streamed records are only reused when
+# stored under the current PARSER_VERSION. Bump it whenever a change here or
+# in the extract backends alters what they produce for the same page (a new
+# or renamed field, different values); earlier results are then reparsed.
+PARSER_VERSION = 1
+
+
+def _max_stale(stale: set | None) -> float:
+    if OFFLINE:
+        return math.inf
+    return MAX_STALE_SECS if stale is not None else 0
+
+
+def _served_stale(stale: set | None, urls) -> None:
+    """Note urls answered from expired cache entries in a stale_ok load."""
+    urls = list(urls)
+    if stale is not None and urls:
+        stale.update(urls)
+        cache_mod.record("stale_hits", len(urls))
+
+
+async def _extract_async(
+    url:           str,
+    kind:          str,
+    extractor,
+    force_refresh: bool = False,
+    pdga_number:   str | None = None,
+    stale:         set | None = None,
+):
+    """
+    Return extractor(html) for url, served from the extract cache when the
+    cached page is fresh and unchanged since the extract was built. On a miss
+    the page is fetched as usual, parsed off the loop and the result stored.
+    Extracts must be JSON-serialisable (tuples come back as lists).
+    Pages of a player's own (pdga_number) are tagged for invalidate_player().
+    With a `stale` set (stale-while-revalidate), a page expired for at most
+    MAX_STALE_SECS is used as is and its url added to the set.
+    Pages that failed to fetch or parse recently raise again without a retry.
+    """
+    [data] = await _extract_many_async([(url, kind, extractor, pdga_number)], force_refresh, stale)
+    return data
+
+
+async def _extract_many_async(specs, force_refresh: bool = False, stale: set | None = None) -> list:
+    """
+    Batch _extract_async over (url, kind, extractor, pdga_number) specs; returns
+    the extracts in order. Pages whose extract isn't cached are fetched in
+    one fetch_many_html_async batch.
+    """
+    lookups = await asyncio.gather(*(
+        _extract_lookup_async(url, kind, force_refresh, stale) for url, kind, _, _ in specs
+    ))
+    return await _extract_finish_async(specs, lookups, force_refresh)
+
+
+async def _extract_lookup_async(
+    url: str, kind: str, force_refresh: bool = False, stale: set | None = None
+) -> tuple[bool, object]:
+    """
+    The cache half of _extract_async, local I/O only: (True, extract) when a
+    usable extract is cached, (False, html) when a stale_ok load can parse an
+    expired page as is, otherwise (False, None) and the page must be fetched.
+    Raises the recorded error for a page that failed recently.
+    """
+    if force_refresh:
+        return False, None
+    entry = await _run_io(cache_mod.get_extract_entry, url, kind, PARSER_VERSION, _max_stale(stale))
+    if entry is not None:
+        cache_mod.record("hits")
+        if entry["expired"]:
+            _served_stale(stale, [url])
+        return True, entry["data"]
+    failure = await _run_io(cache_mod.get_negative, url)
+    if failure is not None:
+        raise _negative_error(failure)
+    if stale is not None:
+        page = await _run_io(cache_mod.get_entry, url)
+        usable = page is not None and time.time() <= page["expires_at"] + MAX_STALE_SECS
+        if usable and page["expired"]:
+            _served_stale(stale, [url])
+            return False, page["html"]
+    return False, None
+
+
+async def _extract_finish_async(specs, lookups, force_refresh: bool = False) -> list:
+    """
+    The network half of _extract_many_async: fetch the pages lookups left
+    unresolved in one batch, parse every page off the loop and store the
+    extracts. Raises the first spec's FetchError or ParseError, in order.
+    """
+    fetch = [url for (url, *_), (hit, html) in zip(specs, lookups) if not hit and html is None]
+    htmls = await fetch_many_html_async(fetch, force_refresh, return_exceptions=True) if fetch else {}
+
+    async def extract(spec, lookup):
+        url, kind, extractor, pdga_number = spec
+        hit, value = lookup
+        if hit:
+            return value
+        html = value if value is not None else htmls[url]
+        if isinstance(html, Exception):
+            return html
+        try:
+            data = await asyncio.to_thread(extractor, html)
+        except ParseError as e:
+            await _run_io(cache_mod.set_negative, url, "parse", str(e))
+            return e
+        await _run_io(
+            cache_mod.set_extract, url, kind, cache_mod.content_hash(html), PARSER_VERSION, data
+        )
+        if pdga_number is not None:
+            await _run_io(cache_mod.tag_player, pdga_number, [url])
+        return data
+
+    results = await asyncio.gather(*(extract(spec, lookup) for spec, lookup in zip(specs, lookups)))
+    for result in results:
+        if isinstance(result, (FetchError, ParseError)):
+            raise result
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Date parsing
 # ---------------------------------------------------------------------------
@@ -88,19 +459,30 @@ def parse_pdga_date(date_str: str) -> int:
 # Player pages
 # ---------------------------------------------------------------------------
 
+def _player_urls(pdga_number: str) -> dict[str, str]:
+    base = f"{BASE_URL}/player/{pdga_number}"
+    return {
+        "stats":   base,
+        "detail":  f"{base}/details",
+        "history": f"{base}/history",
+    }
+
+
+async def fetch_player_pages_async(pdga_number: str, force_refresh: bool = False) -> dict:
+    """Fetch (in one batch) and parse (off the loop) all pages needed for a player."""
+    urls  = _player_urls(pdga_number)
+    htmls = await fetch_many_html_async(urls.values(), force_refresh)
+    await _run_io(cache_mod.tag_player, pdga_number, urls.values())
+    docs  = await asyncio.gather(*(asyncio.to_thread(_parse, htmls[u]) for u in urls.values()))
+    return dict(zip(urls, docs))
+
+
 def fetch_player_pages(pdga_number: str, force_refresh: bool = False) -> dict:
     """Fetch and parse all pages needed for a player."""
-    base = f"https://www.pdga.com/player/{pdga_number}"
-    pages = {
-        "stats":   fetch_html(base,              force_refresh),
-        "detail":  fetch_html(f"{base}/details", force_refresh),
-        "history": fetch_html(f"{base}/history", force_refresh),
-    }
-    return {k: _parse(v) for k, v in pages.items()}
+    return asyncio.run(fetch_player_pages_async(pdga_number, force_refresh))
 
 
-def scrape_current_rating(doc_stats: BeautifulSoup, doc_history: BeautifulSoup) -> int:
-    """Extract the player's current official PDGA rating."""
+def _stats_current_rating(doc_stats: BeautifulSoup) -> int | None:
     try:
         rating_li = doc_stats.find("li", class_="current-rating")
         if rating_li:
@@ -108,15 +490,30 @@ def scrape_current_rating(doc_stats: BeautifulSoup, doc_history: BeautifulSoup)
             match = re.search(r"Current Rating:(\d+)", text)
             if match:
                 return int(match.group(1))
+    except (AttributeError, ValueError, TypeError) as e:
+        raise ParseError(f"Could not parse current rating: {e}")
+    return None
+
 
+def _history_current_rating(doc_history: BeautifulSoup) -> int | None:
+    try:
         rating_table = doc_history.find("table", id="player-results-history")
         if rating_table:
             first_row = rating_table.find("tbody").find("tr")
             return int(first_row.find("td", class_="player-rating").get_text(strip=True))
     except (AttributeError, ValueError, TypeError) as e:
         raise ParseError(f"Could not parse current rating: {e}")
+    return None
 
-    raise ParseError("Could not find current rating on player page.")
+
+def scrape_current_rating(doc_stats: BeautifulSoup, doc_history: BeautifulSoup) -> int:
+    """Extract the player's current official PDGA rating."""
+    rating = _stats_current_rating(doc_stats)
+    if rating is None:
+        rating = _history_current_rating(doc_history)
+    if rating is None:
+        raise ParseError("Could not find current rating on player page.")
+    return rating
 
 
 def scrape_rating_history(doc_history: BeautifulSoup) -> list[dict]:
@@ -149,46 +546,35 @@ def scrape_rating_history(doc_history: BeautifulSoup) -> list[dict]:
     return results
 
 
+def _tournaments_from_detail_rows(rows: list[dict]) -> list[dict]:
+    """Validate raw detail rows from any extract backend into rated round dicts."""
+    tournaments = []
+    for raw in rows:
+        tournament = dict(raw)
+        try:
+            tournament["rating"]    = int(tournament["rating"])
+            tournament["timestamp"] = parse_pdga_date(tournament["date"])
+        except (KeyError, ValueError, ParseError):
+            continue
+        tournaments.append(tournament)
+    return tournaments
+
+
 def scrape_detail_tournaments(doc_detail: BeautifulSoup) -> list[dict]:
     """Parse the player detail page into a list of rated round dicts."""
-    tournaments = []
     try:
-        for row in doc_detail.find_all("tr"):
-            tournament_cell = row.find("td", class_="tournament")
-            if not tournament_cell:
-                continue
-
-            tournament: dict = {}
-            link = tournament_cell.find("a")
-            if link:
-                tournament["name"] = link.get_text(strip=True)
-                tournament["link"] = link["href"]
-
-            fields = {
-                "tier":      "tier",
-                "date":      "date",
-                "division":  "division",
-                "round":     "round tooltip",
-                "score":     "score",
-                "rating":    "round-rating",
-                "evaluated": "evaluated",
-                "included":  "included",
-            }
-            for key, class_name in fields.items():
-                cell = row.find("td", class_=class_name)
-                if cell:
-                    tournament[key] = cell.get_text(strip=True)
+        return _tournaments_from_detail_rows(extract_mod.soup_detail_rows(doc_detail))
+    except AttributeError as e:
+        raise ParseError(f"Could not parse detail tournaments: {e}")
 
-            try:
-                tournament["rating"]    = int(tournament["rating"])
-                tournament["timestamp"] = parse_pdga_date(tournament["date"])
-            except (KeyError, ValueError, ParseError):
-                continue
 
-            tournaments.append(tournament)
+def parse_detail_tournaments(html: str, backend: str | None = None) -> list[dict]:
+    """scrape_detail_tournaments over raw HTML, using the selected extract backend."""
+    try:
+        rows = extract_mod.get_backend(backend).detail_rows(html)
     except AttributeError as e:
         raise ParseError(f"Could not parse detail tournaments: {e}")
-    return tournaments
+    return _tournaments_from_detail_rows(rows)
 
 
 def scrape_stats_tournaments(doc_stats: BeautifulSoup) -> list[dict]:
@@ -228,52 +614,196 @@ def scrape_stats_tournaments(doc_stats: BeautifulSoup) -> list[dict]:
     return tournaments
 
 
-def scrape_tournament_rounds(
-    href_link: str, pdga_number: str, force_refresh: bool = False
+def _tournament_url(href_link: str) -> str:
+    return f"{BASE_URL}{href_link}"
+
+
+def _rounds_from_page(page: dict, url: str) -> tuple[list[int], int, str, bool]:
+    """Validate a raw tournament_page() record into (ratings, timestamp, date_str, is_league)."""
+    if not page["has_body"]:
+        raise ParseError(f"Could not parse tournament page {url}: no <body> element")
+    if page["date"] is None:
+        raise ParseError(f"No tournament-date element found at {url}")
+    date_str  = page["date"]
+    timestamp = parse_pdga_date(date_str)
+    try:
+        ratings = [int(text) for text in page["ratings"] or []]
+    except ValueError as e:
+        raise ParseError(f"Could not parse tournament page {url}: {e}")
+    return ratings, timestamp, date_str, page["is_league"]
+
+
+def parse_tournament_rounds(
+    html: str, pdga_number: str, url: str = "", backend: str | None = None
 ) -> tuple[list[int], int, str, bool]:
     """
-    Fetch a tournament result page and extract round ratings for a player.
+    Extract a player's round ratings from tournament result page HTML.
     Returns (ratings, timestamp, date_str, is_league).
     """
-    url = f"https://www.pdga.com{href_link}"
     try:
-        doc       = _parse(fetch_html(url, force_refresh))
-        is_league = bool(
-            doc.body.find_all("h4", string=re.compile(r".*League.*"), recursive=True)
-        )
-        date_el = doc.find(class_="tournament-date")
-        if not date_el:
-            raise ParseError(f"No tournament-date element found at {url}")
-        date_str  = date_el.get_text(strip=True)
-        timestamp = parse_pdga_date(date_str)
-
-        ratings: list[int] = []
-        for row in doc.find_all("tr"):
-            pdga_td = row.find("td", class_="pdga-number")
-            if pdga_td and pdga_td.get_text(strip=True) == pdga_number:
-                for cell in row.find_all("td", class_="round-rating"):
-                    text = cell.get_text(strip=True)
-                    if text:
-                        ratings.append(int(text))
-                break
-
-        return ratings, timestamp, date_str, is_league
-
-    except (AttributeError, ValueError) as e:
+        page = extract_mod.get_backend(backend).tournament_page(html, pdga_number)
+    except AttributeError as e:
+        raise ParseError(f"Could not parse tournament page {url}: {e}")
+    return _rounds_from_page(page, url)
+
+
+def parse_tournament_results(html: str, url: str = "", backend: str | None = None) -> dict:
+    """
+    Extract every player's raw round ratings from a tournament result page,
+    for the shared tournament index. Returns the backend's tournament_results()
+    record; values are validated per player when looked up (_rounds_from_page).
+    """
+    try:
+        return extract_mod.get_backend(backend).tournament_results(html)
+    except AttributeError as e:
         raise ParseError(f"Could not parse tournament page {url}: {e}")
 
 
+def _page_for_player(results: dict, pdga_number: str) -> dict:
+    """The tournament_page() record for one player, cut out of tournament_results()."""
+    return {
+        "has_body":  results["has_body"],
+        "is_league": results["is_league"],
+        "date":      results["date"],
+        "ratings":   results["players"].get(pdga_number),
+    }
+
+
+# Streaming mode: single-player lookups that stop reading (and parsing) a
+# results page as soon as the player's row and the event header are known.
+# Always uses the fast extractor; see extract.py for the header-first caveat.
+
+def _scan_tournament_html(html: str, pdga_number: str) -> dict:
+    page, _ = extract_mod.BACKENDS["fast"].tournament_page_stream([html], pdga_number)
+    return page
+
+
+def _stream_tournament_once(
+    url: str, pdga_number: str, entry: dict | None, streamed: dict | None = None
+) -> tuple[dict, str | None]:
+    """
+    One streaming GET, parsed while the body downloads. Returns (page, html);
+    html is None when parsing stopped early, since a partial body can't be
+    cached: the player's record is kept (cache.set_streamed_page) with the
+    response's validators instead. A complete body is cached like any other
+    fetch. The request is conditional on the cached page, or failing that on
+    the player's expired streamed record.
+    """
+    response = SESSION.get(
+        url, timeout=15, headers=_conditional_headers(entry or streamed), stream=True
+    )
+    try:
+        response.raise_for_status()
+        if response.status_code == 304 and entry is not None:
+            cache_mod.touch(url)
+            cache_mod.record("revalidated")
+            return _scan_tournament_html(entry["html"], pdga_number), entry["html"]
+        if response.status_code == 304 and streamed is not None:
+            cache_mod.touch_streamed_page(url, pdga_number)
+            cache_mod.record("revalidated")
+            return streamed["page"], None
+
+        if response.encoding is None:
+            response.encoding = "utf-8"
+        chunks: list[str] = []
+
+        def body():
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE, decode_unicode=True):
+                chunks.append(chunk)
+                yield chunk
+
+        page, complete = extract_mod.BACKENDS["fast"].tournament_page_stream(body(), pdga_number)
+        if not complete:
+            cache_mod.record("early_exits")
+            cache_mod.set_streamed_page(
+                url, pdga_number, PARSER_VERSION, page,
+                response.headers.get("ETag"), response.headers.get("Last-Modified"),
+            )
+            return page, None
+        html = "".join(chunks)
+        cache_mod.set(
+            url, html, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        )
+        cache_mod.record("full_fetches")
+        return page, html
+    finally:
+        response.close()
+
+
+async def _stream_tournament_page_async(
+    url: str, pdga_number: str, force_refresh: bool = False, stale: set | None = None
+) -> tuple[dict, str | None]:
+    """
+    Streaming counterpart of fetch_html_async + tournament_page(), same retry
+    rules. A cached page is used first, then the player's streamed record
+    from an earlier early exit (served up to MAX_STALE_SECS past expiry with
+    a `stale` set, as _extract_async does).
+    """
+    entry = await _run_io(cache_mod.get_entry, url)
+    if _usable(entry, force_refresh):
+        cache_mod.record("hits")
+        page = await asyncio.to_thread(_scan_tournament_html, entry["html"], pdga_number)
+        return page, entry["html"]
+    streamed = await _run_io(cache_mod.get_streamed_page, url, pdga_number, PARSER_VERSION)
+    if streamed is not None and not force_refresh and time.time() <= streamed["expires_at"] + _max_stale(stale):
+        cache_mod.record("hits")
+        if streamed["expired"]:
+            _served_stale(stale, [url])
+        return streamed["page"], None
+
+    if not force_refresh:
+        failure = (await _failed_fetches([url])).get(url)
+        if failure is not None:
+            raise _negative_error(failure)
+    return await _with_retries(url, _stream_tournament_once, url, pdga_number, entry, streamed)
+
+
+async def scrape_tournament_rounds_async(
+    href_link: str, pdga_number: str, force_refresh: bool = False, stream: bool = False
+) -> tuple[list[int], int, str, bool]:
+    """
+    Async version of scrape_tournament_rounds; parsing runs off the loop.
+    stream=True parses while downloading and stops at the player's row.
+    """
+    url = _tournament_url(href_link)
+    if stream:
+        page, _ = await _stream_tournament_page_async(url, pdga_number, force_refresh)
+        return _rounds_from_page(page, url)
+    html = await fetch_html_async(url, force_refresh)
+    return await asyncio.to_thread(parse_tournament_rounds, html, pdga_number, url)
+
+
+def scrape_tournament_rounds(
+    href_link: str, pdga_number: str, force_refresh: bool = False, stream: bool = False
+) -> tuple[list[int], int, str, bool]:
+    """
+    Fetch a tournament result page and extract round ratings for a player.
+    Returns (ratings, timestamp, date_str, is_league).
+    """
+    return asyncio.run(
+        scrape_tournament_rounds_async(href_link, pdga_number, force_refresh, stream)
+    )
+
+
 # ---------------------------------------------------------------------------
 # Ratings update schedule
 # ---------------------------------------------------------------------------
 
-SCHEDULE_URL = "https://www.pdga.com/faq/ratings/when-updated"
+SCHEDULE_PATH = "/faq/ratings/when-updated"
+SCHEDULE_URL  = BASE_URL + SCHEDULE_PATH
 
 
-def scrape_ratings_schedule(force_refresh: bool = False) -> list[dict]:
-    """Parse the PDGA ratings update schedule."""
+def set_base_url(base_url: str) -> None:
+    """Fetch from base_url (e.g. "http://127.0.0.1:8765") instead of pdga.com."""
+    global BASE_URL, SCHEDULE_URL
+    BASE_URL     = base_url.rstrip("/")
+    SCHEDULE_URL = BASE_URL + SCHEDULE_PATH
+
+
+def parse_ratings_schedule(html: str) -> list[dict]:
+    """Parse the PDGA ratings update schedule page HTML."""
     try:
-        doc   = _parse(fetch_html(SCHEDULE_URL, force_refresh))
+        doc   = _parse(html)
         table = doc.find("table")
         rows  = table.find("tbody").find_all("tr")
         schedule = []
@@ -291,22 +821,275 @@ def scrape_ratings_schedule(force_refresh: bool = False) -> list[dict]:
         raise ParseError(f"Could not parse ratings schedule: {e}")
 
 
+async def scrape_ratings_schedule_async(force_refresh: bool = False) -> list[dict]:
+    """Async version of scrape_ratings_schedule; parsing runs off the loop."""
+    html     = await fetch_html_async(SCHEDULE_URL, force_refresh)
+    schedule = await asyncio.to_thread(parse_ratings_schedule, html)
+    ttl_mod.set_schedule(schedule)
+    return schedule
+
+
+def scrape_ratings_schedule(force_refresh: bool = False) -> list[dict]:
+    """Parse the PDGA ratings update schedule (and hand it to the cache TTL policy)."""
+    schedule = parse_ratings_schedule(fetch_html(SCHEDULE_URL, force_refresh))
+    ttl_mod.set_schedule(schedule)
+    return schedule
+
+
 # ---------------------------------------------------------------------------
 # High-level: load all data for a player
 # ---------------------------------------------------------------------------
 
-def load_player_data(pdga_number: str, force_refresh: bool = False) -> dict:
+def _scrape_event_links(doc_stats: BeautifulSoup) -> list[tuple[str, str]]:
+    """(href, name) for every link in the current-events / recent-events items."""
+    events: list[tuple[str, str]] = []
+    for li_class in ["current-events", "recent-events"]:
+        li = doc_stats.find("li", class_=li_class)
+        if not li:
+            continue
+        for event in li.find_all("a"):
+            events.append((event["href"], event.get_text(strip=True)))
+    return events
+
+
+# Extractors: page HTML -> JSON-serialisable record for the extract cache.
+
+def _extract_stats(html: str) -> dict:
+    doc = _parse(html)
+    return {
+        "rating":      _stats_current_rating(doc),
+        "tournaments": scrape_stats_tournaments(doc),
+        "events":      _scrape_event_links(doc),
+    }
+
+
+def _extract_history(html: str) -> dict:
+    # The history page is only a fallback source for the current rating, so
+    # its errors are recorded rather than raised and surface only if needed.
+    doc    = _parse(html)
+    record = {"rating": None, "rating_error": None, "history": None}
+    try:
+        record["rating"] = _history_current_rating(doc)
+    except ParseError as e:
+        record["rating_error"] = str(e)
+    try:
+        record["history"] = scrape_rating_history(doc)
+    except ParseError:
+        pass
+    return record
+
+
+def _current_rating_from_extracts(stats: dict, history: dict) -> int:
+    """Same precedence and errors as scrape_current_rating, over extracts."""
+    if stats["rating"] is not None:
+        return stats["rating"]
+    if history["rating_error"]:
+        raise ParseError(history["rating_error"])
+    if history["rating"] is not None:
+        return history["rating"]
+    raise ParseError("Could not find current rating on player page.")
+
+
+# Event URLs hash onto a fixed set of locks: concurrent loads of a roster
+# miss the index together, but only the first parses the page; the rest wait
+# and read its rows. Striping keeps the lock count bounded in long-running
+# processes, at the cost of unrelated events occasionally sharing a lock.
+INDEX_LOCK_STRIPES = 64
+_INDEX_LOCKS = tuple(threading.Lock() for _ in range(INDEX_LOCK_STRIPES))
+
+
+def _index_tournament_html(url: str, html: str) -> dict | None:
+    """
+    Parse html into the tournament index unless it's already indexed for this
+    content and parser version. Returns the fresh results, or None if another
+    load got there first. Runs in a worker thread.
+    """
+    lock   = _INDEX_LOCKS[hash(url) % len(_INDEX_LOCKS)]
+    digest = cache_mod.content_hash(html)
+    with lock:
+        if cache_mod.is_indexed(url, digest, PARSER_VERSION):
+            return None
+        results = parse_tournament_results(html, url)
+        cache_mod.index_tournament(url, digest, PARSER_VERSION, results)
+        return results
+
+
+def _mark_if_published(url: str, date_str: str | None) -> None:
+    """
+    Give a tournament page the long 'published_event' TTL once the ratings
+    schedule shows its ratings are out; until then unofficial ratings can
+    still shift. Runs in a worker thread.
+    """
+    try:
+        timestamp = parse_pdga_date(date_str or "")
+    except ParseError:
+        return
+    if ttl_mod.event_published(timestamp, int(datetime.now().timestamp())):
+        cache_mod.set_ttl_class(url, "published_event")
+
+
+async def _indexed_tournament_pages_async(
+    urls,
+    pdga_number:     str,
+    force_refresh:   bool = False,
+    max_concurrency: int  = MAX_CONCURRENCY,
+    stale:           set | None = None,
+) -> dict[str, dict | FetchError | ParseError]:
+    """
+    A player's raw tournament_page() records for many events via the shared
+    tournament index: one index lookup for every url, one batched fetch for
+    the misses, and each missed page parsed once for every player on it, so
+    the rest of a club roster that played the same events is served by keyed
+    reads. Pages that can't be fetched or parsed map to the error instead,
+    and are skipped while negatively cached.
+    With a `stale` set, index entries expired for at most MAX_STALE_SECS are
+    served and their urls added to it.
+    """
+    urls  = list(dict.fromkeys(urls))
+    pages: dict = {}
+    if not force_refresh:
+        entries = await _run_io(
+            cache_mod.get_indexed_entries, urls, pdga_number, PARSER_VERSION, _max_stale(stale)
+        )
+        pages = {url: entry["page"] for url, entry in entries.items()}
+        if pages:
+            cache_mod.record("hits", len(pages))
+        _served_stale(stale, (url for url, entry in entries.items() if entry["expired"]))
+
+    missing = [url for url in urls if url not in pages]
+    if missing and not force_refresh:
+        failures = await _run_io(cache_mod.get_negatives, missing)
+        pages.update({url: _negative_error(failure) for url, failure in failures.items()})
+        missing  = [url for url in missing if url not in failures]
+    htmls = await fetch_many_html_async(
+        missing, force_refresh, max_concurrency, return_exceptions=True
+    )
+
+    async def index(url: str, html: str | FetchError):
+        if isinstance(html, FetchError):
+            return html
+        try:
+            results = await asyncio.to_thread(_index_tournament_html, url, html)
+            if results is None:
+                page = await _run_io(cache_mod.get_indexed_page, url, pdga_number, PARSER_VERSION)
+                if page is None:
+                    results = await asyncio.to_thread(parse_tournament_results, html, url)
+        except ParseError as e:
+            await _run_io(cache_mod.set_negative, url, "parse", str(e))
+            return e
+        if results is not None:
+            page = _page_for_player(results, pdga_number)
+        await _run_io(_mark_if_published, url, page["date"])
+        return page
+
+    pages.update(zip(missing, await asyncio.gather(*(index(u, htmls[u]) for u in missing))))
+    return {url: pages[url] for url in urls}
+
+
+def _rounds_or_none(page: dict | FetchError | ParseError, url: str):
+    if isinstance(page, Exception):
+        return None
+    try:
+        return _rounds_from_page(page, url)
+    except ParseError:
+        return None
+
+
+async def _streamed_rounds_cached_async(
+    href_link: str, pdga_number: str, force_refresh: bool = False, stale: set | None = None
+) -> tuple[list[int], int, str, bool]:
+    """
+    Streaming lookup of one player's rounds. It reads a single row, so it
+    can't build the tournament index, but it uses one another player's load
+    already built before falling back to its own per-player extract.
+    """
+    url  = _tournament_url(href_link)
+    kind = f"rounds/{pdga_number}"
+    if not force_refresh:
+        entries = await _run_io(
+            cache_mod.get_indexed_entries, [url], pdga_number, PARSER_VERSION, _max_stale(stale)
+        )
+        if url in entries:
+            cache_mod.record("hits")
+            if entries[url]["expired"]:
+                _served_stale(stale, [url])
+            return _rounds_from_page(entries[url]["page"], url)
+        entry = await _run_io(cache_mod.get_extract_entry, url, kind, PARSER_VERSION, _max_stale(stale))
+        if entry is not None:
+            cache_mod.record("hits")
+            if entry["expired"]:
+                _served_stale(stale, [url])
+            ratings, timestamp, date_str, is_league = entry["data"]
+            return ratings, timestamp, date_str, is_league
+
+    page, html = await _stream_tournament_page_async(url, pdga_number, force_refresh, stale)
+    result = _rounds_from_page(page, url)
+    if html is not None:
+        await _run_io(
+            cache_mod.set_extract, url, kind, cache_mod.content_hash(html), PARSER_VERSION, list(result)
+        )
+    return result
+
+
+async def load_player_data_async(
+    pdga_number:     str,
+    force_refresh:   bool = False,
+    max_concurrency: int  = MAX_CONCURRENCY,
+    stream:          bool = False,
+    stale_ok:        bool = False,
+) -> dict:
     """
     Fetch and parse everything needed to compute a player's projected rating.
+    Player pages and the schedule are fetched in one concurrent batch (a
+    cached schedule is read first, since it sets the detail and history
+    pages' expiry); tournament pages are fetched with at most
+    `max_concurrency` in flight and merged back in discovery order.
+    Everything goes through the parsed-extract cache, so a warm load
+    deserialises records instead of re-parsing HTML; tournament pages go
+    through the shared tournament index, so other players from the same
+    events are served without parsing them again.
+    stream=True reads tournament pages in early-exit streaming mode.
+    force_refresh=True goes to the network for every page, ignoring cache
+    freshness; pages with an ETag / Last-Modified are revalidated, so
+    unchanged ones cost a 304.
+    stale_ok=True (stale-while-revalidate) answers from cached pages expired
+    for at most MAX_STALE_SECS instead of waiting on the network, and starts
+    a normal load in the background to bring them up to date.
+    In OFFLINE mode cached pages are served however old and nothing is
+    refreshed.
+
     Returns a dict with keys:
-        pdga_number, current_rating, tournaments, new_tournaments, next_update
+        pdga_number, current_rating, tournaments, new_tournaments, next_update,
+        stale (urls served from expired entries; empty unless stale_ok),
+        refresh (Future of the background load's result, or None)
     """
-    pages            = fetch_player_pages(pdga_number, force_refresh)
-    ratings_schedule = scrape_ratings_schedule(force_refresh)
-
-    current_rating    = scrape_current_rating(pages["stats"], pages["history"])
-    tournaments       = scrape_detail_tournaments(pages["detail"])
-    tournaments_stats = scrape_stats_tournaments(pages["stats"])
+    stale = set() if stale_ok else None
+    urls  = _player_urls(pdga_number)
+    specs = [
+        (urls["stats"],   "stats",    _extract_stats,           pdga_number),
+        (urls["detail"],  "detail",   parse_detail_tournaments, pdga_number),
+        (urls["history"], "history",  _extract_history,         pdga_number),
+        (SCHEDULE_URL,    "schedule", parse_ratings_schedule,   None),
+    ]
+    # The detail and history pages expire at the next publication date (see
+    # ttl.py), so a cached schedule is read first, which needs no network.
+    # If it isn't cached it is fetched in the same batch as the player pages.
+    # Their freshness is then judged against the schedule already loaded, or
+    # the default TTL, and corrected once the schedule arrives: expiry is
+    # worked out when a page is read, not when it is stored.
+    schedule_lookup = await _extract_lookup_async(SCHEDULE_URL, "schedule", force_refresh, stale)
+    if schedule_lookup[0]:
+        ttl_mod.set_schedule(schedule_lookup[1])
+    player_lookups = await asyncio.gather(*(
+        _extract_lookup_async(url, kind, force_refresh, stale) for url, kind, _, _ in specs[:3]
+    ))
+    stats, tournaments, history, ratings_schedule = await _extract_finish_async(
+        specs, [*player_lookups, schedule_lookup], force_refresh
+    )
+    ttl_mod.set_schedule(ratings_schedule)
+    current_rating    = _current_rating_from_extracts(stats, history)
+    tournaments_stats = stats["tournaments"]
+    events            = [tuple(e) for e in stats["events"]]
 
     now         = int(datetime.now().timestamp())
     next_update = next(
@@ -315,17 +1098,40 @@ def load_player_data(pdga_number: str, force_refresh: bool = False) -> dict:
     if next_update is None:
         raise ParseError("Could not determine next ratings update date from schedule.")
 
-    known_links     = {t["link"] for t in tournaments}
-    new_raw         = [t for t in tournaments_stats if t.get("link") not in known_links]
+    known_links = {t["link"] for t in tournaments}
+    new_raw     = [t for t in tournaments_stats if t.get("link") not in known_links]
+
+    # A tournament can be found by both discovery paths; each distinct page
+    # is looked up (fetched, parsed) once and its rounds mapped back to both.
+    links  = [t["link"] for t in new_raw] + [link for link, _ in events]
+    unique = list(dict.fromkeys(links))
+    if stream:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def scrape_or_none(link: str) -> tuple[list[int], int, str, bool] | None:
+            async with semaphore:
+                try:
+                    return await _streamed_rounds_cached_async(link, pdga_number, force_refresh, stale)
+                except (FetchError, ParseError):
+                    return None
+
+        found   = dict(zip(unique, await asyncio.gather(*(scrape_or_none(link) for link in unique))))
+        scraped = [found[link] for link in links]
+    else:
+        urls    = [_tournament_url(link) for link in unique]
+        pages   = await _indexed_tournament_pages_async(
+            urls, pdga_number, force_refresh, max_concurrency, stale
+        )
+        found   = {link: _rounds_or_none(pages[url], url) for link, url in zip(unique, urls)}
+        scraped = [found[link] for link in links]
+    raw_results, event_results = scraped[:len(new_raw)], scraped[len(new_raw):]
+
     new_tournaments: list[dict] = []
 
-    for tournament in new_raw:
-        try:
-            ratings, timestamp, date_str, _ = scrape_tournament_rounds(
-                tournament["link"], pdga_number, force_refresh
-            )
-        except (FetchError, ParseError):
+    for tournament, res in zip(new_raw, raw_results):
+        if res is None:
             continue
+        ratings, timestamp, date_str, _ = res
         if not ratings:
             continue
         for i, rating in enumerate(ratings):
@@ -337,34 +1143,59 @@ def load_player_data(pdga_number: str, force_refresh: bool = False) -> dict:
                 "date":      date_str,
             })
 
-    for li_class in ["current-events", "recent-events"]:
-        li = pages["stats"].find("li", class_=li_class)
-        if not li:
+    for (_, name), res in zip(events, event_results):
+        if res is None:
             continue
-        for event in li.find_all("a"):
-            link = event["href"]
-            name = event.get_text(strip=True)
-            try:
-                ratings, timestamp, date_str, is_league = scrape_tournament_rounds(
-                    link, pdga_number, force_refresh
-                )
-            except (FetchError, ParseError):
-                continue
-            if is_league and timestamp >= next_update:
-                continue
-            for i, rating in enumerate(ratings):
-                new_tournaments.append({
-                    "name":      name,
-                    "rating":    rating,
-                    "timestamp": timestamp,
-                    "date":      date_str,
-                    "round":     i + 1,
-                })
+        ratings, timestamp, date_str, is_league = res
+        if is_league and timestamp >= next_update:
+            continue
+        for i, rating in enumerate(ratings):
+            new_tournaments.append({
+                "name":      name,
+                "rating":    rating,
+                "timestamp": timestamp,
+                "date":      date_str,
+                "round":     i + 1,
+            })
 
+    refresh = _refresh_in_background(pdga_number, max_concurrency, stream) if stale and not OFFLINE else None
     return {
         "pdga_number":     pdga_number,
         "current_rating":  current_rating,
         "tournaments":     tournaments,
         "new_tournaments": new_tournaments,
         "next_update":     next_update,
+        "stale":           sorted(stale or ()),
+        "refresh":         refresh,
     }
+
+
+def _refresh_in_background(pdga_number: str, max_concurrency: int, stream: bool) -> Future:
+    """
+    Start a normal (blocking-fetch) load of pdga_number on _REFRESH_POOL; its
+    requests queue behind interactive ones (scheduler.PREFETCH).
+    """
+    return _REFRESH_POOL.submit(
+        _as_prefetch, load_player_data, pdga_number, False, max_concurrency, stream
+    )
+
+
+def _as_prefetch(fn, *args):
+    token = _PRIORITY.set(scheduler.PREFETCH)
+    try:
+        return fn(*args)
+    finally:
+        _PRIORITY.reset(token)
+
+
+def load_player_data(
+    pdga_number:     str,
+    force_refresh:   bool = False,
+    max_concurrency: int  = MAX_CONCURRENCY,
+    stream:          bool = False,
+    stale_ok:        bool = False,
+) -> dict:
+    """Blocking wrapper around load_player_data_async (same arguments and result)."""
+    return asyncio.run(
+        load_player_data_async(pdga_number, force_refresh, max_concurrency, stream, stale_ok)
+    )
@@ -0,0 +1,119 @@
+"""
+transport.py
+------------
+Stand-ins for scraper.SESSION that record responses to, or replay them from,
+a fixture archive, so the whole pipeline can run (and be benchmarked)
+deterministically without pdga.com.
+
+  Recorder(session, path)   passes requests through to a real session and
+                            appends every response (URL, status, headers,
+                            body) to the archive.
+  Replayer(path, latency)   serves responses from the archive, after an
+                            optional injected delay; unknown URLs fail like
+                            an unreachable host, but aren't worth retrying.
+  Offline()                 refuses every request.
+
+The archive is gzip-compressed JSON lines, one response per line; a URL
+recorded twice keeps its latest response. All three return real
+requests.Response objects, so the scraper's status handling, streaming
+and conditional requests behave as they do live.
+"""
+
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Headers describing the wire encoding, which no longer applies to a stored
+# (decoded) body.
+_WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+_CONDITIONAL_HEADERS = {"if-none-match", "if-modified-since"}
+
+
+class Unavailable(requests.ConnectionError):
+    """A request the stand-in can never answer (not recorded, or offline): retrying won't help."""
+
+
+def _response(url: str, status: int, headers: dict, body: str) -> requests.Response:
+    response = requests.Response()
+    response.url         = url
+    response.status_code = status
+    response.reason      = "Not Modified" if status == 304 else ""
+    response.headers     = CaseInsensitiveDict(headers)
+    response.encoding    = "utf-8"
+    response._content    = body.encode("utf-8")
+    response._content_consumed = True   # iter_content() slices _content
+    return response
+
+
+def load_archive(path) -> dict[str, dict]:
+    """{url: {"status", "headers", "body"}} from an archive written by Recorder."""
+    archive = {}
+    path    = Path(path)
+    if not path.exists():
+        return archive
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            archive[entry.pop("url")] = entry
+    return archive
+
+
+class Recorder:
+    """Session wrapper that archives every response it passes through."""
+
+    def __init__(self, session: requests.Session, path):
+        self.session = session
+        self.path    = Path(path)
+        self._lock   = threading.Lock()
+
+    def get(self, url, timeout=None, headers=None, stream=False, **kwargs):
+        # Always ask for the full body: a 304 would record nothing to replay.
+        headers  = {k: v for k, v in (headers or {}).items() if k.lower() not in _CONDITIONAL_HEADERS}
+        response = self.session.get(url, timeout=timeout, headers=headers, **kwargs)
+        if response.encoding is None:
+            response.encoding = "utf-8"
+        entry = {
+            "url":     url,
+            "status":  response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS},
+            "body":    response.text,
+        }
+        with self._lock, gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return _response(url, entry["status"], entry["headers"], entry["body"])
+
+
+class Replayer:
+    """Session stand-in that serves recorded responses, `latency` seconds late."""
+
+    def __init__(self, path, latency: float = 0.0):
+        self.archive = load_archive(path)
+        self.latency = latency
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        entry = self.archive.get(url)
+        if entry is None:
+            raise Unavailable(f"{url} is not in the fixture archive")
+        headers  = CaseInsensitiveDict(headers or {})
+        recorded = CaseInsensitiveDict(entry["headers"])
+        if entry["status"] == 200 and (
+            (headers.get("If-None-Match") and headers.get("If-None-Match") == recorded.get("ETag"))
+            or (headers.get("If-Modified-Since")
+                and headers.get("If-Modified-Since") == recorded.get("Last-Modified"))
+        ):
+            return _response(url, 304, entry["headers"], "")
+        return _response(url, entry["status"], entry["headers"], entry["body"])
+
+
+class Offline:
+    """Session stand-in that refuses network access."""
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        raise Unavailable(f"offline: not fetching {url}")
@@ -0,0 +1,103 @@
+"""
+ttl.py
+------
+Expiry policy for cached pages, by URL class.
+
+PDGA pages change on very different clocks, so one fixed TTL either refetches
+stable pages all the time or serves volatile ones stale:
+
+  schedule          the "when updated" FAQ page; changes a few times a year.
+  player_stats      player overview (current events, unofficial rounds);
+                    changes whenever results are posted — default TTL.
+  player_details    rated rounds; only change when ratings are published.
+  player_history    rating history; only changes when ratings are published.
+  tournament        event results; unofficial ratings shift until published
+                    — default TTL.
+  published_event   a tournament page whose ratings are already published
+                    (assigned by the scraper once it knows the event date);
+                    effectively immutable.
+  other             anything else — default TTL.
+
+player_details and player_history expire at the next publication date in
+the ratings schedule rather than after a fixed duration. The schedule is fed
+in by the scraper (set_schedule); until it is known those classes fall back
+to the default TTL. A page fetched within PUBLICATION_WINDOW_SECS after a
+publication date also gets the default TTL, since PDGA publishes at some
+point during that day.
+"""
+
+import re
+import threading
+
+SCHEDULE_TTL_SECS        = 7 * 24 * 3600
+PUBLISHED_EVENT_TTL_SECS = 180 * 24 * 3600
+MAX_PUBLICATION_TTL_SECS = 45 * 24 * 3600  # cap if the schedule runs out / is stale
+PUBLICATION_WINDOW_SECS  = 2 * 24 * 3600   # publication timestamps are midnight, local time
+
+PUBLICATION_BOUND = frozenset({"player_details", "player_history"})
+
+# Matched on the path, so a stand-in server (scraper.set_base_url) classifies
+# the same as pdga.com.
+_CLASSES = [
+    ("schedule",       re.compile(r"^https?://[^/]+/faq/ratings/when-updated/?$")),
+    ("player_details", re.compile(r"^https?://[^/]+/player/\d+/details/?$")),
+    ("player_history", re.compile(r"^https?://[^/]+/player/\d+/history/?$")),
+    ("player_stats",   re.compile(r"^https?://[^/]+/player/\d+/?$")),
+    ("tournament",     re.compile(r"^https?://[^/]+/tour/event/\d+")),
+]
+
+_schedule_lock = threading.Lock()
+_schedule: list[tuple[int, int]] = []   # (deadline, publication), sorted by publication
+
+
+def classify(url: str) -> str:
+    """URL class used to pick an expiry rule (see module docstring)."""
+    for name, pattern in _CLASSES:
+        if pattern.match(url):
+            return name
+    return "other"
+
+
+def set_schedule(schedule: list[dict]) -> None:
+    """Feed in parse_ratings_schedule() output (deadline / publication timestamps)."""
+    entries = sorted(((d["deadline"], d["publication"]) for d in schedule), key=lambda e: e[1])
+    with _schedule_lock:
+        _schedule[:] = entries
+
+
+def next_publication(after: int) -> int | None:
+    """First known publication timestamp later than `after`, or None."""
+    with _schedule_lock:
+        return next((pub for _, pub in _schedule if pub > after), None)
+
+
+def event_published(event_timestamp: int, now: int) -> bool:
+    """
+    True once ratings covering an event on event_timestamp are out: some
+    update with a deadline on or after the event was published (and its
+    publication day has passed) by `now`.
+    """
+    with _schedule_lock:
+        return any(
+            deadline >= event_timestamp and pub + PUBLICATION_WINDOW_SECS <= now
+            for deadline, pub in _schedule
+        )
+
+
+def expires_at(url: str, fetched_at: int, default_ttl: int, url_class: str | None = None) -> int:
+    """
+    When a page of url fetched at fetched_at goes stale. url_class overrides
+    classify(url) (the scraper stores 'published_event' for settled events).
+    """
+    url_class = url_class or classify(url)
+    if url_class == "schedule":
+        return fetched_at + SCHEDULE_TTL_SECS
+    if url_class == "published_event":
+        return fetched_at + PUBLISHED_EVENT_TTL_SECS
+    if url_class in PUBLICATION_BOUND:
+        with _schedule_lock:
+            in_window = any(pub <= fetched_at < pub + PUBLICATION_WINDOW_SECS for _, pub in _schedule)
+        upcoming = next_publication(fetched_at)
+        if not in_window and upcoming is not None:
+            return min(upcoming, fetched_at + MAX_PUBLICATION_TTL_SECS)
+    return fetched_at + default_ttl
@@ -0,0 +1,34 @@
+"""
+conftest.py
+-----------
+Fixture archives for the network suites (test_scraper.py, test_history.py):
+
+    PDGA_RECORD=fixtures.jsonl.gz pytest tests/test_scraper.py   # save responses
+    PDGA_REPLAY=fixtures.jsonl.gz pytest tests/test_scraper.py   # run offline
+
+Replays run against a throwaway cache with the network cut off, so they
+see exactly the recorded pages. Without either variable nothing changes.
+"""
+
+import os
+
+import pytest
+
+from ratings_calculator import cache, scraper, transport
+
+
+@pytest.fixture(autouse=True, scope="session")
+def pdga_fixtures(tmp_path_factory):
+    record = os.environ.get("PDGA_RECORD")
+    replay = os.environ.get("PDGA_REPLAY")
+    if not (record or replay):
+        yield
+        return
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(cache, "DB_PATH", tmp_path_factory.mktemp("pdga") / "cache.db")
+        if record:
+            mp.setattr(scraper, "SESSION", transport.Recorder(scraper.SESSION, record))
+        else:
+            mp.setattr(scraper, "SESSION", transport.Replayer(replay))
+            mp.setattr(scraper, "OFFLINE", True)
+        yield
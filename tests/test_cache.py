@@ -0,0 +1,888 @@
+"""
+test_cache.py
+-------------
+Unit tests for the SQLite page cache and the scraper's use of it.
+Every test runs against a throwaway database and a fake HTTP session —
+no network, and ~/.pdga_ratings_cache.db is never touched.
+
+Run with: pytest tests/test_cache.py -v
+"""
+
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from ratings_calculator import cache, scheduler, scraper, ttl
+
+URL = "https://www.pdga.com/player/12345"
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "DB_PATH", tmp_path / "cache.db")
+    monkeypatch.setattr(cache, "_stats", {k: 0 for k in cache._stats})
+    monkeypatch.setattr(ttl, "_schedule", [])
+    monkeypatch.setattr(scheduler, "RATE_PER_SEC", 1000.0)
+    monkeypatch.setattr(scheduler, "BURST", 1000)
+    scheduler.reset()
+    return tmp_path / "cache.db"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int = 200, text: str = "", headers: dict | None = None):
+        self.status_code = status_code
+        self.text        = text
+        self.headers     = headers or {}
+        self.encoding    = "utf-8"
+        self.read        = 0  # characters handed out by iter_content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code), response=self)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for i in range(0, len(self.text), chunk_size):
+            self.read = i + chunk_size
+            yield self.text[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Records request headers and replays a queue of responses."""
+
+    def __init__(self, *responses: FakeResponse):
+        self.responses = list(responses)
+        self.requests: list[dict] = []
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def expire(url: str) -> None:
+    """Age url past the TTL behind the cache's back (as another process would)."""
+    with sqlite3.connect(cache.DB_PATH) as conn:
+        conn.execute(
+            "UPDATE page_cache SET fetched_at = ? WHERE url = ?",
+            (int(time.time()) - cache.CACHE_TTL_SECS - 60, url),
+        )
+    cache._memory_discard()
+
+
+# ---------------------------------------------------------------------------
+# Basic get / set
+# ---------------------------------------------------------------------------
+
+class TestGetSet:
+    def test_roundtrip(self):
+        cache.set(URL, "<html>hi</html>")
+        assert cache.get(URL) == "<html>hi</html>"
+
+    def test_expired_entry_is_a_miss_but_kept(self):
+        cache.set(URL, "<html>old</html>", etag='"v1"')
+        expire(URL)
+        assert cache.get(URL) is None
+        entry = cache.get_entry(URL)
+        assert entry["expired"] is True
+        assert entry["etag"] == '"v1"'
+
+    def test_touch_refreshes_timestamp(self):
+        cache.set(URL, "<html>old</html>")
+        expire(URL)
+        cache.touch(URL)
+        assert cache.get(URL) == "<html>old</html>"
+
+    def test_migrates_original_schema(self, tmp_cache):
+        with sqlite3.connect(tmp_cache) as conn:
+            conn.execute(
+                "CREATE TABLE page_cache (url TEXT PRIMARY KEY, html TEXT NOT NULL, "
+                "fetched_at INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "INSERT INTO page_cache VALUES (?, ?, ?)", (URL, "<html/>", int(time.time()))
+            )
+        assert cache.get(URL) == "<html/>"
+        assert cache.get_entry(URL)["etag"] is None
+
+    def test_migration_tags_player_pages_on_any_host(self, tmp_cache):
+        local = "http://127.0.0.1:8765/player/12345/details"
+        with sqlite3.connect(tmp_cache) as conn:
+            conn.execute(
+                "CREATE TABLE page_cache (url TEXT PRIMARY KEY, html TEXT NOT NULL, "
+                "fetched_at INTEGER NOT NULL)"
+            )
+            conn.executemany(
+                "INSERT INTO page_cache VALUES (?, ?, ?)",
+                [(u, "<html/>", int(time.time())) for u in (URL, local, "http://127.0.0.1:8765/tour/event/1")],
+            )
+        cache.invalidate_player("12345")
+        assert cache.get(URL) is None
+        assert cache.get(local) is None
+        assert cache.get("http://127.0.0.1:8765/tour/event/1") == "<html/>"
+
+
+class TestBatch:
+    URLS = [f"https://www.pdga.com/tour/event/{i}" for i in range(3)]
+
+    def test_set_many_get_many_roundtrip(self):
+        cache.set_many([(self.URLS[0], "<a/>"), (self.URLS[1], "<b/>", '"v1"', None)])
+        assert cache.get_many(self.URLS) == {self.URLS[0]: "<a/>", self.URLS[1]: "<b/>"}
+        assert cache.get_entry(self.URLS[1])["etag"] == '"v1"'
+        assert cache.stats()["hits"] == 2
+
+    def test_get_many_skips_expired(self):
+        cache.set_many([(u, "<x/>") for u in self.URLS])
+        expire(self.URLS[0])
+        assert sorted(cache.get_many(self.URLS)) == self.URLS[1:]
+        assert cache.get_entries(self.URLS)[self.URLS[0]]["expired"] is True
+
+    def test_large_batches_are_split(self, monkeypatch):
+        monkeypatch.setattr(cache, "SQL_BATCH_SIZE", 2)
+        urls = [f"https://www.pdga.com/tour/event/{i}" for i in range(7)]
+        cache.set_many([(u, u) for u in urls])
+        assert cache.get_many(urls + urls[:2]) == {u: u for u in urls}
+
+    def test_fetch_many_only_downloads_stale(self, monkeypatch):
+        cache.set(self.URLS[0], "<cached/>")
+        session = FakeSession(FakeResponse(200, "<one/>"), FakeResponse(200, "<two/>"))
+        monkeypatch.setattr(scraper, "SESSION", session)
+
+        htmls = asyncio.run(scraper.fetch_many_html_async(self.URLS, max_concurrency=1))
+        assert htmls == {
+            self.URLS[0]: "<cached/>", self.URLS[1]: "<one/>", self.URLS[2]: "<two/>",
+        }
+        assert len(session.requests) == 2
+        assert cache.get_many(self.URLS) == htmls
+
+    def test_fetch_many_failure(self, monkeypatch):
+        monkeypatch.setattr(scraper, "RETRY_BACKOFF", 0)
+        monkeypatch.setattr(
+            scraper, "SESSION",
+            FakeSession(FakeResponse(200, "<one/>"), *[FakeResponse(500)] * scraper.MAX_RETRIES),
+        )
+        htmls = asyncio.run(scraper.fetch_many_html_async(
+            self.URLS[:2], max_concurrency=1, return_exceptions=True
+        ))
+        assert htmls[self.URLS[0]] == "<one/>"
+        assert isinstance(htmls[self.URLS[1]], scraper.FetchError)
+        assert cache.get(self.URLS[0]) == "<one/>"
+
+
+class TestConnections:
+    def test_connection_reused_within_thread(self):
+        assert cache._connect() is cache._connect()
+        assert cache._connect().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_threads_get_their_own_connection(self):
+        cache.set(URL, "<html>hi</html>")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            conns = list(pool.map(lambda _: id(cache._connect()), range(4)))
+            assert list(pool.map(lambda _: cache.get(URL), range(8))) == ["<html>hi</html>"] * 8
+        assert id(cache._connect()) not in conns
+
+    def test_switching_db_path_reconnects(self, tmp_path, monkeypatch):
+        cache.set(URL, "<html>a</html>")
+        monkeypatch.setattr(cache, "DB_PATH", tmp_path / "other.db")
+        assert cache.get(URL) is None
+
+
+# ---------------------------------------------------------------------------
+# Conditional revalidation in fetch_html
+# ---------------------------------------------------------------------------
+
+class TestRevalidation:
+    def test_304_reuses_cached_html(self, monkeypatch):
+        cache.set(URL, "<html>cached</html>", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        expire(URL)
+        session = FakeSession(FakeResponse(304))
+        monkeypatch.setattr(scraper, "SESSION", session)
+
+        assert scraper.fetch_html(URL) == "<html>cached</html>"
+        assert session.requests[0]["If-None-Match"] == '"v1"'
+        assert session.requests[0]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert cache.get_entry(URL)["expired"] is False
+        assert cache.stats()["revalidated"] == 1
+
+    def test_200_replaces_entry_and_validators(self, monkeypatch):
+        cache.set(URL, "<html>old</html>", etag='"v1"')
+        expire(URL)
+        session = FakeSession(FakeResponse(200, "<html>new</html>", {"ETag": '"v2"'}))
+        monkeypatch.setattr(scraper, "SESSION", session)
+
+        assert scraper.fetch_html(URL) == "<html>new</html>"
+        assert cache.get_entry(URL)["etag"] == '"v2"'
+        assert cache.stats()["full_fetches"] == 1
+
+    def test_fresh_entry_is_a_hit(self, monkeypatch):
+        cache.set(URL, "<html>cached</html>")
+        session = FakeSession()
+        monkeypatch.setattr(scraper, "SESSION", session)
+
+        assert scraper.fetch_html(URL) == "<html>cached</html>"
+        assert session.requests == []
+        assert cache.cache_stats()["stats"]["hits"] == 1
+
+    def test_force_refresh_still_revalidates(self, monkeypatch):
+        cache.set(URL, "<html>cached</html>", etag='"v1"')
+        session = FakeSession(FakeResponse(304))
+        monkeypatch.setattr(scraper, "SESSION", session)
+
+        assert scraper.fetch_html(URL, force_refresh=True) == "<html>cached</html>"
+        assert session.requests[0]["If-None-Match"] == '"v1"'
+
+
+# ---------------------------------------------------------------------------
+# Parsed-extract cache
+# ---------------------------------------------------------------------------
+
+class TestExtractCache:
+    def _store(self, html: str, data, version: int = 1) -> None:
+        cache.set(URL, html)
+        cache.set_extract(URL, "stats", cache.content_hash(html), version, data)
+
+    def test_served_while_page_unchanged(self):
+        self._store("<html>a</html>", {"rating": 950, "events": [["/x", "X"]]})
+        assert cache.get_extract(URL, "stats", 1) == {"rating": 950, "events": [["/x", "X"]]}
+
+    def test_page_content_change_invalidates(self):
+        self._store("<html>a</html>", {"rating": 950})
+        cache.set(URL, "<html>b</html>")
+        assert cache.get_extract(URL, "stats", 1) is None
+
+    def test_parser_version_change_invalidates(self):
+        self._store("<html>a</html>", {"rating": 950})
+        assert cache.get_extract(URL, "stats", 2) is None
+
+    def test_expired_page_invalidates(self):
+        self._store("<html>a</html>", {"rating": 950})
+        expire(URL)
+        assert cache.get_extract(URL, "stats", 1) is None
+
+    def test_warm_extract_skips_parsing(self, monkeypatch):
+        calls = []
+
+        def extractor(html):
+            calls.append(html)
+            return {"n": len(html)}
+
+        cache.set(URL, "<html>abc</html>")
+        first  = asyncio.run(scraper._extract_async(URL, "test", extractor))
+        second = asyncio.run(scraper._extract_async(URL, "test", extractor))
+        assert first == second == {"n": len("<html>abc</html>")}
+        assert len(calls) == 1
+
+    def test_extract_from_other_parser_version_is_a_miss(self, monkeypatch):
+        html = "<html>abc</html>"
+        cache.set(URL, html)
+        cache.set_extract(URL, "test", cache.content_hash(html), scraper.PARSER_VERSION - 1, {"n": 0})
+        assert asyncio.run(scraper._extract_async(URL, "test", lambda h: {"n": len(h)})) == {"n": len(html)}
+        assert cache.get_extract(URL, "test", scraper.PARSER_VERSION) == {"n": len(html)}
+        assert cache.stats()["extract_misses"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Streaming (early-exit) tournament lookups
+# ---------------------------------------------------------------------------
+
+def _results_page(n_players: int, target_index: int) -> str:
+    rows = "".join(
+        f"<tr><td class='pdga-number'>{'150375' if i == target_index else 1000 + i}</td>"
+        f"<td class='round-rating'>{900 + i % 50}</td></tr>"
+        for i in range(n_players)
+    )
+    return (
+        "<html><body><h4>Open</h4><li class='tournament-date'>Date: 01-Jun-2026</li>"
+        f"<table>{rows}</table></body></html>"
+    )
+
+
+class TestStreaming:
+    EVENT = "/tour/event/90000"
+    URL   = "https://www.pdga.com/tour/event/90000"
+
+    def test_stops_early_and_skips_caching_partial_body(self, monkeypatch):
+        response = FakeResponse(200, _results_page(2000, 5))
+        monkeypatch.setattr(scraper, "SESSION", FakeSession(response))
+
+        ratings, *_ = scraper.scrape_tournament_rounds(self.EVENT, "150375", stream=True)
+        assert ratings == [905]
+        assert response.read < len(response.text) // 4
+        assert cache.get_entry(self.URL) is None
+        assert cache.stats()["early_exits"] == 1
+
+    def test_early_exit_result_is_cached_per_player(self, monkeypatch):
+        session = FakeSession(FakeResponse(200, _results_page(2000, 5), {"ETag": '"v1"'}))
+        monkeypatch.setattr(scraper, "SESSION", session)
+
+        for _ in range(3):
+            assert scraper.scrape_tournament_rounds(self.EVENT, "150375", stream=True)[0] == [905]
+        assert len(session.requests) == 1
+        assert cache.get_streamed_page(self.URL, "150375", scraper.PARSER_VERSION)["etag"] == '"v1"'
+
+    def test_expired_early_exit_result_is_revalidated(self, monkeypatch):
+        session = FakeSession(
+            FakeResponse(200, _results_page(2000, 5), {"ETag": '"v1"'}), FakeResponse(304),
+        )
+        monkeypatch.setattr(scraper, "SESSION", session)
+        scraper.scrape_tournament_rounds(self.EVENT, "150375", stream=True)
+        with sqlite3.connect(cache.DB_PATH) as conn:
+            conn.execute("UPDATE streamed_pages SET fetched_at = 0")
+
+        assert scraper.scrape_tournament_rounds(self.EVENT, "150375", stream=True)[0] == [905]
+        assert session.requests[1] == {"If-None-Match": '"v1"'}
+        assert cache.stats()["revalidated"] == 1
+        assert cache.get_streamed_page(self.URL, "150375", scraper.PARSER_VERSION)["expired"] is False
+
+    def test_complete_body_is_cached(self, monkeypatch):
+        html = _results_page(50, 49)
+        monkeypatch.setattr(scraper, "SESSION", FakeSession(FakeResponse(200, html)))
+
+        streamed = scraper.scrape_tournament_rounds(self.EVENT, "9999999", stream=True)
+        assert streamed[0] == []
+        assert cache.get(self.URL) == html
+        assert scraper.scrape_tournament_rounds(self.EVENT, "150375", stream=True)[0] == [949]
+
+
+# ---------------------------------------------------------------------------
+# Tournament index shared across players
+# ---------------------------------------------------------------------------
+
+class TestTournamentIndex:
+    URL = "https://www.pdga.com/tour/event/90001"
+
+    def _load(self, pdga_number: str):
+        pages = asyncio.run(scraper._indexed_tournament_pages_async([self.URL], pdga_number))
+        return scraper._rounds_from_page(pages[self.URL], self.URL)
+
+    def test_roster_parses_event_once(self, monkeypatch):
+        calls = []
+        real  = scraper.parse_tournament_results
+
+        def counting(html, url=""):
+            calls.append(url)
+            return real(html, url)
+
+        cache.set(self.URL, _results_page(20, 5))
+        monkeypatch.setattr(scraper, "parse_tournament_results", counting)
+
+        assert self._load("150375")[0] == [905]
+        assert self._load("1000")[0] == [900]
+        assert self._load("1019")[0] == [919]
+        assert self._load("424242")[0] == []
+        assert len(calls) == 1
+        assert cache.stats()["index_hits"] == 3
+
+    def test_page_change_reindexes(self):
+        cache.set(self.URL, _results_page(3, 0))
+        assert self._load("150375")[0] == [900]
+        cache.set(self.URL, _results_page(3, 2))
+        assert cache.get_indexed_page(self.URL, "150375", scraper.PARSER_VERSION) is None
+        assert self._load("150375")[0] == [902]
+        assert self._load("1000")[0] == [900]
+
+    def test_parser_version_and_expiry_invalidate(self):
+        cache.set(self.URL, _results_page(3, 0))
+        self._load("150375")
+        assert cache.get_indexed_page(self.URL, "1001", scraper.PARSER_VERSION)["ratings"] == ["901"]
+        assert cache.get_indexed_page(self.URL, "1001", scraper.PARSER_VERSION + 1) is None
+        expire(self.URL)
+        assert cache.get_indexed_page(self.URL, "1001", scraper.PARSER_VERSION) is None
+
+
+# ---------------------------------------------------------------------------
+# Negative cache
+# ---------------------------------------------------------------------------
+
+class TestNegativeCache:
+    EVENT = "https://www.pdga.com/tour/event/90001"
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        monkeypatch.setattr(scraper, "RETRY_BACKOFF", 0)
+
+    def test_404_not_retried_then_skipped(self, monkeypatch):
+        session = FakeSession(FakeResponse(404))
+        monkeypatch.setattr(scraper, "SESSION", session)
+        with pytest.raises(scraper.FetchError, match="after 1 attempt:"):
+            scraper.fetch_html(URL)
+        with pytest.raises(scraper.FetchError, match="failed recently"):
+            scraper.fetch_html(URL)
+        assert len(session.requests) == 1
+        assert cache.stats()["negative_hits"] == 1
+        assert cache.cache_stats()["negative"][0]["url"] == URL
+
+    def test_persistent_5xx_cached_but_not_connection_errors(self, monkeypatch):
+        class DownSession(FakeSession):
+            def get(self, url, timeout=None, headers=None, **kwargs):
+                raise requests.ConnectionError("offline")
+
+        monkeypatch.setattr(scraper, "SESSION", FakeSession(*[FakeResponse(503)] * scraper.MAX_RETRIES))
+        with pytest.raises(scraper.FetchError):
+            scraper.fetch_html(URL)
+        assert cache.get_negative(URL)["kind"] == "fetch"
+
+        monkeypatch.setattr(scraper, "SESSION", DownSession())
+        with pytest.raises(scraper.FetchError):
+            scraper.fetch_html(self.EVENT)
+        assert cache.get_negative(self.EVENT) is None
+
+    def test_force_refresh_retries_and_success_clears(self, monkeypatch):
+        cache.set_negative(URL, "fetch", "Failed to fetch: 404")
+        monkeypatch.setattr(scraper, "SESSION", FakeSession(FakeResponse(200, "<html/>")))
+        assert scraper.fetch_html(URL, force_refresh=True) == "<html/>"
+        assert cache.get_negative(URL) is None
+
+    def test_entries_expire(self, monkeypatch):
+        cache.set_negative(URL, "fetch", "Failed to fetch: 404")
+        with sqlite3.connect(cache.DB_PATH) as conn:
+            conn.execute("UPDATE negative_cache SET failed_at = failed_at - ?", (cache.NEGATIVE_TTL_SECS + 1,))
+        assert cache.get_negative(URL) is None
+        cache.maintain()
+        assert cache.cache_stats()["negative"] == []
+
+    def test_batch_fetch_skips_failed_urls(self, monkeypatch):
+        cache.set_negative(URL, "fetch", "Failed to fetch: 404")
+        session = FakeSession(FakeResponse(200, "<html/>"))
+        monkeypatch.setattr(scraper, "SESSION", session)
+        htmls = asyncio.run(scraper.fetch_many_html_async([URL, self.EVENT], return_exceptions=True))
+        assert isinstance(htmls[URL], scraper.FetchError)
+        assert htmls[self.EVENT] == "<html/>"
+        assert len(session.requests) == 1
+
+    def test_unparseable_tournament_page_skipped(self, monkeypatch):
+        calls = []
+
+        def broken(html, url=""):
+            calls.append(url)
+            raise scraper.ParseError(f"Could not parse tournament page {url}")
+
+        cache.set(self.EVENT, "<html/>")
+        monkeypatch.setattr(scraper, "parse_tournament_results", broken)
+        for _ in range(2):
+            pages = asyncio.run(scraper._indexed_tournament_pages_async([self.EVENT], "150375"))
+            assert isinstance(pages[self.EVENT], scraper.ParseError)
+        assert calls == [self.EVENT]
+
+    def test_parse_failure_doesnt_block_fetch(self, monkeypatch):
+        cache.set(URL, "<html/>")
+        expire(URL)
+        cache.set_negative(URL, "parse", "Could not parse")
+        monkeypatch.setattr(scraper, "SESSION", FakeSession(FakeResponse(304)))
+        assert scraper.fetch_html(URL) == "<html/>"
+        with pytest.raises(scraper.ParseError):
+            asyncio.run(scraper._extract_async(URL, "len", len))
+
+
+# ---------------------------------------------------------------------------
+# Stale-while-revalidate
+# ---------------------------------------------------------------------------
+
+class TestStaleWhileRevalidate:
+    def _age(self, seconds: int) -> None:
+        _set_column(URL, "fetched_at", int(time.time()) - cache.CACHE_TTL_SECS - seconds)
+
+    def _extract(self, stale):
+        return asyncio.run(scraper._extract_async(URL, "len", len, stale=stale))
+
+    def test_extract_entry_within_bound(self):
+        cache.set(URL, "<html/>")
+        cache.set_extract(URL, "len", cache.content_hash("<html/>"), scraper.PARSER_VERSION, 7)
+        self._age(60)
+        assert cache.get_extract(URL, "len", scraper.PARSER_VERSION) is None
+        entry = cache.get_extract_entry(URL, "len", scraper.PARSER_VERSION, max_stale=3600)
+        assert entry == {"data": 7, "expired": True}
+        assert cache.get_extract_entry(URL, "len", scraper.PARSER_VERSION, max_stale=30) is None
+
+    def test_stale_extract_served_without_network(self, monkeypatch):
+        monkeypatch.setattr(scraper, "SESSION", FakeSession())   # any request would fail
+        cache.set(URL, "<html/>")
+        cache.set_extract(URL, "len", cache.content_hash("<html/>"), scraper.PARSER_VERSION, 7)
+        self._age(60)
+        stale = set()
+        assert self._extract(stale) == 7
+        assert stale == {URL}
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_stale_page_parsed_without_network(self, monkeypatch):
+        monkeypatch.setattr(scraper, "SESSION", FakeSession())
+        cache.set(URL, "<html/>")
+        self._age(60)
+        stale = set()
+        assert self._extract(stale) == len("<html/>")
+        assert stale == {URL}
+
+    def test_too_stale_blocks_on_fetch(self, monkeypatch):
+        session = FakeSession(FakeResponse(200, "<new/>"))
+        monkeypatch.setattr(scraper, "SESSION", session)
+        cache.set(URL, "<html/>")
+        cache.set_extract(URL, "len", cache.content_hash("<html/>"), scraper.PARSER_VERSION, 7)
+        self._age(scraper.MAX_STALE_SECS + 60)
+        stale = set()
+        assert self._extract(stale) == len("<new/>")
+        assert stale == set()
+        assert len(session.requests) == 1
+
+    def test_stale_index_entries(self):
+        url = "https://www.pdga.com/tour/event/90001"
+        cache.set(url, _results_page(3, 0))
+        asyncio.run(scraper._indexed_tournament_pages_async([url], "150375"))
+        _set_column(url, "fetched_at", int(time.time()) - cache.CACHE_TTL_SECS - 60)
+        stale = set()
+        pages = asyncio.run(scraper._indexed_tournament_pages_async([url], "1001", stale=stale))
+        assert pages[url]["ratings"] == ["901"]
+        assert stale == {url}
+
+    def test_refresh_runs_normal_load(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(scraper, "load_player_data", lambda *args: calls.append(args) or "fresh")
+        assert scraper._refresh_in_background("12345", 4, False).result() == "fresh"
+        assert calls == [("12345", False, 4, False)]
+
+
+# ---------------------------------------------------------------------------
+# Per-player invalidation
+# ---------------------------------------------------------------------------
+
+class TestPlayerInvalidation:
+    OTHER = "https://www.pdga.com/player/123456"
+    EVENT = "https://www.pdga.com/tour/event/12345"
+
+    def test_drops_only_tagged_pages(self):
+        cache.set_many([
+            (URL, "<a/>"), (URL + "/details", "<b/>"), (self.OTHER, "<c/>"), (self.EVENT, "<d/>"),
+        ])
+        cache.set_extract(URL, "stats", cache.content_hash("<a/>"), 1, {})
+        cache.tag_player("12345", [URL, URL + "/details"])
+        cache.tag_player("123456", [self.OTHER])
+        cache.invalidate_player("12345")
+        assert cache.get_many([URL, URL + "/details", self.OTHER, self.EVENT]) == {
+            self.OTHER: "<c/>", self.EVENT: "<d/>",
+        }
+        assert cache.get_extract(URL, "stats", 1) is None
+        with sqlite3.connect(cache.DB_PATH) as conn:
+            assert conn.execute("SELECT pdga_number, url FROM player_pages").fetchall() == [
+                ("123456", self.OTHER),
+            ]
+
+    def test_drops_streamed_rounds(self):
+        page = {"has_body": True, "is_league": False, "date": "01-Oct-2026", "ratings": ["900"]}
+        cache.set(self.EVENT, "<html/>")
+        for number in ("12345", "123456"):
+            cache.set_streamed_page(self.EVENT, number, 1, page, '"v1"')
+            cache.set_extract(self.EVENT, f"rounds/{number}", cache.content_hash("<html/>"), 1, [[900]])
+        assert cache.get_extract(self.EVENT, "rounds/12345", 1) == [[900]]   # now in the memory tier
+        cache.invalidate_player("12345")
+        assert cache.get_streamed_page(self.EVENT, "12345", 1) is None
+        assert cache.get_extract(self.EVENT, "rounds/12345", 1) is None
+        assert cache.get_streamed_page(self.EVENT, "123456", 1)["page"] == page
+        assert cache.get_extract(self.EVENT, "rounds/123456", 1) == [[900]]
+        assert cache.get(self.EVENT) == "<html/>"
+
+    def test_uses_index(self):
+        conn = cache._connect()
+        for query in (
+            "SELECT url FROM player_pages WHERE pdga_number = ?",
+            "DELETE FROM streamed_pages WHERE pdga_number = ?",
+            "DELETE FROM extract_cache WHERE kind = ?",
+        ):
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {query}", ("1",)).fetchall()
+            assert plan[0][-1].startswith("SEARCH"), query
+
+    def test_legacy_pages_tagged_on_upgrade(self, tmp_cache):
+        with sqlite3.connect(tmp_cache) as conn:
+            conn.execute(
+                "CREATE TABLE page_cache (url TEXT PRIMARY KEY, html TEXT NOT NULL, "
+                "fetched_at INTEGER NOT NULL)"
+            )
+            conn.executemany(
+                "INSERT INTO page_cache VALUES (?, ?, ?)",
+                [(url, "<html/>", int(time.time())) for url in (URL + "/history", self.OTHER, self.EVENT)],
+            )
+        cache.invalidate_player("12345")
+        assert cache.get_many([URL + "/history", self.OTHER, self.EVENT]) == {
+            self.OTHER: "<html/>", self.EVENT: "<html/>",
+        }
+
+    def test_loader_tags_player_pages(self, monkeypatch):
+        monkeypatch.setattr(scraper, "SESSION", FakeSession(*[FakeResponse(200, "<html/>")] * 3))
+        asyncio.run(scraper.fetch_player_pages_async("12345"))
+        with sqlite3.connect(cache.DB_PATH) as conn:
+            tagged = {url for url, in conn.execute("SELECT url FROM player_pages WHERE pdga_number = '12345'")}
+        assert tagged == set(scraper._player_urls("12345").values())
+
+
+# ---------------------------------------------------------------------------
+# Per-URL-class expiry
+# ---------------------------------------------------------------------------
+
+class TestTtlPolicy:
+    DETAILS = "https://www.pdga.com/player/12345/details"
+    EVENT   = "https://www.pdga.com/tour/event/90001"
+
+    def _schedule(self, publication: int, deadline: int = 0):
+        ttl.set_schedule([{"deadline": deadline, "publication": publication}])
+
+    def test_details_fresh_until_next_publication(self):
+        self._schedule(int(time.time()) + 10 * 24 * 3600)
+        cache.set(self.DETAILS, "<html/>")
+        expire(self.DETAILS)   # past the default TTL
+        assert cache.get(self.DETAILS) == "<html/>"
+        cache.set(URL, "<html/>")
+        expire(URL)
+        assert cache.get(URL) is None
+
+    def test_published_event_kept_until_content_changes(self):
+        cache.set(self.EVENT, _results_page(3, 0))
+        cache.set_ttl_class(self.EVENT, "published_event")
+        expire(self.EVENT)
+        assert cache.get(self.EVENT) is not None
+        assert cache.cache_info()[0]["ttl_class"] == "published_event"
+        cache.set(self.EVENT, _results_page(3, 0))   # same content: keeps its class
+        expire(self.EVENT)
+        assert cache.get(self.EVENT) is not None
+        cache.set(self.EVENT, _results_page(3, 1))
+        expire(self.EVENT)
+        assert cache.get(self.EVENT) is None
+
+    def test_memory_tier_keeps_class_of_unchanged_content(self):
+        cache.set(self.EVENT, _results_page(3, 0))
+        cache.set_ttl_class(self.EVENT, "published_event")
+        cache.set(self.EVENT, _results_page(3, 0))   # answered from the memory tier from here
+        in_memory = cache.get_entry(self.EVENT)["expires_at"]
+        cache._memory_discard()
+        assert in_memory == cache.get_entry(self.EVENT)["expires_at"]   # SQLite's answer
+        cache.set(self.EVENT, _results_page(3, 1))
+        assert cache._memory_get(self.EVENT)["ttl_class"] is None
+
+    def test_indexing_marks_published_events(self):
+        now = int(time.time())
+        cache.set(self.EVENT, _results_page(3, 0))   # dated 01-Jun-2026
+        self._schedule(now - 30 * 24 * 3600, deadline=scraper.parse_pdga_date("01-Jun-2026"))
+        asyncio.run(scraper._indexed_tournament_pages_async([self.EVENT], "150375"))
+        expire(self.EVENT)
+        assert cache.get_indexed_page(self.EVENT, "150375", scraper.PARSER_VERSION)["ratings"] == ["900"]
+
+    def test_purge_respects_class(self):
+        cache.set(self.EVENT, "<html/>")
+        cache.set_ttl_class(self.EVENT, "published_event")
+        cache.set(URL, "<html/>")
+        for url in (self.EVENT, URL):
+            _set_column(url, "fetched_at", int(time.time()) - 30 * 24 * 3600)
+        assert cache.maintain()["purged"] == 1
+        assert cache.get(self.EVENT) == "<html/>"
+
+
+# ---------------------------------------------------------------------------
+# Size bounds: purge, LRU eviction, compaction
+# ---------------------------------------------------------------------------
+
+def _set_column(url: str, column: str, value) -> None:
+    with sqlite3.connect(cache.DB_PATH) as conn:
+        conn.execute(f"UPDATE page_cache SET {column} = ? WHERE url = ?", (value, url))
+    cache._memory_discard()
+
+
+class TestSizeBounds:
+    URLS = [f"https://www.pdga.com/tour/event/{i}" for i in range(5)]
+
+    def _fill(self):
+        now = int(time.time())
+        for age, url in enumerate(reversed(self.URLS)):   # URLS[0] is the oldest
+            cache.set(url, f"<html>{url}</html>")
+            _set_column(url, "last_access", now - 1000 * (age + 1))
+
+    def test_lru_eviction_to_row_cap(self, monkeypatch):
+        monkeypatch.setattr(cache, "MAX_ROWS", 3)
+        self._fill()
+        cache.get(self.URLS[0])  # most recently used now
+        assert cache.maintain()["evicted"] == 2
+        assert sorted(cache.get_many(self.URLS)) == sorted([self.URLS[0], *self.URLS[3:]])
+        assert cache.stats()["evicted"] == 2
+
+    def test_eviction_to_byte_cap(self, monkeypatch):
+        self._fill()
+        size = cache.cache_stats()["size"]["bytes"]
+        monkeypatch.setattr(cache, "MAX_BYTES", size - 1)
+        assert cache.maintain()["evicted"] == 1
+        assert cache.get(self.URLS[0]) is None
+
+    def test_expired_rows_purged_after_grace(self):
+        self._fill()
+        expire(self.URLS[1])
+        _set_column(self.URLS[0], "fetched_at", 0)
+        assert cache.maintain()["purged"] == 1
+        assert cache.get_entry(self.URLS[0]) is None
+        assert cache.get_entry(self.URLS[1])["expired"] is True   # kept for revalidation
+
+    def test_dependent_rows_dropped_with_page(self, monkeypatch):
+        monkeypatch.setattr(cache, "MAX_ROWS", 1)
+        self._fill()
+        cache.set_extract(self.URLS[0], "stats", cache.content_hash("x"), 1, {})
+        cache.index_tournament(self.URLS[0], "h", 1, {
+            "has_body": True, "is_league": False, "date": None, "players": {"1": ["900"]},
+        })
+        cache.tag_player("1", [self.URLS[0]])
+        cache.maintain()
+        with sqlite3.connect(cache.DB_PATH) as conn:
+            for table in ("extract_cache", "tournament_index", "tournament_rounds", "player_pages"):
+                assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+
+    def test_new_database_uses_incremental_vacuum(self):
+        cache.set(URL, "<html/>")
+        assert cache._connect().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def test_legacy_database_converted(self, tmp_cache):
+        with sqlite3.connect(tmp_cache) as conn:
+            conn.execute(
+                "CREATE TABLE page_cache (url TEXT PRIMARY KEY, html TEXT NOT NULL, "
+                "fetched_at INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT INTO page_cache VALUES (?, ?, ?)", (URL, "<html/>", int(time.time())))
+        assert cache.cache_stats()["size"]["bytes"] == len("<html/>")
+        assert cache.maintain()["compacted"] is True
+        assert cache._connect().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert cache.get(URL) == "<html/>"
+
+    def test_background_pass_after_writes(self, monkeypatch):
+        monkeypatch.setattr(cache, "MAX_ROWS", 2)
+        monkeypatch.setattr(cache, "MAINTENANCE_EVERY", 5)
+        cache.set_many([(url, "<html/>") for url in self.URLS])
+        deadline = time.time() + 5
+        while cache.stats()["evicted"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert cache.cache_stats()["size"]["rows"] == 2
+
+
+# ---------------------------------------------------------------------------
+# Compressed page storage
+# ---------------------------------------------------------------------------
+
+class TestCompression:
+    HTML = "<html><body>" + "<tr><td class='pdga-number'>150375</td></tr>" * 200 + "</body></html>"
+
+    def _stored(self):
+        with sqlite3.connect(cache.DB_PATH) as conn:
+            return conn.execute(
+                "SELECT html, codec, size FROM page_cache WHERE url = ?", (URL,)
+            ).fetchone()
+
+    @pytest.mark.parametrize("codec", ["zlib", "raw", "zstd"])
+    def test_roundtrip(self, monkeypatch, codec):
+        if codec == "zstd":
+            pytest.importorskip("zstandard")
+        monkeypatch.setattr(cache, "CODEC", codec)
+        cache.set(URL, self.HTML, etag='"v1"')
+        assert cache.get(URL) == self.HTML
+        stored, stored_codec, size = self._stored()
+        assert stored_codec == codec
+        if codec == "raw":
+            assert stored == self.HTML and size == len(self.HTML)
+        else:
+            assert isinstance(stored, bytes) and size == len(stored) < len(self.HTML) // 10
+
+    def test_content_hash_is_of_uncompressed_html(self, monkeypatch):
+        monkeypatch.setattr(cache, "CODEC", "zlib")
+        cache.set(URL, self.HTML)
+        cache.set_extract(URL, "stats", cache.content_hash(self.HTML), 1, {"ok": True})
+        assert cache.get_extract(URL, "stats", 1) == {"ok": True}
+
+    def test_codec_change_needs_no_migration(self, monkeypatch):
+        monkeypatch.setattr(cache, "CODEC", "raw")
+        cache.set(URL, self.HTML)
+        monkeypatch.setattr(cache, "CODEC", "zlib")
+        cache.set("https://www.pdga.com/other", self.HTML)
+        assert cache.get_many([URL, "https://www.pdga.com/other"]) == {
+            URL: self.HTML, "https://www.pdga.com/other": self.HTML,
+        }
+
+    def test_undecodable_zstd_row_is_a_miss(self, monkeypatch):
+        cache.set(URL, self.HTML)
+        _set_column(URL, "codec", "zstd")
+        monkeypatch.setattr(cache, "zstandard", None)
+        assert cache.get_entry(URL) is None
+        monkeypatch.setattr(cache, "CODEC", "zstd")
+        with pytest.raises(ValueError):
+            cache.set(URL, self.HTML)
+
+
+# ---------------------------------------------------------------------------
+# In-process memory tier
+# ---------------------------------------------------------------------------
+
+class TestMemoryTier:
+    OTHER = "https://www.pdga.com/player/123456"
+
+    def _no_sqlite(self, monkeypatch):
+        def fail():
+            raise AssertionError("SQLite should not be touched")
+        monkeypatch.setattr(cache, "_connect", fail)
+
+    def test_warm_reads_skip_sqlite(self, monkeypatch):
+        cache.set(URL, "<html>hi</html>")
+        cache.set_extract(URL, "stats", cache.content_hash("<html>hi</html>"), 1, {"r": 1})
+        assert cache.get_extract(URL, "stats", 1) == {"r": 1}   # promoted from SQLite
+        self._no_sqlite(monkeypatch)
+        assert cache.get(URL) == "<html>hi</html>"
+        assert cache.get_extract(URL, "stats", 1) == {"r": 1}
+        counts = cache.stats()
+        assert counts["memory_hits"] == 2 and counts["sqlite_hits"] == 1
+
+    def test_cold_process_promotes_from_sqlite(self):
+        cache.set(URL, "<html>hi</html>")
+        cache._memory_discard()
+        assert cache.get(URL) == "<html>hi</html>"
+        assert cache.get(URL) == "<html>hi</html>"
+        counts = cache.stats()
+        assert (counts["sqlite_hits"], counts["memory_hits"]) == (1, 1)
+        rates = cache.cache_stats()["hit_rates"]
+        assert rates == {"memory": 0.5, "sqlite": 1.0}
+
+    def test_same_ttl(self, monkeypatch):
+        cache.set(URL, "<html>hi</html>")
+        monkeypatch.setattr(cache, "CACHE_TTL_SECS", -1)
+        assert cache.get(URL) is None
+        assert cache.get_entry(URL)["expired"] is True
+
+    def test_bounded_by_entries_and_bytes(self, monkeypatch):
+        monkeypatch.setattr(cache, "MEMORY_MAX_ENTRIES", 2)
+        cache.set_many([(f"{URL}/{i}", "x" * 10) for i in range(4)])
+        assert cache.cache_stats()["memory"]["entries"] == 2
+        monkeypatch.setattr(cache, "MEMORY_MAX_BYTES", 15)
+        cache.set(URL, "y" * 10)
+        info = cache.cache_stats()["memory"]
+        assert (info["entries"], info["bytes"]) == (1, 10)
+
+    def test_bytes_are_utf8_bytes(self, monkeypatch):
+        cache.set(URL, "é" * 10)
+        assert cache.cache_stats()["memory"]["bytes"] == 20
+        cache._memory_discard()
+        assert cache.get(URL) == "é" * 10   # promoted from SQLite
+        assert cache.cache_stats()["memory"]["bytes"] == 20
+        monkeypatch.setattr(cache, "MEMORY_MAX_BYTES", 15)
+        cache.set(self.OTHER, "é" * 9)   # 9 characters, 18 bytes: over the cap
+        assert cache.cache_stats()["memory"]["entries"] == 1
+
+    def test_invalidation_clears_both_tiers(self):
+        cache.set_many([(URL, "<a/>"), (self.OTHER, "<b/>"), ("https://www.pdga.com/x", "<c/>")])
+        cache.tag_player("12345", [URL])
+        cache.invalidate("https://www.pdga.com/x")
+        assert cache.get("https://www.pdga.com/x") is None
+        cache.invalidate_player("12345")
+        assert cache.get(URL) is None
+        cache.clear_all()
+        assert cache.get_many([URL, self.OTHER]) == {}
+        assert cache.cache_stats()["memory"]["entries"] == 0
+
+    def test_touch_refreshes_memory_copy(self, monkeypatch):
+        cache.set(URL, "<html>old</html>")
+        expire(URL)
+        cache.get_entry(URL)   # expired copy now in memory
+        cache.touch(URL)
+        self._no_sqlite(monkeypatch)
+        assert cache.get(URL) == "<html>old</html>"
@@ -7,13 +7,23 @@ No network calls needed — all inputs are synthetic.
 Run with: pytest tests/test_calculator.py -v
 """
 
+import random
+
+import numpy as np
 import pytest
+
+from ratings_calculator import calculator
 from ratings_calculator.calculator import (
     compute_pdga_rating,
+    compute_pdga_ratings,
+    pack_ratings,
     compute_lookback_window,
     build_used_rounds,
     project_rating,
     rounds_needed_for_target,
+    rounds_needed_grid,
+    RatingState,
+    RoundStore,
     ONE_YEAR_SECS,
     TWO_YEARS_SECS,
 )
@@ -21,6 +31,17 @@ from ratings_calculator.calculator import (
 NOW = 1_700_000_000  # fixed timestamp for deterministic tests
 
 
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Pin calculator's clock (the what-if rounds' timestamp) to NOW."""
+    class FrozenDatetime(calculator.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return calculator.datetime.fromtimestamp(NOW)
+
+    monkeypatch.setattr(calculator, "datetime", FrozenDatetime)
+
+
 def make_round(
     rating: int,
     days_ago: int,
@@ -38,6 +59,14 @@ def make_round(
     }
 
 
+def random_rated_rounds(rng: random.Random) -> list[dict]:
+    """3-40 evaluated rounds over the last ~2 years, about 10% already dropped by PDGA."""
+    return [
+        make_round(rng.randint(750, 1000), rng.randint(1, 700), included="Yes" if rng.random() > 0.1 else "No")
+        for _ in range(rng.randint(3, 40))
+    ]
+
+
 # ---------------------------------------------------------------------------
 # compute_pdga_rating
 # ---------------------------------------------------------------------------
@@ -86,6 +115,64 @@ class TestComputePdgaRating:
         assert cutoff < avg - 100
 
 
+# ---------------------------------------------------------------------------
+# compute_pdga_ratings (batch)
+# ---------------------------------------------------------------------------
+
+def random_players(seed: int, n_players: int) -> list[list[int]]:
+    """Round-rating histories of random length, spread, outliers and ties."""
+    rng     = np.random.default_rng(seed)
+    players = []
+    for _ in range(n_players):
+        n      = int(rng.integers(1, 120))
+        base   = int(rng.integers(600, 1050))
+        kind   = rng.random()
+        if kind < 0.1:
+            ratings = np.full(n, base)
+        else:
+            ratings = base + rng.normal(0, rng.integers(1, 80), n).astype(int)
+            if kind < 0.4:
+                ratings[rng.integers(0, n)] -= int(rng.integers(50, 400))
+        players.append([int(r) for r in ratings])
+    return players
+
+
+class TestComputePdgaRatings:
+    def test_matches_scalar_on_random_players(self):
+        players = random_players(seed=20260, n_players=3000)
+        projected, drop_below = compute_pdga_ratings(*pack_ratings(players))
+        for i, ratings in enumerate(players):
+            assert (int(projected[i]), float(drop_below[i])) == compute_pdga_rating(ratings), i
+
+    def test_matches_scalar_on_edge_cases(self):
+        players = [
+            [900],
+            [900] * 7,
+            [900] * 8,
+            [900] * 8 + [950] * 4,
+            [900] * 10 + [500],
+            list(range(800, 1000, 10)),
+            [1000, 0],
+        ]
+        projected, drop_below = compute_pdga_ratings(*pack_ratings(players))
+        assert [(int(p), float(d)) for p, d in zip(projected, drop_below)] == [
+            compute_pdga_rating(r) for r in players
+        ]
+
+    def test_pack_ratings_layout(self):
+        ratings, offsets = pack_ratings([[900, 910], [], [880]])
+        assert ratings.tolist() == [900, 910, 880]
+        assert offsets.tolist() == [0, 2, 2, 3]
+
+    def test_empty_player_raises(self):
+        with pytest.raises(ValueError, match="player 1"):
+            compute_pdga_ratings(*pack_ratings([[900], [], [880]]))
+
+    def test_bad_offsets_raise(self):
+        with pytest.raises(ValueError):
+            compute_pdga_ratings([900, 910], [0, 1])
+
+
 # ---------------------------------------------------------------------------
 # compute_lookback_window
 # ---------------------------------------------------------------------------
@@ -144,6 +231,53 @@ class TestBuildUsedRounds:
         assert len(hyp) == 2
 
 
+# ---------------------------------------------------------------------------
+# RoundStore
+# ---------------------------------------------------------------------------
+
+class TestRoundStore:
+    def _store(self) -> RoundStore:
+        rated = [
+            make_round(900, 30, name="A"),
+            make_round(880, 400, name="B"),
+            make_round(700, 10, included="No", name="C"),
+            make_round(950, 20, evaluated="No", name="D"),
+        ]
+        new = [make_round(920, 5, evaluated="No", name="N")]
+        return RoundStore(rated, new, [940], now=NOW)
+
+    def test_rows_newest_first_with_index_into_records(self):
+        store = self._store()
+        assert store.timestamp.tolist() == sorted(store.timestamp.tolist(), reverse=True)
+        assert [store.records[i]["name"] for i in store.index] == [
+            "Hypothetical Round 1", "N", "C", "D", "A", "B",
+        ]
+        assert store.rating.tolist() == [940, 920, 700, 950, 900, 880]
+
+    def test_masks(self):
+        store = self._store()
+        assert store.incoming.tolist()     == [True, True, False, False, False, False]
+        assert store.hypothetical.tolist() == [True, False, False, False, False, False]
+        assert store.evaluated.tolist()    == [False, False, True, False, True, True]
+        assert store.included.tolist()     == [False, False, False, True, True, True]
+
+    def test_window_selections_give_records_in_build_order(self):
+        store     = self._store()
+        last_date = NOW - 100 * 86400
+        assert [r["name"] for r in store.rows(store.used(last_date))] == ["N", "Hypothetical Round 1", "A"]
+        assert [r["name"] for r in store.rows(store.outgoing(last_date))] == ["B"]
+        assert [r["name"] for r in store.rows(store.incoming, by_time=True)] == ["N", "Hypothetical Round 1"]
+
+    def test_lookback_window_matches_dicts(self):
+        store = self._store()
+        rounds = store.rows(store.incoming | store.evaluated)
+        assert store.lookback_window() == compute_lookback_window(rounds)
+
+    def test_no_evaluated_rounds(self):
+        with pytest.raises(ValueError, match="No evaluated rounds"):
+            RoundStore([make_round(900, 10, evaluated="No")], []).lookback_window()
+
+
 # ---------------------------------------------------------------------------
 # project_rating
 # ---------------------------------------------------------------------------
@@ -172,6 +306,89 @@ class TestProjectRating:
             assert key in result
 
 
+# ---------------------------------------------------------------------------
+# RatingState
+# ---------------------------------------------------------------------------
+
+def _reference(tournaments, new_tournaments, whatif, now):
+    """The from-scratch pipeline: build_used_rounds + compute_pdga_rating."""
+    used, last_date = build_used_rounds(tournaments, new_tournaments, whatif or None)
+    ordered = sorted(used, key=lambda r: r["timestamp"], reverse=True)
+    return (*compute_pdga_rating([r["rating"] for r in ordered]), last_date)
+
+
+@pytest.mark.usefixtures("frozen_now")
+class TestRatingState:
+    def _player(self, rng) -> tuple[list[dict], list[dict]]:
+        rated = [
+            make_round(
+                rng.randint(700, 1000) if rng.random() > 0.1 else rng.randint(300, 700),
+                rng.randint(1, 900),
+                evaluated="Yes" if rng.random() > 0.1 else "No",
+                included="Yes" if rng.random() > 0.1 else "No",
+            )
+            for _ in range(rng.randint(0, 40))
+        ]
+        new = [make_round(rng.randint(800, 1000), rng.randint(0, 5)) for _ in range(rng.randint(0, 3))]
+        return rated, new
+
+    def test_matches_full_pipeline_through_edits(self):
+        """Random add/remove sequences, including window changes, match a from-scratch run."""
+        rng = random.Random(22)
+        for _ in range(300):
+            rated, new = self._player(rng)
+            state  = RatingState(rated, new, now=NOW)
+            whatif = []
+            for _ in range(10):
+                if whatif and rng.random() < 0.35:
+                    i = rng.randrange(len(whatif))
+                    assert state.remove_whatif(i) == whatif.pop(i)
+                else:
+                    whatif.append(rng.randint(500, 1100))
+                    state.add_whatif(whatif[-1])
+                try:
+                    expected = _reference(rated, new, whatif, NOW)
+                except ValueError as e:
+                    with pytest.raises(ValueError, match=str(e)):
+                        state.result()
+                    continue
+                result = state.result()
+                assert (result["projected_rating"], result["drop_below"], result["last_date"]) == expected
+
+    def test_set_whatif_matches_project_rating(self):
+        rated = [make_round(880 + i * 5, 20 + i * 30) for i in range(12)]
+        state = RatingState(rated, [], now=NOW)
+        for whatif in ([950], [950, 700], [700], [], [1000, 1000, 990]):
+            state.set_whatif(whatif)
+            expected = project_rating(rated, [], whatif or None)
+            result   = state.result()
+            for key in ("projected_rating", "drop_below", "last_date"):
+                assert result[key] == expected[key]
+            for key in ("used_rounds", "incoming_rounds", "outgoing_rounds", "outlier_rounds"):
+                assert [r["rating"] for r in result[key]] == [r["rating"] for r in expected[key]]
+
+    def test_project_rating_reuses_state(self):
+        rated = [make_round(880 + i * 5, 20 + i * 30) for i in range(12)]
+        state = RatingState(rated, [], now=NOW)
+        assert project_rating(rated, [], [990, 1000], state=state)["projected_rating"] == \
+            project_rating(rated, [], [990, 1000])["projected_rating"]
+        assert state.projection() == RatingState(rated, [], [990, 1000], now=NOW).projection()
+
+    def test_cutoff_on_a_half_defers_to_scalar(self):
+        """avg − 2.5σ = 723.5 exactly: the rounding must follow compute_pdga_rating."""
+        rated = [make_round(800, 10), make_round(902, 20)]
+        assert RatingState(rated, [], now=NOW).projection() == compute_pdga_rating([800, 902])
+
+    def test_ratings_outside_initial_range(self):
+        state = RatingState([make_round(900, 10)], [], now=NOW)
+        state.set_whatif([5000, -40])
+        assert state.projection() == _reference([make_round(900, 10)], [], [5000, -40], NOW)[:2]
+
+    def test_no_rounds_raises(self):
+        with pytest.raises(ValueError, match="No evaluated rounds"):
+            RatingState([], [], now=NOW).result()
+
+
 # ---------------------------------------------------------------------------
 # rounds_needed_for_target
 # ---------------------------------------------------------------------------
@@ -199,3 +416,41 @@ class TestRoundsNeededForTarget:
         if result["achievable"]:
             verify = project_rating(self._base(), [], whatif_ratings=result["example_rounds"])
             assert verify["projected_rating"] >= 915
+
+    @pytest.mark.usefixtures("frozen_now")
+    def test_matches_project_rating_probes(self):
+        """The prepared-state solver agrees with probing project_rating from scratch."""
+        rng = random.Random(23)
+        for _ in range(12):
+            rated = random_rated_rounds(rng)
+            for target, n in ((rng.randint(800, 1050), rng.randint(1, 6)), (700, 2), (1100, 1)):
+                result = rounds_needed_for_target(rated, [], target, n)
+
+                def trial(avg):
+                    return project_rating(rated, [], [avg] * n)["projected_rating"]
+
+                if trial(1100) < target:
+                    assert result["achievable"] is False
+                    assert result["with_avg"] == trial(1100)
+                    continue
+                needed = next(avg for avg in range(300, 1101) if trial(avg) >= target)
+                assert (result["needed_avg"], result["with_avg"]) == (needed, trial(needed))
+
+
+@pytest.mark.usefixtures("frozen_now")
+class TestRoundsNeededGrid:
+    def test_matches_single_solver(self):
+        rng = random.Random(24)
+        for _ in range(8):
+            rated = random_rated_rounds(rng)
+            new     = [make_round(rng.randint(800, 1000), 0, evaluated="No") for _ in range(rng.randint(0, 3))]
+            targets = [700, 1100] + [rng.randint(850, 1050) for _ in range(4)]
+            rounds  = [1, 2, 3, 5, 8]
+            grid    = rounds_needed_grid(rated, new, targets, rounds)
+            assert set(grid) == {(t, n) for t in targets for n in rounds}
+            for (target, n), result in grid.items():
+                assert result == rounds_needed_for_target(rated, new, target, n)
+
+    def test_empty_grid(self):
+        assert rounds_needed_grid([make_round(900, 10)], [], [], [3]) == {}
+
@@ -0,0 +1,197 @@
+"""
+test_extract.py
+---------------
+Cross-check the fast html.parser extractor against the BeautifulSoup reference
+on hand-written fixture pages. No network calls.
+
+Fixtures live in tests/fixtures/ and follow the markup of PDGA player-detail
+and tournament-result pages, with awkward cases mixed in (entities, nested
+tags and comments in cells, unclosed rows, multi-child <h4>s, near-miss
+PDGA numbers). Drop more pages in there to widen the check.
+
+To also cross-check every page in a local cache database (opened read-only):
+    PDGA_CROSSCHECK_DB=~/.pdga_ratings_cache.db pytest tests/test_extract.py -v
+
+Run with: pytest tests/test_extract.py -v
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from ratings_calculator import extract
+from ratings_calculator.scraper import (
+    ParseError,
+    _page_for_player,
+    parse_detail_tournaments,
+    parse_tournament_rounds,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+DETAIL_PAGES     = sorted(FIXTURES.glob("player_*.html"))
+TOURNAMENT_PAGES = sorted(FIXTURES.glob("tournament_*.html"))
+PLAYERS          = ["150375", "1234", "1503750", "77777", "88888", "42", "", "99999999"]
+
+fast = extract.FastExtractor()
+soup = extract.SoupExtractor()
+
+
+def _read(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Fast vs. reference on fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("page", DETAIL_PAGES + TOURNAMENT_PAGES, ids=lambda p: p.name)
+def test_detail_rows_match_reference(page: Path):
+    html = _read(page)
+    assert fast.detail_rows(html) == soup.detail_rows(html)
+
+
+@pytest.mark.parametrize("pdga_number", PLAYERS)
+@pytest.mark.parametrize("page", TOURNAMENT_PAGES + DETAIL_PAGES, ids=lambda p: p.name)
+def test_tournament_page_matches_reference(page: Path, pdga_number: str):
+    html = _read(page)
+    assert fast.tournament_page(html, pdga_number) == soup.tournament_page(html, pdga_number)
+
+
+def test_missing_body_matches_reference():
+    html = "<table><tr><td class='pdga-number'>1</td></tr></table>"
+    assert fast.tournament_page(html, "1") == soup.tournament_page(html, "1")
+
+
+# ---------------------------------------------------------------------------
+# Whole-page results (tournament index)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("page", TOURNAMENT_PAGES + DETAIL_PAGES, ids=lambda p: p.name)
+def test_tournament_results_match_reference(page: Path):
+    html = _read(page)
+    assert fast.tournament_results(html) == soup.tournament_results(html)
+
+
+@pytest.mark.parametrize("pdga_number", [p for p in PLAYERS if p])
+@pytest.mark.parametrize("page", TOURNAMENT_PAGES, ids=lambda p: p.name)
+def test_tournament_results_agree_with_single_player_lookup(page: Path, pdga_number: str):
+    html    = _read(page)
+    results = fast.tournament_results(html)
+    assert _page_for_player(results, pdga_number) == soup.tournament_page(html, pdga_number)
+
+
+# ---------------------------------------------------------------------------
+# Early-exit streaming
+# ---------------------------------------------------------------------------
+
+def _chunks(html: str, size: int):
+    return (html[i:i + size] for i in range(0, len(html), size))
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+@pytest.mark.parametrize("pdga_number", PLAYERS)
+@pytest.mark.parametrize("page", TOURNAMENT_PAGES, ids=lambda p: p.name)
+def test_stream_matches_full_parse(page: Path, pdga_number: str, size: int):
+    html = _read(page)
+    streamed, _ = fast.tournament_page_stream(_chunks(html, size), pdga_number)
+    assert streamed == soup.tournament_page(html, pdga_number)
+
+
+def test_stream_stops_at_player_row():
+    rows = "".join(
+        f"<tr><td class='pdga-number'>{n}</td><td class='round-rating'>900</td></tr>"
+        for n in range(1000)
+    )
+    html = (
+        "<html><body><h4>Summer League</h4><li class='tournament-date'>Date: 01-Jun-2026</li>"
+        f"<table>{rows}</table></body></html>"
+    )
+    pulled = []
+
+    def chunks():
+        for chunk in _chunks(html, 256):
+            pulled.append(chunk)
+            yield chunk
+
+    page, complete = fast.tournament_page_stream(chunks(), "10")
+    assert complete is False
+    assert page == {"has_body": True, "is_league": True, "date": "Date: 01-Jun-2026", "ratings": ["900"]}
+    assert len(pulled) < len(html) // 256 // 10
+
+
+# ---------------------------------------------------------------------------
+# Parsed results (backend-independent)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("backend", ["soup", "fast", "crosscheck"])
+class TestParsedResults:
+    def test_detail_tournaments(self, backend):
+        rounds = parse_detail_tournaments(_read(FIXTURES / "player_details.html"), backend)
+        assert [r["rating"] for r in rounds] == [934, 902, 861, 920, 947]
+        assert rounds[0]["name"] == "Spring Fling & DoublesPresented byAcme"
+        assert rounds[2]["included"] == "No"
+        assert "link" not in rounds[3]
+
+    def test_tournament_rounds(self, backend):
+        html = _read(FIXTURES / "tournament_results.html")
+        ratings, _, date_str, is_league = parse_tournament_rounds(html, "150375", backend=backend)
+        assert ratings == [938, 917]
+        assert date_str == "Date: 12-Apr-2026 to 13-Apr-2026"
+        assert is_league is False
+
+    def test_exact_number_match_only(self, backend):
+        html = _read(FIXTURES / "tournament_results.html")
+        assert parse_tournament_rounds(html, "1503750", backend=backend)[0] == [880]
+        assert parse_tournament_rounds(html, "15037", backend=backend)[0] == []
+
+    def test_league_detection(self, backend):
+        _, _, _, is_league = parse_tournament_rounds(
+            _read(FIXTURES / "tournament_league.html"), "150375", backend=backend
+        )
+        assert is_league is True
+
+    def test_league_needs_single_string_h4(self, backend):
+        ratings, _, _, is_league = parse_tournament_rounds(
+            _read(FIXTURES / "tournament_nested_h4.html"), "42", backend=backend
+        )
+        assert ratings == [950]
+        assert is_league is True  # <h4><a><span>League Night</span></a></h4> has a .string
+
+    def test_missing_date_raises(self, backend):
+        with pytest.raises(ParseError):
+            parse_tournament_rounds(_read(FIXTURES / "tournament_no_date.html"), "150375", backend=backend)
+
+
+# ---------------------------------------------------------------------------
+# Opt-in: every page in a local cache database
+# ---------------------------------------------------------------------------
+
+@pytest.mark.skipif(not os.environ.get("PDGA_CROSSCHECK_DB"), reason="PDGA_CROSSCHECK_DB not set")
+def test_cached_pages_match_reference():
+    from ratings_calculator import cache
+
+    # Rows are read and decoded directly: going through cache.get_entry would
+    # migrate the user's database and write access times and stats into it.
+    db = Path(os.environ["PDGA_CROSSCHECK_DB"]).expanduser()
+    with closing(sqlite3.connect(f"file:{db}?mode=ro", uri=True)) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(page_cache)")}
+        codec   = "codec" if "codec" in columns else "NULL"   # databases from before compression
+        rows    = conn.execute(f"SELECT url, html, {codec} FROM page_cache").fetchall()
+
+    mismatches = []
+    for url, stored, codec in rows:
+        html = cache._decode(stored, codec)
+        if html is None:
+            continue   # zstd row, and zstandard isn't installed here
+        if "/player/" in url:
+            if fast.detail_rows(html) != soup.detail_rows(html):
+                mismatches.append(url)
+        elif "/tour/event/" in url:
+            for number in ["150375", "1"]:
+                if fast.tournament_page(html, number) != soup.tournament_page(html, number):
+                    mismatches.append(url)
+    assert not mismatches, "fast extractor disagrees on:\n" + "\n".join(mismatches)
@@ -0,0 +1,200 @@
+"""
+test_scheduler.py
+-----------------
+Unit tests for the per-host request scheduler. No network calls.
+
+Run with: pytest tests/test_scheduler.py -v
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+from ratings_calculator import cache, scheduler, scraper, ttl
+from tests.test_cache import FakeResponse, FakeSession
+
+URL   = "https://www.pdga.com/player/12345"
+OTHER = "https://example.com/page"
+
+
+@pytest.fixture(autouse=True)
+def fresh(monkeypatch):
+    monkeypatch.setattr(scheduler, "RATE_PER_SEC", 1000.0)
+    monkeypatch.setattr(scheduler, "BURST", 1000)
+    monkeypatch.setattr(scheduler, "MAX_IN_FLIGHT", 8)
+    scheduler.reset()
+    yield
+    scheduler.reset()
+
+
+async def _hold(url: str, seconds: float, active: list, peak: list, priority=scheduler.INTERACTIVE):
+    async with scheduler.slot_async(url, priority):
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(seconds)
+        active.pop()
+
+
+class TestLimits:
+    def test_concurrency_cap_per_host(self, monkeypatch):
+        monkeypatch.setattr(scheduler, "MAX_IN_FLIGHT", 2)
+        active, peak = [], []
+
+        async def run():
+            await asyncio.gather(*(_hold(URL, 0.05, active, peak) for _ in range(5)))
+
+        asyncio.run(run())
+        assert max(peak) == 2
+        assert scheduler.stats()["requests"] == 5
+        assert scheduler.stats()["in_flight"] == 0
+
+    def test_hosts_are_independent(self, monkeypatch):
+        monkeypatch.setattr(scheduler, "MAX_IN_FLIGHT", 1)
+
+        async def run():
+            await scheduler.acquire_async(URL)
+            await asyncio.wait_for(scheduler.acquire_async(OTHER), 1)   # would time out if the cap were global
+
+        asyncio.run(run())
+        scheduler.release(URL)
+        scheduler.release(OTHER)
+
+    def test_token_bucket_rate(self, monkeypatch):
+        monkeypatch.setattr(scheduler, "RATE_PER_SEC", 50.0)
+        monkeypatch.setattr(scheduler, "BURST", 1)
+        scheduler.reset()
+
+        async def run():
+            for _ in range(6):
+                async with scheduler.slot_async(URL):
+                    pass
+
+        start = time.monotonic()
+        asyncio.run(run())
+        assert time.monotonic() - start >= 5 / 50 * 0.9
+        assert scheduler.stats()["queued"] >= 4
+
+
+class TestPriority:
+    def test_interactive_before_prefetch(self, monkeypatch):
+        monkeypatch.setattr(scheduler, "MAX_IN_FLIGHT", 1)
+        order = []
+
+        async def request(name, priority):
+            async with scheduler.slot_async(URL, priority):
+                order.append(name)
+
+        async def run():
+            await scheduler.acquire_async(URL)
+            tasks = []
+            for name, priority in (("prefetch", scheduler.PREFETCH), ("interactive", scheduler.INTERACTIVE)):
+                tasks.append(asyncio.create_task(request(name, priority)))
+                await asyncio.sleep(0.02)   # both queued, prefetch first
+            assert scheduler.stats()["queue_depth"] == 2
+            scheduler.release(URL)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        assert order == ["interactive", "prefetch"]
+        wait = scheduler.stats()["wait"]
+        assert wait["prefetch"]["max_secs"] >= wait["interactive"]["max_secs"] > 0
+
+
+class TestBackoff:
+    def test_retry_after_seconds_pauses_host(self):
+        assert scheduler.retry_delay(URL, 429, "0.1", 1, 2) == pytest.approx(0.1)
+        start = time.monotonic()
+        asyncio.run(_hold(URL, 0, [], []))
+        assert time.monotonic() - start >= 0.08
+        assert scheduler.stats()["throttled"] == 1
+
+    def test_retry_after_http_date(self):
+        delay = scheduler.retry_delay(URL, 503, formatdate(time.time() + 30, usegmt=True), 1, 2)
+        assert 25 < delay <= 30
+
+    def test_adaptive_backoff_without_header(self):
+        assert [scheduler.retry_delay(URL, 503, None, a, 0.01) for a in (1, 2, 3)] == pytest.approx(
+            [0.01, 0.02, 0.04]
+        )
+        scheduler.succeeded(URL)
+        assert scheduler.retry_delay(URL, 503, None, 1, 0.01) == pytest.approx(0.01)
+
+    def test_backoff_is_capped(self, monkeypatch):
+        monkeypatch.setattr(scheduler, "MAX_BACKOFF_SECS", 5.0)
+        assert scheduler.retry_delay(OTHER, 429, "3600", 1, 2) == 5.0
+
+    def test_other_failures_back_off_linearly(self):
+        assert scheduler.retry_delay(URL, 500, "60", 3, 2) == 6
+        assert scheduler.retry_delay(URL, None, None, 2, 2) == 4
+        assert scheduler.stats()["throttled"] == 0
+
+
+class TestEventLoops:
+    def test_slots_shared_across_loops(self, monkeypatch):
+        monkeypatch.setattr(scheduler, "MAX_IN_FLIGHT", 1)
+        asyncio.run(scheduler.acquire_async(URL))
+        done = []
+
+        def other_loop():
+            asyncio.run(_hold(URL, 0, done, []))
+
+        t = threading.Thread(target=other_loop)
+        t.start()
+        time.sleep(0.02)
+        assert done == []
+        assert scheduler.stats()["queue_depth"] == 1
+        scheduler.release(URL)
+        t.join(1)
+        assert not t.is_alive()
+        assert scheduler.stats()["requests"] == 2
+
+    def test_cancelled_waiter_withdraws(self, monkeypatch):
+        monkeypatch.setattr(scheduler, "MAX_IN_FLIGHT", 1)
+
+        async def run():
+            await scheduler.acquire_async(URL)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(scheduler.acquire_async(URL), 0.02)
+            assert scheduler.stats()["queue_depth"] == 0
+            scheduler.release(URL)
+            # the slot wasn't handed to the cancelled waiter
+            await asyncio.wait_for(scheduler.acquire_async(URL), 1)
+            scheduler.release(URL)
+
+        asyncio.run(run())
+
+    def test_sync_wrapper_uses_the_shared_slots(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(cache, "DB_PATH", tmp_path / "cache.db")
+        monkeypatch.setattr(ttl, "_schedule", [])
+        monkeypatch.setattr(scraper, "SESSION", FakeSession(FakeResponse(200, "<html/>")))
+        monkeypatch.setattr(scheduler, "MAX_IN_FLIGHT", 1)
+        asyncio.run(scheduler.acquire_async(URL))
+        result = []
+        t = threading.Thread(target=lambda: result.append(scraper.fetch_html(URL)))
+        t.start()
+        time.sleep(0.02)
+        assert result == [] and scheduler.stats()["queue_depth"] == 1
+        scheduler.release(URL)
+        t.join(1)
+        assert result == ["<html/>"]
+
+
+class TestScraperRetries:
+    @pytest.fixture(autouse=True)
+    def tmp_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "DB_PATH", tmp_path / "cache.db")
+        monkeypatch.setattr(cache, "_stats", {k: 0 for k in cache._stats})
+        monkeypatch.setattr(ttl, "_schedule", [])
+        monkeypatch.setattr(scraper, "RETRY_BACKOFF", 0)
+
+    def test_429_honours_retry_after(self, monkeypatch):
+        session = FakeSession(FakeResponse(429, headers={"Retry-After": "0.1"}), FakeResponse(200, "<html/>"))
+        monkeypatch.setattr(scraper, "SESSION", session)
+        start = time.monotonic()
+        assert scraper.fetch_html(URL) == "<html/>"
+        assert time.monotonic() - start >= 0.08
+        assert scheduler.stats()["throttled"] == 1
+        assert cache.get_negative(URL) is None
@@ -1,13 +1,20 @@
 """
 test_scraper.py
 ---------------
-Smoke tests against the real PDGA website. Verifies the scraper handles
-a range of player profiles without crashing or returning nonsense.
+Tests for the scraper's fetch engine, and smoke tests against the real PDGA
+website.
 
-Run with:
-    pytest tests/test_scraper.py -v --timeout=60
+The engine tests (async fetches, their blocking wrappers, single-flight
+downloads, concurrent player loads) run against a throwaway cache and a fake
+session serving minimal PDGA-shaped pages. No network; they run on every push:
 
-Requires internet access. Slow (~30s). Run on schedule, not every push.
+    pytest tests/test_scraper.py -m "not smoke" -v
+
+The smoke tests (marked `smoke`) verify the scraper handles a range of player
+profiles without crashing or returning nonsense. They require internet access
+and are slow (~30s), so they run on schedule, not every push:
+
+    pytest tests/test_scraper.py -m smoke -v --timeout=60
 
 ─────────────────────────────────────────────────────────────────────────────
 MAINTENANCE NOTE — update these player numbers as needed.
@@ -16,9 +23,311 @@ Verify a player fits their category before adding them here.
 ─────────────────────────────────────────────────────────────────────────────
 """
 
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
 import pytest
+import requests
+
+from ratings_calculator import cache, scheduler, scraper, ttl
 from ratings_calculator.scraper    import load_player_data, FetchError, ParseError
 from ratings_calculator.calculator import project_rating
+from tests.test_cache import FakeResponse, FakeSession
+
+URL = "https://www.pdga.com/player/12345"
+
+
+# ---------------------------------------------------------------------------
+# Fake pages
+# ---------------------------------------------------------------------------
+
+def _day(days_from_now: int, fmt: str = "%d-%b-%Y") -> str:
+    return (datetime.now() + timedelta(days=days_from_now)).strftime(fmt)
+
+
+def route(url: str, n_events: int = 5) -> str:
+    """
+    A minimal pdga.com-shaped page for url, with just the markup the scraper
+    reads. Each player has n_events unrated events on their stats page,
+    /tour/event/90000 upwards; event 9000i rates every player 900 + i.
+    """
+    if url.endswith("/when-updated"):
+        rows = "".join(
+            f"<tr><td>{_day(d, '%B %d, %Y')}</td><td>{_day(d + 6, '%B %d, %Y')}</td></tr>"
+            for d in (-27, 3, 33)
+        )
+        return f"<html><body><table><tbody>{rows}</tbody></table></body></html>"
+    m = re.search(r"/player/(\d+)(/\w+)?$", url)
+    if m and m.group(2) == "/details":
+        rows = "".join(
+            f'<tr><td class="tournament"><a href="/tour/event/{10000 + i}">Old {i}</a></td>'
+            f'<td class="date">{_day(-30 - 15 * i)}</td><td class="round-rating">{910 + i}</td>'
+            f'<td class="evaluated">Yes</td><td class="included">Yes</td></tr>'
+            for i in range(10)
+        )
+        return f'<html><body><table id="player-results-details"><tbody>{rows}</tbody></table></body></html>'
+    if m and m.group(2) == "/history":
+        return (
+            '<html><body><table id="player-results-history"><tbody>'
+            f'<tr><td class="date-received">{_day(-10, "%Y-%m-%d")}</td>'
+            '<td class="player-rating">925</td><td class="round-rating">10</td></tr>'
+            "</tbody></table></body></html>"
+        )
+    if m:
+        rows = "".join(
+            f'<tr><td class="tournament"><a href="/tour/event/{90000 + i}#MA1">New {i}</a></td>'
+            f'<td class="dates">{_day(-5)}</td></tr>'
+            for i in range(n_events)
+        )
+        return (
+            '<html><body><ul class="player-info"><li class="current-rating">'
+            "<strong>Current Rating:</strong> 925</li></ul>"
+            f"<table><tbody>{rows}</tbody></table></body></html>"
+        )
+    m = re.search(r"/tour/event/(\d+)", url)
+    if m:
+        rating = 900 + int(m.group(1)) % 100
+        return (
+            '<html><body><div class="event-info"><h4>Tournament</h4>'
+            f'<li class="tournament-date"><strong>Date</strong>: {_day(-5)}</li></div>'
+            '<table class="results"><tbody><tr><td class="pdga-number">12345</td>'
+            f'<td class="round-rating">{rating}</td><td class="round-rating">{rating}</td></tr>'
+            "</tbody></table></body></html>"
+        )
+    raise KeyError(url)
+
+
+class SlowSession(FakeSession):
+    """FakeSession whose responses take a moment, so concurrent callers overlap."""
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        time.sleep(0.05)
+        return super().get(url, timeout, headers, **kwargs)
+
+
+class OverlapSession:
+    """Serves route() pages slowly, recording peak concurrency and worker threads."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay   = delay
+        self.urls:    list[str] = []
+        self.threads: set[str]  = set()
+        self.active  = 0
+        self.peak    = 0
+        self._lock   = threading.Lock()
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        with self._lock:
+            self.urls.append(url)
+            self.threads.add(threading.current_thread().name)
+            self.active += 1
+            self.peak    = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay_for(url))
+            return FakeResponse(200, route(url))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def delay_for(self, url: str) -> float:
+        return self.delay
+
+
+@pytest.fixture
+def offline_engine(tmp_path, monkeypatch):
+    """A throwaway cache and an unthrottled scheduler; tests install their own SESSION."""
+    monkeypatch.setattr(cache, "DB_PATH", tmp_path / "cache.db")
+    monkeypatch.setattr(cache, "_stats", {k: 0 for k in cache._stats})
+    monkeypatch.setattr(ttl, "_schedule", [])
+    monkeypatch.setattr(scheduler, "RATE_PER_SEC", 1000.0)
+    monkeypatch.setattr(scheduler, "BURST", 1000)
+    monkeypatch.setattr(scraper, "OFFLINE", False)
+    monkeypatch.setattr(scraper, "RETRY_BACKOFF", 0)
+    scheduler.reset()
+
+
+# ---------------------------------------------------------------------------
+# Single-flight downloads
+# ---------------------------------------------------------------------------
+
+@pytest.mark.usefixtures("offline_engine")
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_download(self, monkeypatch):
+        session = SlowSession(FakeResponse(200, "<html/>"))
+        monkeypatch.setattr(scraper, "SESSION", session)
+
+        async def both():
+            return await asyncio.gather(scraper.fetch_html_async(URL), scraper.fetch_html_async(URL))
+
+        assert asyncio.run(both()) == ["<html/>", "<html/>"]
+        assert len(session.requests) == 1
+        assert cache.stats()["coalesced"] == 1
+        assert cache.get(URL) == "<html/>"
+        assert scraper._IN_FLIGHT == {}
+
+    def test_shared_across_threads_and_batches(self, monkeypatch):
+        session = SlowSession(FakeResponse(200, "<html/>"))
+        monkeypatch.setattr(scraper, "SESSION", session)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = [
+                pool.submit(scraper.fetch_html, URL),
+                pool.submit(scraper.fetch_html, URL),
+                pool.submit(lambda: asyncio.run(scraper.fetch_many_html_async([URL]))[URL]),
+            ]
+            assert [r.result() for r in results] == ["<html/>"] * 3
+        assert len(session.requests) == 1
+
+    def test_error_shared(self, monkeypatch):
+        session = SlowSession(*[FakeResponse(500)] * scraper.MAX_RETRIES)
+        monkeypatch.setattr(scraper, "SESSION", session)
+
+        async def both():
+            return await asyncio.gather(
+                scraper.fetch_html_async(URL), scraper.fetch_html_async(URL), return_exceptions=True
+            )
+
+        errors = asyncio.run(both())
+        assert all(isinstance(e, scraper.FetchError) for e in errors)
+        assert len(session.requests) == scraper.MAX_RETRIES
+        assert scraper._IN_FLIGHT == {}
+
+
+# ---------------------------------------------------------------------------
+# Async engine and its blocking wrappers
+# ---------------------------------------------------------------------------
+
+@pytest.mark.usefixtures("offline_engine")
+class TestAsyncEngine:
+    EVENTS = [f"https://www.pdga.com/tour/event/{90000 + i}" for i in range(12)]
+
+    def test_retries_then_caches(self, monkeypatch):
+        session = FakeSession(FakeResponse(503), FakeResponse(200, "<html/>"))
+        monkeypatch.setattr(scraper, "SESSION", session)
+        assert asyncio.run(scraper.fetch_html_async(URL)) == "<html/>"
+        assert asyncio.run(scraper.fetch_html_async(URL)) == "<html/>"
+        assert scraper.fetch_html(URL) == "<html/>"
+        assert len(session.requests) == 2
+        assert cache.stats()["hits"] == 2
+
+    def test_fetch_error_after_max_retries(self, monkeypatch):
+        class DownSession(FakeSession):
+            def get(self, url, timeout=None, headers=None, **kwargs):
+                super().get(url, timeout, headers)
+                raise requests.ConnectionError("offline")
+
+        session = DownSession(*[None] * (2 * scraper.MAX_RETRIES))
+        monkeypatch.setattr(scraper, "SESSION", session)
+        attempts = f"after {scraper.MAX_RETRIES} attempts: offline"
+        with pytest.raises(scraper.FetchError, match=attempts):
+            asyncio.run(scraper.fetch_html_async(URL))
+        with pytest.raises(scraper.FetchError, match=attempts):
+            scraper.fetch_html(URL)
+        assert len(session.requests) == 2 * scraper.MAX_RETRIES
+        assert cache.get(URL) is None
+
+    def test_parse_error_from_player_load(self, monkeypatch):
+        class NoRatingSession(OverlapSession):
+            def get(self, url, timeout=None, headers=None, **kwargs):
+                if url in (URL, URL + "/history"):
+                    self.urls.append(url)
+                    return FakeResponse(200, "<html/>")
+                return super().get(url, timeout, headers, **kwargs)
+
+        session = NoRatingSession(delay=0)
+        monkeypatch.setattr(scraper, "SESSION", session)
+        with pytest.raises(scraper.ParseError) as first:
+            asyncio.run(scraper.load_player_data_async("12345"))
+        with pytest.raises(scraper.ParseError) as again:
+            scraper.load_player_data("12345")
+        assert str(again.value).startswith(str(first.value))
+        assert session.urls.count(URL + "/history") == 1
+
+    def test_batch_downloads_overlap_on_io_pool(self, monkeypatch):
+        session = OverlapSession()
+        monkeypatch.setattr(scraper, "SESSION", session)
+        htmls = asyncio.run(scraper.fetch_many_html_async(self.EVENTS, max_concurrency=4))
+        assert list(htmls) == self.EVENTS
+        assert sorted(session.urls) == self.EVENTS
+        assert 1 < session.peak <= 4
+        assert all(name.startswith("pdga-io") for name in session.threads)
+
+    def test_player_load_fetches_tournaments_concurrently(self, monkeypatch):
+        session = OverlapSession()
+        monkeypatch.setattr(scraper, "SESSION", session)
+        data = scraper.load_player_data("12345", max_concurrency=3)
+        assert data["current_rating"] is not None and data["tournaments"]
+        assert 1 < session.peak <= 3 + 1   # + the player page in flight alongside them
+        session.urls.clear()
+        assert scraper.load_player_data("12345") == {**data, "refresh": None}
+        assert session.urls == []
+
+    def test_player_load_keeps_discovery_order(self, monkeypatch):
+        class ReversedSession(OverlapSession):
+            """Later events answer first, so pages complete in reverse discovery order."""
+
+            def delay_for(self, url):
+                m = re.search(r"/tour/event/9000(\d)", url)
+                return 0.02 * (5 - int(m.group(1))) if m else 0
+
+        session = ReversedSession()
+        monkeypatch.setattr(scraper, "SESSION", session)
+        data = scraper.load_player_data("12345", max_concurrency=5)
+        events = [url for url in session.urls if "/tour/event/" in url]
+        assert session.peak > 1
+        assert [(t["name"], t["round"], t["rating"]) for t in data["new_tournaments"]] == [
+            (f"New {i}", r, 900 + i) for i in range(5) for r in (1, 2)
+        ]
+        assert len(events) == 5
+
+    def test_cold_load_fetches_player_pages_and_schedule_together(self, monkeypatch):
+        looked_up = []
+        get_entries = cache.get_entries
+        monkeypatch.setattr(cache, "get_entries", lambda urls: looked_up.append(list(urls)) or get_entries(urls))
+        session = OverlapSession()
+        monkeypatch.setattr(scraper, "SESSION", session)
+        scraper.load_player_data("12345")
+        first = set(scraper._player_urls("12345").values()) | {scraper.SCHEDULE_URL}
+        assert set(looked_up[0]) == first
+        assert set(session.urls[:4]) == first
+        assert session.peak >= 4
+
+    def test_cached_schedule_sets_player_page_expiry(self, monkeypatch):
+        session = OverlapSession(delay=0)
+        monkeypatch.setattr(scraper, "SESSION", session)
+        scraper.load_player_data("12345")
+        # A day later: past the default TTL, but before the next publication.
+        monkeypatch.setattr(ttl, "_schedule", [])
+        monkeypatch.setattr(cache, "CACHE_TTL_SECS", -1)
+        cache._memory_discard()
+        session.urls.clear()
+        scraper.load_player_data("12345")
+        assert scraper.SCHEDULE_URL not in session.urls
+        assert not {URL + "/details", URL + "/history"} & set(session.urls)
+
+    def test_force_refresh_load_revalidates_player_pages(self, monkeypatch):
+        class EtagSession:
+            def __init__(self):
+                self.requests: list[tuple[str, dict]] = []
+
+            def get(self, url, timeout=None, headers=None, **kwargs):
+                self.requests.append((url, dict(headers or {})))
+                if (headers or {}).get("If-None-Match") == '"v1"':
+                    return FakeResponse(304)
+                return FakeResponse(200, route(url), {"ETag": '"v1"'})
+
+        session = EtagSession()
+        monkeypatch.setattr(scraper, "SESSION", session)
+        scraper.load_player_data("12345")
+        session.requests.clear()
+        scraper.load_player_data("12345", force_refresh=True)
+        player_requests = [h for url, h in session.requests if url in scraper._player_urls("12345").values()]
+        assert len(player_requests) == 3
+        assert all(h.get("If-None-Match") == '"v1"' for h in player_requests)
+
 
 # ---------------------------------------------------------------------------
 # Test player roster
@@ -35,6 +344,7 @@ SMOKE_PLAYERS = [
 ]
 
 
+@pytest.mark.smoke
 @pytest.mark.parametrize("pdga_number,description,expect_success", SMOKE_PLAYERS)
 def test_load_and_project(pdga_number: str, description: str, expect_success: bool):
     """
@@ -79,12 +389,14 @@ def test_load_and_project(pdga_number: str, description: str, expect_success: bo
     assert isinstance(result["outlier_rounds"],  list)
 
 
+@pytest.mark.smoke
 def test_invalid_pdga_number():
     """A clearly invalid PDGA number should raise FetchError or ParseError, not crash."""
     with pytest.raises((FetchError, ParseError)):
         load_player_data("00000000")
 
 
+@pytest.mark.smoke
 def test_cache_returns_consistent_result():
     """Fetching the same player twice should return identical data (second call hits cache)."""
     pdga = "150375"
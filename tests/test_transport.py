@@ -0,0 +1,134 @@
+"""
+test_transport.py
+-----------------
+Unit tests for the record / replay / offline HTTP transports and the
+scraper's offline mode. No network calls.
+
+Run with: pytest tests/test_transport.py -v
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+import requests
+
+from ratings_calculator import cache, scheduler, scraper, transport, ttl
+from tests.test_cache import FakeResponse, FakeSession
+
+URL     = "https://www.pdga.com/player/12345"
+MISSING = "https://www.pdga.com/player/99999"
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "DB_PATH", tmp_path / "cache.db")
+    monkeypatch.setattr(cache, "_stats", {k: 0 for k in cache._stats})
+    monkeypatch.setattr(ttl, "_schedule", [])
+    monkeypatch.setattr(scheduler, "RATE_PER_SEC", 1000.0)
+    monkeypatch.setattr(scheduler, "BURST", 1000)
+    scheduler.reset()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path   = tmp_path / "fixtures.jsonl.gz"
+    live   = FakeSession(
+        FakeResponse(200, "<html>v1</html>", {"ETag": '"v1"', "Content-Length": "15"}),
+        FakeResponse(404, "gone"),
+    )
+    recorder = transport.Recorder(live, path)
+    recorder.get(URL, headers={"If-None-Match": '"v0"'})
+    recorder.get("https://www.pdga.com/tour/event/1")
+    return path, live
+
+
+class TestRecord:
+    def test_records_status_headers_and_body(self, archive):
+        path, live = archive
+        recorded = transport.load_archive(path)
+        assert recorded[URL] == {"status": 200, "headers": {"ETag": '"v1"'}, "body": "<html>v1</html>"}
+        assert recorded["https://www.pdga.com/tour/event/1"]["status"] == 404
+
+    def test_conditional_headers_not_forwarded(self, archive):
+        _, live = archive
+        assert live.requests[0] == {}
+
+    def test_latest_response_wins(self, archive):
+        path, _ = archive
+        transport.Recorder(FakeSession(FakeResponse(200, "<html>v2</html>")), path).get(URL)
+        assert transport.load_archive(path)[URL]["body"] == "<html>v2</html>"
+
+    def test_through_the_scraper(self, tmp_path, monkeypatch):
+        path = tmp_path / "fixtures.jsonl.gz"
+        monkeypatch.setattr(
+            scraper, "SESSION", transport.Recorder(FakeSession(FakeResponse(200, "<html>hi</html>")), path)
+        )
+        assert scraper.fetch_html(URL) == "<html>hi</html>"
+        assert transport.load_archive(path)[URL]["body"] == "<html>hi</html>"
+
+
+class TestReplay:
+    def test_serves_recorded_responses(self, archive, monkeypatch):
+        path, _ = archive
+        monkeypatch.setattr(scraper, "SESSION", transport.Replayer(path))
+        assert scraper.fetch_html(URL) == "<html>v1</html>"
+        assert cache.get_entry(URL)["etag"] == '"v1"'
+
+    def test_recorded_errors_replay(self, archive, monkeypatch):
+        path, _ = archive
+        monkeypatch.setattr(scraper, "SESSION", transport.Replayer(path))
+        with pytest.raises(scraper.FetchError, match="404"):
+            scraper.fetch_html("https://www.pdga.com/tour/event/1")
+
+    def test_conditional_get_gets_304(self, archive):
+        path, _ = archive
+        replayer = transport.Replayer(path)
+        assert replayer.get(URL, headers={"If-None-Match": '"v1"'}).status_code == 304
+        assert replayer.get(URL, headers={"If-None-Match": '"v0"'}).status_code == 200
+
+    def test_streaming_reads_recorded_body(self, archive):
+        path, _ = archive
+        response = transport.Replayer(path).get(URL, stream=True)
+        assert "".join(response.iter_content(4, decode_unicode=True)) == "<html>v1</html>"
+
+    def test_injected_latency(self, archive):
+        path, _ = archive
+        start = time.monotonic()
+        transport.Replayer(path, latency=0.05).get(URL)
+        assert time.monotonic() - start >= 0.05
+
+    def test_unrecorded_url_is_a_connection_error(self, archive, monkeypatch):
+        path, _ = archive
+        monkeypatch.setattr(scraper, "SESSION", transport.Replayer(path))
+        with pytest.raises(requests.ConnectionError):
+            transport.Replayer(path).get(MISSING)
+        start = time.monotonic()
+        with pytest.raises(scraper.FetchError, match="after 1 attempt: .*not in the fixture archive"):
+            scraper.fetch_html(MISSING)   # not retried, even without --offline
+        assert time.monotonic() - start < 1
+        assert cache.get_negative(MISSING) is None
+
+
+class TestOffline:
+    def test_refuses_requests(self):
+        with pytest.raises(requests.ConnectionError):
+            transport.Offline().get(URL)
+
+    def test_serves_expired_cache(self, monkeypatch):
+        cache.set(URL, "<html>old</html>")
+        with sqlite3.connect(cache.DB_PATH) as conn:
+            conn.execute("UPDATE page_cache SET fetched_at = 0 WHERE url = ?", (URL,))
+        cache._memory_discard()
+        monkeypatch.setattr(scraper, "SESSION", transport.Offline())
+        monkeypatch.setattr(scraper, "OFFLINE", True)
+        assert scraper.fetch_html(URL) == "<html>old</html>"
+        assert asyncio.run(scraper.fetch_many_html_async([URL])) == {URL: "<html>old</html>"}
+
+    def test_uncached_url_fails(self, monkeypatch):
+        monkeypatch.setattr(scraper, "SESSION", transport.Offline())
+        monkeypatch.setattr(scraper, "OFFLINE", True)
+        monkeypatch.setattr(scraper, "RETRY_BACKOFF", 0)
+        with pytest.raises(scraper.FetchError, match="after 1 attempt: offline"):
+            scraper.fetch_html(URL)
@@ -0,0 +1,87 @@
+"""
+test_ttl.py
+-----------
+Unit tests for the per-URL-class cache expiry policy. No network calls.
+
+Run with: pytest tests/test_ttl.py -v
+"""
+
+import pytest
+
+from ratings_calculator import ttl
+
+DAY     = 24 * 3600
+DEFAULT = 6 * 3600
+
+# Two updates: deadline day 10 -> published day 20, deadline day 40 -> day 50.
+SCHEDULE = [
+    {"deadline": 40 * DAY, "publication": 50 * DAY},
+    {"deadline": 10 * DAY, "publication": 20 * DAY},
+]
+
+
+@pytest.fixture(autouse=True)
+def schedule(monkeypatch):
+    monkeypatch.setattr(ttl, "_schedule", [])
+    ttl.set_schedule(SCHEDULE)
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.pdga.com/faq/ratings/when-updated", "schedule"),
+    ("https://www.pdga.com/player/150375",            "player_stats"),
+    ("https://www.pdga.com/player/150375/details",    "player_details"),
+    ("https://www.pdga.com/player/150375/history",    "player_history"),
+    ("https://www.pdga.com/tour/event/90000",         "tournament"),
+    ("https://www.pdga.com/tour/event/90000#MPO",     "tournament"),
+    ("https://www.pdga.com/players/stats",            "other"),
+    ("http://127.0.0.1:8765/player/150375/details",   "player_details"),   # scraper.set_base_url
+])
+def test_classify(url, expected):
+    assert ttl.classify(url) == expected
+
+
+class TestExpiresAt:
+    DETAILS = "https://www.pdga.com/player/150375/details"
+    EVENT   = "https://www.pdga.com/tour/event/90000"
+
+    def test_default_classes_use_default_ttl(self):
+        assert ttl.expires_at(self.EVENT, 0, DEFAULT) == DEFAULT
+        assert ttl.expires_at("https://www.pdga.com/player/1", 0, DEFAULT) == DEFAULT
+
+    def test_schedule_and_published_event(self):
+        assert ttl.expires_at(
+            "https://www.pdga.com/faq/ratings/when-updated", 0, DEFAULT
+        ) == ttl.SCHEDULE_TTL_SECS
+        assert ttl.expires_at(self.EVENT, 0, DEFAULT, "published_event") == ttl.PUBLISHED_EVENT_TTL_SECS
+
+    def test_publication_bound_until_next_publication(self):
+        assert ttl.expires_at(self.DETAILS, 5 * DAY, DEFAULT) == 20 * DAY
+        assert ttl.expires_at(self.DETAILS, 30 * DAY, DEFAULT) == 50 * DAY
+
+    def test_publication_bound_is_capped(self):
+        ttl.set_schedule([{"deadline": 0, "publication": 100 * DAY}])
+        assert ttl.expires_at(self.DETAILS, DAY, DEFAULT) == DAY + ttl.MAX_PUBLICATION_TTL_SECS
+
+    def test_publication_day_falls_back_to_default(self):
+        fetched = 20 * DAY + 3600
+        assert ttl.expires_at(self.DETAILS, fetched, DEFAULT) == fetched + DEFAULT
+
+    def test_without_schedule_falls_back_to_default(self, monkeypatch):
+        monkeypatch.setattr(ttl, "_schedule", [])
+        assert ttl.expires_at(self.DETAILS, 0, DEFAULT) == DEFAULT
+        fetched = 60 * DAY
+        ttl.set_schedule(SCHEDULE)
+        assert ttl.expires_at(self.DETAILS, fetched, DEFAULT) == fetched + DEFAULT
+
+
+class TestEventPublished:
+    def test_published_once_covering_update_is_out(self):
+        assert ttl.event_published(5 * DAY, 25 * DAY) is True
+        assert ttl.event_published(15 * DAY, 25 * DAY) is False
+        assert ttl.event_published(15 * DAY, 55 * DAY) is True
+
+    def test_not_published_during_publication_day(self):
+        assert ttl.event_published(5 * DAY, 20 * DAY + 3600) is False
+
+    def test_after_last_known_deadline(self):
+        assert ttl.event_published(45 * DAY, 100 * DAY) is False